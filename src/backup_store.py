@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from blob_store import CHUNK_SIZE
+from hashing import HASH_ALGORITHM
+from manifest_journal import write_json_atomic
+from log import get_logger
+
+logger = get_logger("backup_store")
+
+# Data class representing the original state of an overridden game file
+@dataclass
+class BackupEntry:
+    hash: Optional[str]  # Content hash of the original, None if the game had no file there
+    size: int
+
+# Compressed, deduplicated copies of game files taken the first time a mod overrides them,
+# with an index of which targets were captured so only those are ever restored
+class BackupStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.index_path = root / "index.json"
+        self.entries: Dict[str, BackupEntry] = {}  # Keyed by target path relative to game root
+        self.load()
+
+    # Loads the index, starting empty if it is missing or unreadable
+    def load(self) -> None:
+        self.entries = {}
+        if not self.index_path.exists():
+            return
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            logger.warning(f"Backup index unreadable, originals cannot be restored: {self.index_path}")
+            return
+        for target_rel, entry in data.get("targets", {}).items():
+            self.entries[target_rel] = BackupEntry(entry.get("hash"), entry.get("size", 0))
+
+    # Saves the index
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        targets = {target_rel: {"hash": entry.hash, "size": entry.size} for target_rel, entry in self.entries.items()}
+        write_json_atomic(self.index_path, {"targets": targets}, indent=None)
+
+    # Checks whether the original of a target has been captured
+    def has(self, target_rel: str) -> bool:
+        return target_rel in self.entries
+
+    # Returns where the compressed copy of a file with the given hash is stored
+    def path_for(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / f"{content_hash}.gz"
+
+    # Captures the current file at a target as its original, unless it was captured before.
+    # Returns True if a new entry was recorded.
+    def capture(self, game_path: Path, target_rel: str) -> bool:
+        if target_rel in self.entries:
+            return False
+        path = game_path / target_rel
+        if not path.is_file():
+            self.entries[target_rel] = BackupEntry(None, 0)
+            return True
+
+        # Hash and compress in one pass, identical originals share one copy
+        digest = hashlib.new(HASH_ALGORITHM)
+        size = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        tmp_path = Path(tmp_name)
+        try:
+            with open(path, "rb") as fsrc, os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as fdst:
+                while chunk := fsrc.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    fdst.write(chunk)
+                    size += len(chunk)
+            content_hash = digest.hexdigest()
+            backup_path = self.path_for(content_hash)
+            if backup_path.exists():
+                tmp_path.unlink()
+            else:
+                backup_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, backup_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self.entries[target_rel] = BackupEntry(content_hash, size)
+        return True
+
+    # Puts the original of a target back (deleting it if the game had none) and forgets it
+    def restore(self, game_path: Path, target_rel: str) -> None:
+        entry = self.entries[target_rel]
+        path = game_path / target_rel
+        if entry.hash is None:
+            path.unlink(missing_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            tmp_path = Path(tmp_name)
+            try:
+                with gzip.open(self.path_for(entry.hash), "rb") as fsrc, os.fdopen(fd, "wb") as fdst:
+                    shutil.copyfileobj(fsrc, fdst, CHUNK_SIZE)
+                # Never write through the deployed file, it may be a link into the mod cache
+                os.replace(tmp_path, path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+        del self.entries[target_rel]
+        self._collect(entry.hash)
+
+    # Returns the targets with a captured original
+    def targets(self) -> List[str]:
+        return list(self.entries)
+
+    # Deletes a compressed copy once no target refers to it
+    def _collect(self, content_hash: Optional[str]) -> None:
+        if content_hash is None:
+            return
+        if not any(entry.hash == content_hash for entry in self.entries.values()):
+            self.path_for(content_hash).unlink(missing_ok=True)
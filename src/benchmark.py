@@ -0,0 +1,314 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import struct
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from far import FAR_SIGNATURE
+from iff import CHUNK_HEADER_SIZE, HEADER_SIZE, IFF_SIGNATURE, OBJD_GUID_OFFSET, OBJD_PRICE_OFFSET
+from modloader import ModLoader
+from settings import Settings
+
+# Benchmarks ModLoader operations on synthetic game folders, run from the src folder:
+#   python -m benchmark --mods 100,1000 --output results.json
+#   python -m benchmark --mods 100,1000 --compare results.json
+# Each mod count gets a fresh game folder. Files are generated from a fixed seed, so runs
+# with the same options measure the same data.
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+# Change against a previous run, in percent, above which an operation is flagged as slower
+REGRESSION_THRESHOLD = 10.0
+
+# Data class representing the shape of the generated mods
+@dataclass
+class SyntheticConfig:
+    mods: int
+    iff_files: int = 4  # Small IFF objects per mod, placed in Downloads
+    iff_size: Tuple[int, int] = (4 * 1024, 64 * 1024)  # Size range of an IFF file
+    far_ratio: float = 0.1  # Share of mods also shipping a FAR archive
+    far_size: Tuple[int, int] = (1024 ** 2, 8 * 1024 ** 2)  # Size range of a FAR archive
+    override_ratio: float = 0.2  # Share of mods also overriding a skin in GameData/Skins
+    seed: int = 0
+
+# Data class representing the timings of one operation, in seconds
+@dataclass
+class Timing:
+    runs: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": [round(run, 6) for run in self.runs],
+            "min": round(min(self.runs), 6),
+            "median": round(statistics.median(self.runs), 6),
+            "mean": round(statistics.fmean(self.runs), 6),
+        }
+
+# Parses a size such as "64K" or "8M"
+def parse_size(text: str) -> int:
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+# Parses a size range such as "4K-64K", a single size is a range of one
+def parse_size_range(text: str) -> Tuple[int, int]:
+    low, _, high = text.partition("-")
+    return parse_size(low), parse_size(high or low)
+
+# Writes an IFF file holding one object definition and catalog strings, padded to the given size
+def write_iff(path: Path, guid: int, name: str, size: int, rng: random.Random) -> None:
+    header = IFF_SIGNATURE + b"2.5:TYPE FOLLOWED BY SIZE\0 JAMIE DOERGE 9/29/00"
+    header = header.ljust(HEADER_SIZE, b"\0")
+
+    def chunk(chunk_type: bytes, chunk_id: int, label: str, data: bytes) -> bytes:
+        return struct.pack(">4sIhH", chunk_type, CHUNK_HEADER_SIZE + len(data), chunk_id, 0) \
+            + label.encode("latin-1")[:63].ljust(64, b"\0") + data
+
+    objd = bytearray(OBJD_PRICE_OFFSET + 2)
+    struct.pack_into("<I", objd, OBJD_GUID_OFFSET, guid)
+    struct.pack_into("<H", objd, OBJD_PRICE_OFFSET, rng.randrange(1, 5000))
+    strings = [name.encode("latin-1"), b"Generated by the ModLoader benchmark"]
+    ctss = struct.pack("<hH", -1, len(strings)) + b"".join(string + b"\0" for string in strings)
+
+    data = header + chunk(b"OBJD", 128, name, bytes(objd)) + chunk(b"CTSS", 2000, name, ctss)
+    # Behavior code and sprites make up the bulk of real objects, filler stands in for them
+    filler = max(0, size - len(data) - CHUNK_HEADER_SIZE)
+    data += chunk(b"BHAV", 4096, "filler", rng.randbytes(filler))
+    path.write_bytes(data)
+
+# Writes a FAR v1a archive of the given total size, split over a few entries
+def write_far(path: Path, size: int, rng: random.Random) -> None:
+    count = rng.randint(2, 8)
+    sizes = [size // count] * (count - 1) + [size - size // count * (count - 1)]
+    directory = bytearray(struct.pack("<I", count))
+    offset = len(FAR_SIGNATURE) + 8
+    with open(path, "wb") as f:
+        f.write(FAR_SIGNATURE + struct.pack("<II", 1, 0))
+        for index, entry_size in enumerate(sizes):
+            f.write(rng.randbytes(entry_size))
+            name = f"entry{index:03d}.spr".encode("latin-1")
+            directory += struct.pack("<IIII", entry_size, entry_size, offset, len(name)) + name
+            offset += entry_size
+        f.write(directory)
+        f.seek(len(FAR_SIGNATURE) + 4)
+        f.write(struct.pack("<I", offset))
+
+# Generates the source files of every mod; returns (mod_id, download_files, override_files)
+# tuples in the form add_mod takes, and the total size written
+def generate_mods(
+    config: SyntheticConfig, source_dir: Path
+) -> Tuple[List[Tuple[str, List[Tuple[str, str]], List[Tuple[str, str, str]]]], int]:
+    rng = random.Random(config.seed)
+    mods = []
+    total = 0
+    for index in range(config.mods):
+        mod_id = f"bench_{index:06d}"
+        mod_dir = source_dir / mod_id
+        mod_dir.mkdir(parents=True)
+        download_files: List[Tuple[str, str]] = []
+        override_files: List[Tuple[str, str, str]] = []
+
+        for file_index in range(config.iff_files):
+            filename = f"object{file_index:02d}.iff"
+            size = rng.randint(*config.iff_size)
+            guid = (index * 256 + file_index + 1) & 0xFFFFFFFF  # Unique, so validation passes
+            write_iff(mod_dir / filename, guid, f"{mod_id} {filename}", size, rng)
+            download_files.append((str(mod_dir / filename), filename))
+            total += size
+        if rng.random() < config.far_ratio:
+            size = rng.randint(*config.far_size)
+            write_far(mod_dir / "content.far", size, rng)
+            download_files.append((str(mod_dir / "content.far"), "content.far"))
+            total += size
+        if rng.random() < config.override_ratio:
+            filename = f"skin_{index:06d}.bmp"
+            size = rng.randint(16 * 1024, 256 * 1024)
+            (mod_dir / filename).write_bytes(rng.randbytes(size))
+            override_files.append((str(mod_dir / filename), filename, f"GameData/Skins/{filename}"))
+            total += size
+        mods.append((mod_id, download_files, override_files))
+    return mods, total
+
+# Creates an empty game folder with the directories the game ships with
+def create_game_dir(game_dir: Path) -> None:
+    for directory in ("Downloads", "GameData/Skins", "GameData/Objects", "UserData"):
+        (game_dir / directory).mkdir(parents=True, exist_ok=True)
+    (game_dir / "Sims.exe").write_bytes(b"MZ")
+
+# Times a function, returns its result and the elapsed seconds
+def timed(function: Callable[[], object]) -> Tuple[object, float]:
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+# Refreshes the mod list the way the Mods page does, without Tk: all mods by ID, then the
+# default and the name-sorted listing
+def refresh_mod_list_model(modloader: ModLoader) -> list:
+    mods_by_id = {mod.id: mod for mod in modloader.mods.values()}
+    mod_list = [mods_by_id[mod_id] for mod_id in modloader.search_mods()]
+    modloader.search_mods("", "name")
+    return mod_list
+
+# Times UI.refresh_mod_list on a hidden window, None when there is no display
+def time_ui_refresh(settings: Settings, modloader: ModLoader, repeat: int) -> Optional[Timing]:
+    import tkinter as tk
+    try:
+        from ui import UI
+        ui = UI(settings, modloader=modloader)
+    except tk.TclError:
+        return None
+    try:
+        ui.root.withdraw()
+        ui.show_page("Mods")
+        ui.root.update()
+        timing = Timing()
+        for _ in range(repeat):
+            _, elapsed = timed(lambda: (ui.refresh_mod_list(), ui.root.update()))
+            timing.runs.append(elapsed)
+        return timing
+    finally:
+        ui.root.destroy()
+
+# Runs every operation on a fresh game folder with the given number of mods
+def run_scenario(config: SyntheticConfig, work_dir: Path, repeat: int, with_ui: bool) -> dict:
+    scenario_dir = work_dir / f"mods_{config.mods}"
+    shutil.rmtree(scenario_dir, ignore_errors=True)  # Left over from a run with --keep
+    game_dir = scenario_dir / "game"
+    create_game_dir(game_dir)
+    mods, total_bytes = generate_mods(config, scenario_dir / "sources")
+
+    settings = Settings(str(scenario_dir / "settings.json"))
+    settings.game_path = str(game_dir)
+    timings: Dict[str, Timing] = {}
+
+    def record(name: str, function: Callable[[], object], runs: int = 1) -> None:
+        timing = timings.setdefault(name, Timing())
+        for _ in range(runs):
+            timing.runs.append(timed(function)[1])
+
+    modloader = ModLoader(settings)
+    record("add_mod", lambda: [
+        modloader.add_mod(mod_id, mod_id.replace("_", " ").title(), None, None, download_files, override_files)
+        for mod_id, download_files, override_files in mods
+    ])
+    record("load_manifest", lambda: ModLoader(settings), repeat)
+
+    # Cold runs start from a loader fresh from disk, warm runs reuse its loaded indexes
+    modloader = ModLoader(settings)
+    record("validate_installation.cold", modloader.validate_installation)
+    record("validate_installation.warm", modloader.validate_installation, repeat)
+    record("install_all.cold", lambda: modloader.install_all())
+    record("install_all.warm", lambda: modloader.install_all(), repeat)
+    record("refresh_mod_list", lambda: refresh_mod_list_model(modloader), repeat)
+    if with_ui:
+        ui_timing = time_ui_refresh(settings, modloader, repeat)
+        if ui_timing:
+            timings["refresh_mod_list.ui"] = ui_timing
+
+    result = {
+        "config": asdict(config),
+        "files": sum(len(download) + len(override) for _, download, override in mods),
+        "bytes": total_bytes,
+        "timings": {name: timing.to_dict() for name, timing in timings.items()},
+    }
+    result["per_mod"] = {
+        name: round(timing["median"] / max(1, config.mods), 9) for name, timing in result["timings"].items()
+    }
+    return result
+
+# Prints the median of every operation, next to the previous run's when one is given
+def print_results(results: dict, previous: Optional[dict]) -> None:
+    previous_scenarios = {
+        scenario["config"]["mods"]: scenario for scenario in (previous or {}).get("scenarios", [])
+    }
+    for scenario in results["scenarios"]:
+        mods = scenario["config"]["mods"]
+        print(f"{mods} mod(s), {scenario['files']} file(s), {scenario['bytes'] / 1048576:.1f} MB")
+        before = previous_scenarios.get(mods, {}).get("timings", {})
+        for name, timing in scenario["timings"].items():
+            line = f"  {name:<28} {timing['median'] * 1000:10.1f} ms"
+            if name in before and before[name]["median"] > 0:
+                change = (timing["median"] / before[name]["median"] - 1) * 100
+                flag = "  SLOWER" if change > REGRESSION_THRESHOLD else ""
+                line += f"  ({change:+.1f}% vs {before[name]['median'] * 1000:.1f} ms){flag}"
+            print(line)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Time ModLoader operations on synthetic game folders.")
+    parser.add_argument("--mods", default="10,100,1000", help="comma separated mod counts (default: 10,100,1000)")
+    parser.add_argument("--iff-files", type=int, default=4, help="IFF files per mod (default: 4)")
+    parser.add_argument("--iff-size", default="4K-64K", help="IFF size range (default: 4K-64K)")
+    parser.add_argument("--far-ratio", type=float, default=0.1, help="share of mods with a FAR archive (default: 0.1)")
+    parser.add_argument("--far-size", default="1M-8M", help="FAR size range (default: 1M-8M)")
+    parser.add_argument("--override-ratio", type=float, default=0.2, help="share of mods overriding a skin (default: 0.2)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each repeatable operation (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default="", help="name stored with the results, e.g. a version")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="previous results to compare against")
+    parser.add_argument("--work-dir", help="where game folders are generated (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated game folders")
+    parser.add_argument("--ui", action="store_true", help="also time the Tk mod list, needs a display")
+    parser.add_argument("--verbose", action="store_true", help="show ModLoader console output")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="ts1_benchmark_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    mod_counts = [int(count) for count in args.mods.split(",")]
+    results = {
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scenarios": [],
+    }
+    try:
+        for mods in mod_counts:
+            config = SyntheticConfig(
+                mods=mods,
+                iff_files=args.iff_files,
+                iff_size=parse_size_range(args.iff_size),
+                far_ratio=args.far_ratio,
+                far_size=parse_size_range(args.far_size),
+                override_ratio=args.override_ratio,
+                seed=args.seed,
+            )
+            print(f"Running {mods} mod(s)...", file=sys.stderr)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+                results["scenarios"].append(run_scenario(config, work_dir, max(1, args.repeat), args.ui))
+    finally:
+        # Only the generated folders are removed from a given work folder
+        if not args.keep and args.work_dir:
+            for mods in mod_counts:
+                shutil.rmtree(work_dir / f"mods_{mods}", ignore_errors=True)
+        elif not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_results(results, previous)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results saved to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional, Tuple, Union
+
+from hashing import HASH_ALGORITHM
+
+CHUNK_SIZE = 1024 * 1024
+
+# Content-addressable store for cached mod files, deduplicated across mods by content hash
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.tmp_dir = root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.refcounts: Counter = Counter()
+
+    # Returns where the blob with the given hash is stored
+    def path_for(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / content_hash
+
+    # Checks whether a blob is stored
+    def contains(self, content_hash: str) -> bool:
+        return self.path_for(content_hash).exists()
+
+    # Rebuilds reference counts from every hash referenced by the manifest
+    def rebuild_refcounts(self, hashes: Iterable[str]) -> None:
+        self.refcounts = Counter(hashes)
+
+    # Copies a file into the store, hashing it in the same pass; returns (hash, size).
+    # on_chunk receives the size of every chunk written and may raise to abort the import.
+    def import_file(
+        self,
+        src_path: Union[str, Path],
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> Tuple[str, int]:
+        with open(src_path, "rb") as fsrc:
+            return self.import_stream(fsrc, on_chunk, copystat_from=src_path)
+
+    # Copies a readable binary stream (e.g. a ZIP entry) into the store; returns (hash, size).
+    # Safe to call from several threads at once, blobs only appear through an atomic rename.
+    def import_stream(
+        self,
+        stream: BinaryIO,
+        on_chunk: Optional[Callable[[int], None]] = None,
+        copystat_from: Optional[Union[str, Path]] = None,
+    ) -> Tuple[str, int]:
+        digest = hashlib.new(HASH_ALGORITHM)
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir)
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as fdst:
+                while chunk := stream.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    fdst.write(chunk)
+                    size += len(chunk)
+                    if on_chunk:
+                        on_chunk(len(chunk))
+            if copystat_from is not None:
+                shutil.copystat(copystat_from, tmp_path)
+
+            content_hash = digest.hexdigest()
+            blob_path = self.path_for(content_hash)
+            if blob_path.exists():
+                # Identical content is already stored by another file or mod
+                tmp_path.unlink()
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, blob_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return content_hash, size
+
+    # Adds a reference to a stored blob
+    def add_ref(self, content_hash: str) -> None:
+        self.refcounts[content_hash] += 1
+
+    # Drops a reference, deleting the blob once nothing uses it; returns True if it was freed
+    def release(self, content_hash: str) -> bool:
+        self.refcounts[content_hash] -= 1
+        if self.refcounts[content_hash] > 0:
+            return False
+        del self.refcounts[content_hash]
+        self.path_for(content_hash).unlink(missing_ok=True)
+        return True
+
+    # Deletes a blob nothing references, e.g. one imported for a mod that was then rejected
+    def discard(self, content_hash: str) -> None:
+        if self.refcounts[content_hash] <= 0:
+            self.refcounts.pop(content_hash, None)
+            self.path_for(content_hash).unlink(missing_ok=True)
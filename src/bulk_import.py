@@ -0,0 +1,122 @@
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+# Extensions imported as download files, placed in Downloads/{mod_id}
+DOWNLOAD_EXTENSIONS = (".iff", ".far")
+
+# Extensions imported as override files, by the game folder they are placed in
+OVERRIDE_DIRECTORIES = {
+    ".bmp": "GameData/Skins",
+    ".cmx": "GameData/Skins",
+    ".skn": "GameData/Skins",
+}
+
+# Data class representing a file found in an import source
+@dataclass
+class ImportEntry:
+    name: str  # Path inside the source, "/" separated; also the filename used in the cache
+    size: int
+    target_rel: Optional[str] = None  # Override target, None for download files
+
+# Data class representing a folder, ZIP archive or single file to import as one mod
+@dataclass
+class ImportSource:
+    path: Path
+    mod_id: str
+    name: str
+    entries: List[ImportEntry] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # Files with unsupported extensions
+
+    @property
+    def is_zip(self) -> bool:
+        return self.path.is_file() and zipfile.is_zipfile(self.path)
+
+    @property
+    def size(self) -> int:
+        return sum(entry.size for entry in self.entries)
+
+# Data class representing the outcome of a bulk import
+@dataclass
+class BulkImportReport:
+    added: List[str] = field(default_factory=list)  # Mod IDs
+    failed: Dict[str, str] = field(default_factory=dict)  # Error by source path
+    guid_clashes: Dict[str, List[str]] = field(default_factory=dict)  # Clashing object GUIDs by added mod ID
+    files: int = 0
+    bytes: int = 0
+
+# Derives a mod ID from a file or folder name
+def mod_id_for(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "mod"
+
+# Returns the override target of a file, "" for download files, or None if it is not supported
+def classify(name: str) -> Optional[str]:
+    extension = os.path.splitext(name)[1].lower()
+    if extension in DOWNLOAD_EXTENSIONS:
+        return ""
+    directory = OVERRIDE_DIRECTORIES.get(extension)
+    if directory:
+        return f"{directory}/{PurePosixPath(name).name}"
+    return None
+
+# Cleans a path from an archive or folder, returns None for entries that must not be imported
+def _clean_name(name: str) -> Optional[str]:
+    parts = PurePosixPath(name.replace("\\", "/")).parts
+    if not parts or any(part in ("..", "") or part.endswith(":") for part in parts) or name.startswith("/"):
+        return None
+    # Metadata folders added by archivers and hidden files
+    if parts[0] == "__MACOSX" or any(part.startswith(".") for part in parts):
+        return None
+    return "/".join(parts)
+
+def _add_entry(source: ImportSource, name: str, size: int) -> None:
+    target_rel = classify(name)
+    if target_rel is None:
+        source.skipped.append(name)
+    else:
+        source.entries.append(ImportEntry(name, size, target_rel or None))
+
+# Lists the files of a folder, ZIP archive or single file without reading their contents
+def scan_source(path: Union[str, Path]) -> ImportSource:
+    path = Path(path)
+    stem = path.name if path.is_dir() else path.stem
+    source = ImportSource(path, mod_id_for(stem), stem)
+
+    if path.is_dir():
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                full_path = Path(directory) / filename
+                name = _clean_name(full_path.relative_to(path).as_posix())
+                if name:
+                    _add_entry(source, name, full_path.stat().st_size)
+    elif source.is_zip:
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                name = _clean_name(info.filename)
+                if name:
+                    _add_entry(source, name, info.file_size)
+    else:
+        _add_entry(source, path.name, path.stat().st_size)
+    return source
+
+# Opens every entry of a source in turn, streaming ZIP members without extracting them
+def open_entries(source: ImportSource) -> Iterator[Tuple[ImportEntry, BinaryIO]]:
+    if source.is_zip:
+        with zipfile.ZipFile(source.path) as archive:
+            # Cleaned names map back to the member they came from
+            members = {_clean_name(info.filename): info for info in archive.infolist() if not info.is_dir()}
+            for entry in source.entries:
+                with archive.open(members[entry.name]) as stream:
+                    yield entry, stream
+        return
+
+    for entry in source.entries:
+        full_path = source.path / entry.name if source.path.is_dir() else source.path
+        with open(full_path, "rb") as stream:
+            yield entry, stream
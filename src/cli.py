@@ -0,0 +1,224 @@
+import argparse
+import contextlib
+import glob
+import json
+import sqlite3
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from conflicts import ValidationProblem
+from jobs import JobCancelled, JobContext, ProgressEvent
+from log import LOG_LEVELS
+from metrics import JsonLinesSink, Metrics
+from modloader import ModLoader
+from search_index import SORT_ADDED, SORT_ORDERS
+from settings import Settings
+
+# Headless entry point for scripted mod management, run from the src folder:
+#   python -m cli [--settings FILE] [--game-path DIR] <command> ...
+# Every command prints one JSON document to stdout; console output of the ModLoader goes to stderr.
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1  # The command failed, or failed for some of its arguments, or mod_cache is damaged
+EXIT_USAGE = 2  # Invalid arguments (argparse's own exit code)
+EXIT_INVALID = 3  # The installation has conflicts, nothing was installed
+EXIT_CONFIG = 4  # The game path is not set or does not exist
+EXIT_CANCELLED = 130  # Interrupted with Ctrl+C
+
+# Data returned by a command: the JSON document and the exit code
+class CommandResult:
+    def __init__(self, data: Optional[dict] = None, errors: Optional[List[dict]] = None, exit_code: Optional[int] = None):
+        self.data = data or {}
+        self.errors = errors or []
+        self.exit_code = exit_code if exit_code is not None else (EXIT_FAILED if self.errors else EXIT_OK)
+
+    def to_dict(self, command: str) -> dict:
+        return {"command": command, "ok": self.exit_code == EXIT_OK, **self.data, "errors": self.errors}
+
+# Returns the JSON form of a validation problem
+def problem_to_dict(problem: ValidationProblem) -> dict:
+    return {"kind": problem.kind, "summary": problem.summary, "details": problem.details, "hint": problem.hint}
+
+# Builds a job printing progress to stderr, or no job when progress is not wanted
+def make_job(show_progress: bool) -> Optional[JobContext]:
+    if not show_progress:
+        return None
+
+    def on_progress(event: ProgressEvent) -> None:
+        print(
+            f"[{event.stage}] {event.files_done}/{event.files_total} file(s), "
+            f"{event.bytes_done / 1048576:.1f}/{event.bytes_total / 1048576:.1f} MB {event.current}",
+            file=sys.stderr
+        )
+    return JobContext(on_progress)
+
+# Expands wildcards in paths, which cmd.exe passes through as typed. Paths matching nothing are
+# kept as they are, so they are reported as not found.
+def expand_paths(paths: List[str]) -> List[str]:
+    expanded: List[str] = []
+    for path in paths:
+        matches = sorted(glob.glob(path)) if glob.has_magic(path) else []
+        expanded.extend(matches or [path])
+    return expanded
+
+def cmd_add(modloader: ModLoader, args: argparse.Namespace) -> CommandResult:
+    report = modloader.import_mods(expand_paths(args.paths), job=make_job(args.progress))
+    return CommandResult(
+        {"added": report.added, "files": report.files, "bytes": report.bytes, "guid_clashes": report.guid_clashes},
+        [{"path": path, "error": error} for path, error in report.failed.items()]
+    )
+
+def cmd_remove(modloader: ModLoader, args: argparse.Namespace) -> CommandResult:
+    removed: List[str] = []
+    errors: List[dict] = []
+    for mod_id in args.mod_ids:
+        if mod_id not in modloader.mods:
+            errors.append({"mod_id": mod_id, "error": "Mod not found"})
+        elif modloader.is_mod_locked(mod_id):
+            errors.append({"mod_id": mod_id, "error": "Mod is locked, the game has been started with it"})
+        else:
+            try:
+                modloader.remove_mod(mod_id)
+                removed.append(mod_id)
+            except OSError as e:
+                errors.append({"mod_id": mod_id, "error": str(e)})
+    return CommandResult({"removed": removed}, errors)
+
+def cmd_validate(modloader: ModLoader, args: argparse.Namespace) -> CommandResult:
+    problems = modloader.get_validation_problems()
+    return CommandResult(
+        {"problems": [problem_to_dict(problem) for problem in problems]},
+        exit_code=EXIT_INVALID if problems else EXIT_OK
+    )
+
+def cmd_install(modloader: ModLoader, args: argparse.Namespace) -> CommandResult:
+    # Same check as Launch Game, a conflicting set of mods is never deployed
+    problems = modloader.get_validation_problems()
+    if problems:
+        return CommandResult({"problems": [problem_to_dict(problem) for problem in problems]}, exit_code=EXIT_INVALID)
+
+    job = make_job(args.progress)
+    if args.dry_run:
+        plan = modloader.plan_reconcile(job)
+        return CommandResult({"plan": {
+            "add": [copy_job.target_rel for copy_job in plan.adds],
+            "update": [copy_job.target_rel for copy_job in plan.updates],
+            "delete": plan.deletes,
+            "restore": plan.restores,
+            "kept": plan.kept,
+            "unchanged": plan.unchanged,
+            "bytes_to_add": plan.bytes_to_add,
+            "bytes_to_update": plan.bytes_to_update,
+            "bytes_to_delete": plan.bytes_to_delete,
+        }})
+    report = modloader.install_all(job=job)
+    return CommandResult({"report": asdict(report)})
+
+def cmd_list(modloader: ModLoader, args: argparse.Namespace) -> CommandResult:
+    locked = set(modloader.get_locked_mods())
+    mods = []
+    for mod_id in modloader.search_mods(args.query, args.sort):
+        mod = modloader.mods[mod_id]
+        mods.append({
+            "id": mod.id,
+            "name": mod.name,
+            "description": mod.description,
+            "locked": mod.id in locked,
+            "added_at": mod.added_at,
+            "download_files": len(mod.download_files),
+            "override_files": len(mod.override_files),
+        })
+    return CommandResult({"mods": mods})
+
+def cmd_lock(modloader: ModLoader, args: argparse.Namespace) -> CommandResult:
+    mod_ids = [mod_id for mod_id in dict.fromkeys(args.mod_ids) if mod_id in modloader.mods]
+    errors = [{"mod_id": mod_id, "error": "Mod not found"} for mod_id in args.mod_ids if mod_id not in modloader.mods]
+    if args.unlock:
+        for mod_id in mod_ids:
+            modloader.unlock_mod(mod_id)
+    else:
+        modloader.lock_mods(mod_ids)
+    return CommandResult({"unlocked" if args.unlock else "locked": mod_ids}, errors)
+
+COMMANDS = {
+    "add": cmd_add,
+    "remove": cmd_remove,
+    "install": cmd_install,
+    "validate": cmd_validate,
+    "list": cmd_list,
+    "lock": cmd_lock,
+}
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Manage The Sims 1 mods without the GUI.")
+    parser.add_argument("--settings", default="settings.json", help="settings file (default: settings.json)")
+    parser.add_argument("--game-path", help="game folder, overrides the one in the settings file")
+    parser.add_argument("--indent", type=int, default=None, help="indent the JSON output")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, help="overrides the log level in the settings file")
+    parser.add_argument("--metrics", metavar="FILE", help="append operation timings to FILE as JSON lines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="import mods from folders, ZIP archives or single files, wildcards allowed")
+    add.add_argument("paths", nargs="+")
+    add.add_argument("--progress", action="store_true", help="print progress to stderr")
+
+    remove = commands.add_parser("remove", help="remove unlocked mods and their cached files")
+    remove.add_argument("mod_ids", nargs="+")
+
+    install = commands.add_parser("install", help="validate, then bring the game folder to the manifest's state")
+    install.add_argument("--dry-run", action="store_true", help="only list the changes")
+    install.add_argument("--progress", action="store_true", help="print progress to stderr")
+
+    commands.add_parser("validate", help="check the mods for conflicts")
+
+    list_mods = commands.add_parser("list", help="list mods, optionally searched and sorted")
+    list_mods.add_argument("--query", default="")
+    list_mods.add_argument("--sort", choices=SORT_ORDERS, default=SORT_ADDED)
+
+    lock = commands.add_parser("lock", help="lock mods so they cannot be removed")
+    lock.add_argument("mod_ids", nargs="+")
+    lock.add_argument("--unlock", action="store_true", help="unlock the mods instead")
+    return parser
+
+# Runs a command and returns its result; failures are reported as data, never raised
+def run(args: argparse.Namespace) -> CommandResult:
+    settings = Settings(args.settings)
+    if args.game_path:
+        settings.game_path = args.game_path
+    if args.log_level:
+        settings.log_level = args.log_level
+    if not settings.get_game_path():
+        return CommandResult(errors=[{"error": "Game path is not set, use --game-path"}], exit_code=EXIT_CONFIG)
+
+    # Keep stdout for the JSON document
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            metrics = Metrics()
+            if args.metrics:
+                metrics.add_sink(JsonLinesSink(Path(args.metrics)))
+            modloader = ModLoader(settings, metrics=metrics)
+        # A damaged manifest or index is not a configuration problem, checked before ValueError
+        except json.JSONDecodeError as e:
+            return CommandResult(errors=[{"error": f"Manifest is damaged: {e}"}])
+        except sqlite3.Error as e:
+            return CommandResult(errors=[{"error": f"Mod index is unusable: {e}"}])
+        except (FileNotFoundError, ValueError) as e:
+            return CommandResult(errors=[{"error": str(e)}], exit_code=EXIT_CONFIG)
+        try:
+            return COMMANDS[args.command](modloader, args)
+        except (JobCancelled, KeyboardInterrupt):
+            return CommandResult(errors=[{"error": "Cancelled"}], exit_code=EXIT_CANCELLED)
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            return CommandResult(errors=[{"error": str(e)}])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    result = run(args)
+    print(json.dumps(result.to_dict(args.command), indent=args.indent))
+    return result.exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
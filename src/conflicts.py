@@ -0,0 +1,228 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from manifest_journal import write_json_atomic
+
+# Normalizes a target path the way Windows resolves it: unified separators, case folded
+def normalize_target(target_rel: str) -> str:
+    parts = [part for part in target_rel.replace("\\", "/").split("/") if part not in ("", ".")]
+    return "/".join(parts).casefold()
+
+# Data class representing a target file overridden by more than one mod
+@dataclass
+class Conflict:
+    target: str  # Normalized target path
+    owners: Dict[str, str]  # Raw target path as written by each mod, by mod ID
+    duplicates: List[str] = field(default_factory=list)  # Further raw paths of the target within the checked mod
+
+    # Returns every pair of mods clashing on this target
+    def pairs(self) -> List[tuple]:
+        mod_ids = list(self.owners)
+        return [(a, b) for i, a in enumerate(mod_ids) for b in mod_ids[i + 1:]]
+
+# Raised when adding a mod would override a target another mod already overrides
+class ConflictError(ValueError):
+    def __init__(self, mod_id: str, conflicts: List[Conflict]):
+        self.mod_id = mod_id
+        self.conflicts = conflicts
+        lines = []
+        for conflict in conflicts:
+            others = [owner for owner in conflict.owners if owner != mod_id]
+            if others:
+                lines.append(f"'{conflict.owners[mod_id]}' is already overridden by: " + ", ".join(others))
+            else:
+                lines.append(
+                    f"'{conflict.owners[mod_id]}' is overridden more than once by {mod_id}, also as: "
+                    + ", ".join(f"'{target_rel}'" for target_rel in conflict.duplicates)
+                )
+        super().__init__("Override conflict:\n" + "\n".join(lines))
+
+# Kinds of problems that stop mods from being installed
+PROBLEM_DUPLICATE_IDS = "duplicate_ids"
+PROBLEM_OVERRIDE_CONFLICT = "override_conflict"
+PROBLEM_GUID_CLASH = "guid_clash"
+
+# Data class representing a problem found when validating the installation
+@dataclass
+class ValidationProblem:
+    kind: str  # One of the PROBLEM_* kinds
+    title: str
+    summary: str  # e.g. "2 file(s) are overridden by multiple mods"
+    details: List[str] = field(default_factory=list)  # One line per conflicting file or object
+    hint: str = ""  # How to resolve the problem
+
+    # Returns the text shown to the user, listing at most max_details lines
+    def message(self, max_details: int) -> str:
+        text = self.summary
+        if self.details:
+            shown = [f"• {line}" for line in self.details[:max_details]]
+            if len(self.details) > max_details:
+                shown.append(f"...and {len(self.details) - max_details} more (see console)")
+            text += ":\n\n" + "\n".join(shown)
+        return f"{text}\n\n{self.hint}" if self.hint else text
+
+# Persistent index of override targets by normalized path, kept up to date as mods change
+class ConflictIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self.owners: Dict[str, Dict[str, str]] = {}  # Normalized target -> {mod_id: raw target}
+        self.mod_ids: Set[str] = set()  # Mods covered by the index
+
+    # Loads the index file, returns False if it is missing or unreadable
+    def load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return False
+        self.owners = data.get("targets", {})
+        self.mod_ids = set(data.get("mods", []))
+        return True
+
+    # Saves the index file
+    def save(self) -> None:
+        write_json_atomic(self.path, {"mods": sorted(self.mod_ids), "targets": self.owners}, indent=None)
+
+    # Rebuilds the index from (mod_id, target paths) pairs
+    def rebuild(self, mods: Iterable[tuple]) -> None:
+        self.owners = {}
+        self.mod_ids = set()
+        for mod_id, targets in mods:
+            self.add_mod(mod_id, targets)
+
+    # Registers the override targets of a mod
+    def add_mod(self, mod_id: str, targets: Iterable[str]) -> None:
+        self.mod_ids.add(mod_id)
+        for target_rel in targets:
+            self.owners.setdefault(normalize_target(target_rel), {}).setdefault(mod_id, target_rel)
+
+    # Unregisters the override targets of a mod
+    def remove_mod(self, mod_id: str, targets: Iterable[str]) -> None:
+        self.mod_ids.discard(mod_id)
+        for target_rel in targets:
+            key = normalize_target(target_rel)
+            owners = self.owners.get(key)
+            if owners is None:
+                continue
+            owners.pop(mod_id, None)
+            if not owners:
+                del self.owners[key]
+
+    # Returns the conflicts a mod overriding these targets would cause, one lookup per target.
+    # Targets the mod itself lists more than once, e.g. differing only in case or separators,
+    # are reported first.
+    def check(self, mod_id: str, targets: Iterable[str]) -> List[Conflict]:
+        first: Dict[str, str] = {}  # Normalized target -> raw target as first listed
+        duplicates: Dict[str, List[str]] = {}
+        for target_rel in targets:
+            key = normalize_target(target_rel)
+            if key in first:
+                duplicates.setdefault(key, []).append(target_rel)
+            else:
+                first[key] = target_rel
+
+        conflicts = [Conflict(key, {mod_id: first[key]}, raws) for key, raws in duplicates.items()]
+        for key, target_rel in first.items():
+            others = {owner: raw for owner, raw in self.owners.get(key, {}).items() if owner != mod_id}
+            if others:
+                conflicts.append(Conflict(key, {**others, mod_id: target_rel}))
+        return conflicts
+
+    # Returns every target overridden by more than one mod
+    def report(self) -> List[Conflict]:
+        return [Conflict(key, dict(owners)) for key, owners in self.owners.items() if len(owners) > 1]
+
+# Data class representing an object GUID defined by more than one IFF file in Downloads
+@dataclass
+class GuidClash:
+    guid: int
+    owners: List[Tuple[str, str]]  # (mod_id, source_rel) of every file defining the GUID
+
+    def __str__(self) -> str:
+        return f"0x{self.guid:08X}"
+
+# Persistent index of the object GUIDs defined by each mod's IFF files. GUIDs defined by files
+# of different content are tracked as mods change, so reporting clashes never walks the whole
+# index. The same IFF file shipped in several mods defines the same object and never clashes.
+class GuidIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self.owners: Dict[str, List[List[str]]] = {}  # GUID (hex) -> [[mod_id, source_rel, content_hash], ...]
+        self.mod_guids: Dict[str, List[str]] = {}  # Mod ID -> GUIDs (hex) it defines
+        self.clashes: Set[str] = set()  # GUIDs (hex) defined by more than one distinct file content
+
+    # Loads the index file, returns False if it is missing or unreadable
+    def load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return False
+        self.owners = data.get("guids", {})
+        self.mod_guids = data.get("mods", {})
+        # Indexes written before owners recorded the content hash are rebuilt
+        if any(len(owner) != 3 for owners in self.owners.values() for owner in owners):
+            return False
+        self.clashes = {key for key, owners in self.owners.items() if self._clashes(owners)}
+        return True
+
+    # Saves the index file
+    def save(self) -> None:
+        write_json_atomic(self.path, {"mods": self.mod_guids, "guids": self.owners}, indent=None)
+
+    # Rebuilds the index from (mod_id, [(guid, source_rel, content_hash), ...]) pairs
+    def rebuild(self, mods: Iterable[tuple]) -> None:
+        self.owners = {}
+        self.mod_guids = {}
+        self.clashes = set()
+        for mod_id, objects in mods:
+            self.add_mod(mod_id, objects)
+
+    # Checks whether the owners of a GUID define it with files of different content
+    @staticmethod
+    def _clashes(owners: List[List[str]]) -> bool:
+        return len({content_hash for _, _, content_hash in owners}) > 1
+
+    # Registers the object GUIDs a mod defines, as (guid, source_rel, content_hash) tuples
+    def add_mod(self, mod_id: str, objects: Iterable[Tuple[int, str, str]]) -> None:
+        if mod_id in self.mod_guids:
+            self.remove_mod(mod_id)
+        keys: List[str] = []
+        for guid, source_rel, content_hash in objects:
+            key = f"{guid:08x}"
+            owners = self.owners.setdefault(key, [])
+            if [mod_id, source_rel, content_hash] in owners:
+                continue
+            owners.append([mod_id, source_rel, content_hash])
+            keys.append(key)
+            if self._clashes(owners):
+                self.clashes.add(key)
+        self.mod_guids[mod_id] = list(dict.fromkeys(keys))
+
+    # Unregisters the object GUIDs of a mod
+    def remove_mod(self, mod_id: str) -> None:
+        for key in self.mod_guids.pop(mod_id, []):
+            owners = [owner for owner in self.owners.get(key, []) if owner[0] != mod_id]
+            if owners:
+                self.owners[key] = owners
+            else:
+                self.owners.pop(key, None)
+            if not self._clashes(owners):
+                self.clashes.discard(key)
+
+    # Returns every GUID defined by files of different content
+    def report(self) -> List[GuidClash]:
+        return [self._clash(key) for key in sorted(self.clashes)]
+
+    # Returns the clashes a mod takes part in
+    def clashes_of(self, mod_id: str) -> List[GuidClash]:
+        return [self._clash(key) for key in self.mod_guids.get(mod_id, []) if key in self.clashes]
+
+    def _clash(self, key: str) -> GuidClash:
+        return GuidClash(int(key, 16), [(mod_id, source_rel) for mod_id, source_rel, _ in self.owners[key]])
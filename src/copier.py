@@ -0,0 +1,153 @@
+import os
+import shutil
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Supported worker pool types
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+EXECUTOR_TYPES = (EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+# Supported deployment modes
+DEPLOY_COPY = "copy"  # Physical copies only
+DEPLOY_HARDLINK = "hardlink"  # Hardlinks for downloads, reflinks or copies for overrides
+DEPLOY_REFLINK = "reflink"  # Copy-on-write clones where the filesystem supports them
+DEPLOY_MODES = (DEPLOY_COPY, DEPLOY_HARDLINK, DEPLOY_REFLINK)
+
+# Method reported when a reflink was asked for but the kernel copied the file with
+# copy_file_range instead, which only shares extents on some filesystems (e.g. NFS, CIFS)
+METHOD_COPY_RANGE = "copy_range"
+
+# Linux ioctl that clones a whole file (btrfs, XFS, bcachefs...)
+FICLONE = 0x40049409
+
+# Data class representing a single file copy from the mod cache into the game folder
+@dataclass
+class CopyJob:
+    source_rel: str  # Relative to mod_cache
+    target_rel: str  # Relative to game root
+    src: Path
+    dest: Path
+    kind: str  # Label used for console output, e.g. "CC FILE"
+    linkable: bool = True  # False for targets that must never share storage with the cache
+    content_hash: Optional[str] = None  # Known hash of the source, if any
+    method: str = ""  # How the file was deployed, set once the job completes
+
+# Deploys a single file using the given mode, falling back to a copy; returns the method used.
+# Kept at module level so process pools can pickle it.
+def deploy_file(src: Path, dest: Path, mode: str = DEPLOY_COPY) -> str:
+    # Never write through an existing file, it may be a link into the cache
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+
+    if mode == DEPLOY_HARDLINK:
+        try:
+            os.link(src, dest)
+            return DEPLOY_HARDLINK
+        except OSError:
+            pass
+    if mode in (DEPLOY_HARDLINK, DEPLOY_REFLINK):
+        method = _reflink(src, dest)
+        if method:
+            shutil.copystat(src, dest)
+            return method
+
+    shutil.copy2(src, dest)
+    return DEPLOY_COPY
+
+# Clones src into dest sharing extents, falling back to copy_file_range. Returns the method used,
+# DEPLOY_REFLINK or METHOD_COPY_RANGE, or None if neither worked.
+def _reflink(src: Path, dest: Path) -> Optional[str]:
+    if not sys.platform.startswith("linux"):
+        return None
+    import fcntl
+
+    try:
+        with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return DEPLOY_REFLINK
+            except OSError:
+                pass
+
+            # copy_file_range shares extents on filesystems that support it
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            return METHOD_COPY_RANGE if remaining == 0 else None
+    except OSError:
+        return None
+
+# Runs copy jobs on a configurable worker pool
+class CopyEngine:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        executor: str = EXECUTOR_THREAD,
+        mode: str = DEPLOY_COPY,
+    ):
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(f"Unknown copy executor: {executor}")
+        if mode not in DEPLOY_MODES:
+            raise ValueError(f"Unknown deployment mode: {mode}")
+        self.mode = mode
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.executor = executor
+
+    # Drops jobs whose target is written again later, so the last writer always wins
+    @staticmethod
+    def dedupe(jobs: List[CopyJob]) -> List[CopyJob]:
+        last_by_target: Dict[str, int] = {}
+        for index, job in enumerate(jobs):
+            last_by_target[os.path.normcase(str(job.dest))] = index
+        return [job for index, job in enumerate(jobs) if last_by_target[os.path.normcase(str(job.dest))] == index]
+
+    # Creates every destination directory in a single pass
+    @staticmethod
+    def prepare_directories(jobs: List[CopyJob]) -> None:
+        for directory in sorted({job.dest.parent for job in jobs}):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    # Copies all jobs, yielding each one as it completes
+    def run(self, jobs: List[CopyJob]) -> Iterator[CopyJob]:
+        jobs = self.dedupe(jobs)
+        if not jobs:
+            return
+        self.prepare_directories(jobs)
+
+        # Small batches are not worth the pool start-up cost
+        if self.workers <= 1 or len(jobs) == 1:
+            for job in jobs:
+                job.method = deploy_file(job.src, job.dest, self.mode_for(job))
+                yield job
+            return
+
+        with self._create_executor(min(self.workers, len(jobs))) as pool:
+            futures = {pool.submit(deploy_file, job.src, job.dest, self.mode_for(job)): job for job in jobs}
+            try:
+                for future in as_completed(futures):
+                    job = futures[future]
+                    job.method = future.result()
+                    yield job
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    # Returns the deployment mode for a job, hardlinks are only used where allowed
+    def mode_for(self, job: CopyJob) -> str:
+        if self.mode == DEPLOY_HARDLINK and not job.linkable:
+            return DEPLOY_REFLINK
+        return self.mode
+
+    # Creates the worker pool for the configured executor type
+    def _create_executor(self, workers: int) -> Executor:
+        if self.executor == EXECUTOR_PROCESS:
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="copy")
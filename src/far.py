@@ -0,0 +1,154 @@
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+FAR_SIGNATURE = b"FAR!byAZ"
+HEADER_SIZE = 16  # Signature, version, manifest offset
+
+# Raised when a file is not a FAR archive or its directory table is damaged
+class FarError(ValueError):
+    pass
+
+# Data class representing a file stored in a FAR archive, its data is only read on demand
+@dataclass
+class FarEntry:
+    name: str
+    size: int  # Uncompressed size in bytes
+    compressed_size: int  # Bytes stored in the archive, equal to size when not compressed
+    offset: int  # Offset of the data from the start of the archive
+    compressed: bool = False  # Only FAR v3 (The Sims Online) entries can be compressed
+    type_id: Optional[int] = None  # FAR v3 only
+    file_id: Optional[int] = None  # FAR v3 only
+
+# Returns True if the file starts with the FAR signature
+def is_far(path: Union[str, Path]) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(FAR_SIGNATURE)) == FAR_SIGNATURE
+    except OSError:
+        return False
+
+# Read-only view of a FAR archive (v1a and v1b from The Sims, v3 from The Sims Online).
+# The archive is memory-mapped and only its directory table is parsed, on first access to
+# entries, so listing even very large archives costs a few page reads.
+class FarArchive:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self.file_size = f.seek(0, 2)
+            if self.file_size < HEADER_SIZE:
+                raise FarError(f"Not a FAR archive: {self.path.name}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:8] != FAR_SIGNATURE:
+            self.close()
+            raise FarError(f"Not a FAR archive: {self.path.name}")
+        version, self.manifest_offset = struct.unpack_from("<II", self._map, 8)
+        if version not in (1, 3):
+            self.close()
+            raise FarError(f"Unsupported FAR version {version}: {self.path.name}")
+        self._version = str(version)
+        self._entries: Optional[List[FarEntry]] = None
+
+    def __enter__(self) -> "FarArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+    # Archive format: "1a", "1b" or "3". Telling v1a from v1b requires the directory table.
+    @property
+    def version(self) -> str:
+        if self._version == "1":
+            self.entries
+        return self._version
+
+    # Entries in directory order, parsed from the directory table on first access
+    @property
+    def entries(self) -> List[FarEntry]:
+        if self._entries is None:
+            self._entries = self._read_directory()
+        return self._entries
+
+    def __iter__(self) -> Iterator[FarEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # Total uncompressed size of the archived files
+    @property
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.entries)
+
+    # Returns the entry with the given name (case-insensitive), or None
+    def find(self, name: str) -> Optional[FarEntry]:
+        key = name.casefold()
+        return next((entry for entry in self.entries if entry.name.casefold() == key), None)
+
+    # Returns the stored bytes of an entry
+    def read(self, entry: FarEntry) -> bytes:
+        if entry.compressed:
+            raise FarError(f"Compressed FAR entries are not supported: {entry.name}")
+        return self._map[entry.offset:entry.offset + entry.compressed_size]
+
+    def _read_directory(self) -> List[FarEntry]:
+        if self.manifest_offset + 4 > self.file_size:
+            raise FarError(f"FAR directory is out of bounds: {self.path.name}")
+        (count,) = struct.unpack_from("<I", self._map, self.manifest_offset)
+        position = self.manifest_offset + 4
+
+        if self._version == "3":
+            return self._read_entries_v3(position, count)
+
+        # v1a and v1b only differ in the width of the name length, 4 and 2 bytes.
+        # A v1b directory read as v1a yields name lengths running past the end of the file.
+        try:
+            entries = self._read_entries_v1(position, count, 4)
+            self._version = "1a"
+        except FarError:
+            entries = self._read_entries_v1(position, count, 2)
+            self._version = "1b"
+        return entries
+
+    def _read_entries_v1(self, position: int, count: int, length_width: int) -> List[FarEntry]:
+        entry_format = "<IIII" if length_width == 4 else "<IIIH"
+        fixed_size = struct.calcsize(entry_format)
+        entries = []
+        for _ in range(count):
+            self._check_bounds(position + fixed_size)
+            size, compressed_size, offset, name_length = struct.unpack_from(entry_format, self._map, position)
+            position += fixed_size
+            self._check_bounds(position + name_length)
+            name = self._map[position:position + name_length].decode("latin-1")
+            position += name_length
+            self._check_bounds(offset + compressed_size)
+            entries.append(FarEntry(name, size, compressed_size, offset))
+        return entries
+
+    def _read_entries_v3(self, position: int, count: int) -> List[FarEntry]:
+        fixed_size = 28
+        entries = []
+        for _ in range(count):
+            self._check_bounds(position + fixed_size)
+            size, compressed_low, compressed_high, data_type, offset, _, _, name_length, type_id, file_id = \
+                struct.unpack_from("<IHBBIBBHIQ", self._map, position)
+            position += fixed_size
+            self._check_bounds(position + name_length)
+            name = self._map[position:position + name_length].decode("latin-1")
+            position += name_length
+            compressed_size = compressed_low | (compressed_high << 16)
+            self._check_bounds(offset + compressed_size)
+            # Data type 0x80 marks RefPack compressed data
+            entries.append(FarEntry(name, size, compressed_size, offset, data_type == 0x80, type_id, file_id))
+        return entries
+
+    def _check_bounds(self, end: int) -> None:
+        if end > self.file_size:
+            raise FarError(f"FAR directory is damaged: {self.path.name}")
@@ -0,0 +1,26 @@
+import hashlib
+import mmap
+import os
+from pathlib import Path
+from typing import Union
+
+# Hash algorithm used for every content hash stored by the ModLoader
+HASH_ALGORITHM = "sha256"
+
+# Returns the hex content hash of a file
+def hash_file(path: Union[str, Path]) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, HASH_ALGORITHM).hexdigest()
+
+# Files from this size on are hashed through a memory map
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Returns the hex content hash of a file, hashing large files straight from a memory map
+# so they are never copied into Python buffers chunk by chunk
+def hash_file_mapped(path: Union[str, Path]) -> str:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return hashlib.file_digest(f, HASH_ALGORITHM).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.new(HASH_ALGORITHM, mapped).hexdigest()
@@ -0,0 +1,297 @@
+import json
+import mmap
+import os
+import struct
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from manifest_journal import write_json_atomic
+
+IFF_SIGNATURE = b"IFF FILE "  # Followed by the format version, e.g. "2.5:TYPE FOLLOWED BY SIZE"
+HEADER_SIZE = 64
+CHUNK_HEADER_SIZE = 76  # Type, size, ID, flags, 64 byte label
+
+MAX_CACHED_PATHS = 1000  # Files cached by path in an IffMetadataCache, the oldest are dropped
+METADATA_CACHE_VERSION = 2  # Bumped when scan_iff extracts more, so files are scanned again
+
+OBJD_GUID_OFFSET = 28  # Version (4 bytes) then 16-bit fields, the GUID spans fields 12 and 13
+OBJD_PRICE_OFFSET = 36  # Field 16
+
+# Raised when a file is not an IFF file or its chunk headers are damaged
+class IffError(ValueError):
+    pass
+
+# Data class representing a chunk header, the data itself is only read on demand
+@dataclass
+class IffChunk:
+    type: str  # Four character code, e.g. "OBJD"
+    id: int
+    flags: int
+    label: str
+    offset: int  # Offset of the chunk data (after the header)
+    size: int  # Size of the chunk data
+
+# Data class representing an object definition (OBJD chunk)
+@dataclass
+class IffObject:
+    guid: int
+    name: str  # Chunk label, the internal object name
+    price: int
+
+# Data class representing the metadata extracted from an IFF file
+@dataclass
+class IffMetadata:
+    objects: List[IffObject] = field(default_factory=list)
+    catalog_name: Optional[str] = None  # First catalog string (CTSS, else the first STR# chunk)
+    catalog_description: Optional[str] = None  # Second catalog string (CTSS, else the first STR# chunk)
+
+    @property
+    def name(self) -> Optional[str]:
+        if self.catalog_name:
+            return self.catalog_name
+        return self.objects[0].name if self.objects else None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(data: dict) -> "IffMetadata":
+        return IffMetadata(
+            objects=[IffObject(**obj) for obj in data.get("objects", [])],
+            catalog_name=data.get("catalog_name"),
+            catalog_description=data.get("catalog_description"),
+        )
+
+# Read-only view of an IFF file. The file is memory-mapped and only chunk headers are walked,
+# chunk data is sliced from the map when a caller asks for it.
+class IffFile:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self.file_size = f.seek(0, 2)
+            if self.file_size < HEADER_SIZE:
+                raise IffError(f"Not an IFF file: {self.path.name}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(IFF_SIGNATURE)] != IFF_SIGNATURE:
+            self.close()
+            raise IffError(f"Not an IFF file: {self.path.name}")
+        self._chunks: Optional[List[IffChunk]] = None
+
+    def __enter__(self) -> "IffFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+    # Chunk headers in file order, walked on first access
+    @property
+    def chunks(self) -> List[IffChunk]:
+        if self._chunks is None:
+            self._chunks = list(self._walk())
+        return self._chunks
+
+    # Returns the chunks of one type
+    def chunks_of(self, chunk_type: str) -> List[IffChunk]:
+        return [chunk for chunk in self.chunks if chunk.type == chunk_type]
+
+    # Returns the data of a chunk
+    def read(self, chunk: IffChunk) -> bytes:
+        return self._map[chunk.offset:chunk.offset + chunk.size]
+
+    def _walk(self) -> Iterator[IffChunk]:
+        position = HEADER_SIZE
+        while position + CHUNK_HEADER_SIZE <= self.file_size:
+            chunk_type, size, chunk_id, flags = struct.unpack_from(">4sIhH", self._map, position)
+            # Sizes include the header, anything smaller or past the end means the file is damaged
+            if size < CHUNK_HEADER_SIZE or position + size > self.file_size:
+                raise IffError(f"IFF chunk table is damaged: {self.path.name}")
+            label = self._map[position + 12:position + CHUNK_HEADER_SIZE].split(b"\0", 1)[0]
+            yield IffChunk(
+                chunk_type.decode("latin-1"),
+                chunk_id,
+                flags,
+                label.decode("latin-1"),
+                position + CHUNK_HEADER_SIZE,
+                size - CHUNK_HEADER_SIZE,
+            )
+            position += size
+
+# Decodes an OBJD chunk, returns None if it is too short to hold a GUID
+def parse_objd(chunk: IffChunk, data: bytes) -> Optional[IffObject]:
+    if len(data) < OBJD_GUID_OFFSET + 4:
+        return None
+    (guid,) = struct.unpack_from("<I", data, OBJD_GUID_OFFSET)
+    price = struct.unpack_from("<H", data, OBJD_PRICE_OFFSET)[0] if len(data) >= OBJD_PRICE_OFFSET + 2 else 0
+    return IffObject(guid, chunk.label, price)
+
+# Decodes a STR# or CTSS chunk, keeping the first language only. Damaged tables yield
+# the strings read before the damage.
+def parse_strings(data: bytes) -> List[str]:
+    strings: List[str] = []
+    if len(data) < 4:
+        return strings
+    (format_code,) = struct.unpack_from("<h", data, 0)
+    position = 2
+
+    def c_string() -> str:
+        nonlocal position
+        end = data.index(b"\0", position)
+        value = data[position:end].decode("latin-1")
+        position = end + 1
+        return value
+
+    def pascal_string() -> str:
+        nonlocal position
+        length = data[position]
+        value = data[position + 1:position + 1 + length].decode("latin-1")
+        position += 1 + length
+        return value
+
+    def varint_string() -> str:
+        nonlocal position
+        length, shift = 0, 0
+        while True:
+            byte = data[position]
+            position += 1
+            length |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        value = data[position:position + length].decode("utf-8", errors="replace")
+        position += length
+        return value
+
+    try:
+        if format_code == -4:
+            # Language sets, the first one is English
+            position = 3
+            (count,) = struct.unpack_from("<H", data, position)
+            position += 2
+            for _ in range(count):
+                position += 1  # Language code
+                strings.append(varint_string())
+                varint_string()  # Comment
+            return strings
+
+        (count,) = struct.unpack_from("<H", data, position)
+        position += 2
+        for _ in range(count):
+            if format_code == 0:
+                strings.append(pascal_string())
+            elif format_code == -1:
+                strings.append(c_string())
+            elif format_code == -2:
+                strings.append(c_string())
+                c_string()  # Comment
+            elif format_code == -3:
+                language = data[position]
+                position += 1
+                value = c_string()
+                c_string()  # Comment
+                if language <= 1:
+                    strings.append(value)
+            else:
+                break
+    except (IndexError, ValueError, struct.error):
+        pass
+    return strings
+
+# Extracts object definitions and catalog strings from an IFF file, reading only the chunks needed.
+# Files without a CTSS chunk take their name and description from their first STR# chunk.
+def scan_iff(path: Union[str, Path]) -> IffMetadata:
+    metadata = IffMetadata()
+    catalog: Optional[IffChunk] = None
+    with IffFile(path) as iff:
+        for chunk in iff.chunks:
+            if chunk.type == "OBJD":
+                obj = parse_objd(chunk, iff.read(chunk))
+                if obj is not None:
+                    metadata.objects.append(obj)
+            elif chunk.type == "CTSS" and (catalog is None or catalog.type == "STR#"):
+                catalog = chunk
+            elif chunk.type == "STR#" and catalog is None:
+                catalog = chunk
+        if catalog is not None:
+            strings = parse_strings(iff.read(catalog))
+            metadata.catalog_name = strings[0] if strings and strings[0] else None
+            metadata.catalog_description = strings[1] if len(strings) > 1 and strings[1] else None
+    return metadata
+
+# Persistent cache of IFF metadata by content hash, so identical files are only ever parsed once.
+# Files outside the blob store are also cached by path, validated by their size and mtime, so
+# they can be looked up without hashing them.
+class IffMetadataCache:
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, dict] = {}  # Content hash -> metadata
+        self.files: Dict[str, list] = {}  # Path -> [size, mtime_ns, metadata]
+        self.dirty = False
+        self._loaded = False
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        # Files written by older versions lack metadata scan_iff now extracts and are scanned again
+        if data.get("version") == METADATA_CACHE_VERSION:
+            self.entries = data.get("hashes", {})
+            self.files = data.get("files", {})
+
+    # Saves the cache file if anything was added since the last save
+    def save(self) -> None:
+        if self.dirty:
+            write_json_atomic(
+                self.path,
+                {"version": METADATA_CACHE_VERSION, "hashes": self.entries, "files": self.files},
+                indent=None,
+            )
+            self.dirty = False
+
+    # Returns the metadata of a file, parsing it only if its content hash is not cached.
+    # Files that are not valid IFF files are cached as having no metadata.
+    def scan(self, path: Union[str, Path], content_hash: str) -> IffMetadata:
+        if not self._loaded:
+            self._load()
+        cached = self.entries.get(content_hash)
+        if cached is not None:
+            return IffMetadata.from_dict(cached)
+        metadata = self._parse(path)
+        self.entries[content_hash] = metadata.to_dict()
+        self.dirty = True
+        return metadata
+
+    # Returns the metadata of a file by path, parsing it only if it changed since it was cached.
+    # Costs a stat when cached, and never reads more than the chunks that are parsed.
+    def scan_path(self, path: Union[str, Path]) -> IffMetadata:
+        if not self._loaded:
+            self._load()
+        key = str(Path(path).resolve())
+        stat = os.stat(key)
+        cached = self.files.get(key)
+        if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return IffMetadata.from_dict(cached[2])
+        metadata = self._parse(path)
+        self.files.pop(key, None)
+        self.files[key] = [stat.st_size, stat.st_mtime_ns, metadata.to_dict()]
+        # Oldest entries first, they are dropped past the limit
+        while len(self.files) > MAX_CACHED_PATHS:
+            del self.files[next(iter(self.files))]
+        self.dirty = True
+        return metadata
+
+    @staticmethod
+    def _parse(path: Union[str, Path]) -> IffMetadata:
+        try:
+            return scan_iff(path)
+        except IffError:
+            return IffMetadata()
@@ -0,0 +1,127 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from hashing import hash_file
+from log import get_logger
+from manifest_journal import write_json_atomic
+
+logger = get_logger("install_state")
+
+# Data class representing a file deployed to the game folder
+@dataclass
+class DeployedFile:
+    source: str  # Source path relative to mod_cache
+    size: int
+    mtime_ns: int
+    hash: str
+    override: bool = False  # Replaces a game file rather than adding one to Downloads
+
+# Data class summarizing an install run
+@dataclass
+class InstallReport:
+    copied: int = 0  # Files deployed, including hardlinks
+    skipped: int = 0
+    linked: int = 0  # Files deployed as hardlinks instead of copies
+    bytes_copied: int = 0
+    deleted: int = 0  # Deployed files no mod wants anymore, removed from the game folder
+    bytes_deleted: int = 0
+    restored: int = 0  # Overridden game files put back to their original
+
+# Tracks which files were deployed and in which state, so installs can skip unchanged files
+class InstallState:
+    def __init__(self, path: Path):
+        self.path = path
+        self.files: Dict[str, DeployedFile] = {}  # Keyed by target path relative to game root
+        self.load()
+
+    # Loads the state file, starting empty if it is missing or unreadable
+    def load(self) -> None:
+        self.files = {}
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            logger.warning(f"Install state unreadable, all files will be copied: {self.path}")
+            return
+
+        for target_rel, entry in data.get("files", {}).items():
+            try:
+                self.files[target_rel] = DeployedFile(
+                    source=entry["source"],
+                    size=entry["size"],
+                    mtime_ns=entry["mtime_ns"],
+                    hash=entry["hash"],
+                    # States written before overrides were flagged only deployed those outside Downloads
+                    override=entry.get("override", not target_rel.startswith("Downloads/")),
+                )
+            except KeyError:
+                continue
+
+    # Saves the state file
+    def save(self) -> None:
+        data = {
+            "files": {
+                target_rel: {
+                    "source": entry.source,
+                    "size": entry.size,
+                    "mtime_ns": entry.mtime_ns,
+                    "hash": entry.hash,
+                    "override": entry.override,
+                }
+                for target_rel, entry in self.files.items()
+            }
+        }
+        # Written to a temporary file and renamed, so a crash never leaves a truncated state file
+        write_json_atomic(self.path, data, indent=None)
+
+    # Checks whether target_rel already holds an unchanged copy of source_rel
+    def is_up_to_date(self, target_rel: str, source_rel: str, src: Path, dest: Path) -> bool:
+        entry = self.files.get(target_rel)
+        if entry is None or entry.source != source_rel:
+            return False
+
+        try:
+            src_stat = src.stat()
+            dest_stat = dest.stat()
+        except OSError:
+            return False
+        if src_stat.st_size != entry.size or dest_stat.st_size != entry.size:
+            return False
+
+        # Fast path: neither side was touched since the last install
+        if src_stat.st_mtime_ns == entry.mtime_ns and dest_stat.st_mtime_ns == entry.mtime_ns:
+            return True
+
+        # The deployed copy was modified outside the ModLoader
+        if dest_stat.st_mtime_ns != entry.mtime_ns:
+            return False
+
+        # Only the cached source was touched, compare content before copying again
+        if hash_file(src) != entry.hash:
+            return False
+        os.utime(dest, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        entry.mtime_ns = src_stat.st_mtime_ns
+        return True
+
+    # Records a freshly deployed file
+    def record(
+        self,
+        target_rel: str,
+        source_rel: str,
+        src: Path,
+        content_hash: Optional[str] = None,
+        override: bool = False,
+    ) -> None:
+        src_stat = src.stat()
+        self.files[target_rel] = DeployedFile(
+            source=source_rel,
+            size=src_stat.st_size,
+            mtime_ns=src_stat.st_mtime_ns,
+            hash=content_hash or hash_file(src),
+            override=override,
+        )
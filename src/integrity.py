@@ -0,0 +1,80 @@
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from manifest_journal import write_json_atomic
+
+# Data class representing the problems found in one mod's cached files
+@dataclass
+class ModIntegrity:
+    missing: List[str] = field(default_factory=list)  # source_rel of files no longer in the cache
+    modified: List[str] = field(default_factory=list)  # source_rel of files whose content changed
+
+# Data class summarizing an integrity check
+@dataclass
+class IntegrityReport:
+    mods: Dict[str, ModIntegrity] = field(default_factory=dict)  # Only mods with problems
+    files_checked: int = 0
+    files_hashed: int = 0  # Files that had to be read, the rest were answered by the memo
+    bytes_hashed: int = 0
+
+    # Checks whether every cached file is present and unchanged
+    @property
+    def ok(self) -> bool:
+        return not self.mods
+
+# Persistent memo of file hashes keyed by path and validated against (inode, size, mtime),
+# so files that were not touched since their last check are never read again
+class HashMemo:
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, list] = {}  # Path -> [inode, size, mtime_ns, hash]
+        self.dirty = False
+        self.load()
+
+    # Loads the memo file, starting empty if it is missing or unreadable
+    def load(self) -> None:
+        self.entries = {}
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            self.entries = {}
+
+    # Saves the memo file if it changed
+    def save(self) -> None:
+        if self.dirty:
+            write_json_atomic(self.path, self.entries, indent=None)
+            self.dirty = False
+
+    # Returns the memoized hash of a file if it is unchanged since it was hashed
+    def get(self, key: str, stat: os.stat_result) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry and entry[:3] == [stat.st_ino, stat.st_size, stat.st_mtime_ns]:
+            return entry[3]
+        return None
+
+    # Records the hash of a file as of the given stat
+    def put(self, key: str, stat: os.stat_result, content_hash: str) -> None:
+        self.entries[key] = [stat.st_ino, stat.st_size, stat.st_mtime_ns, content_hash]
+        self.dirty = True
+
+    # Drops entries for files that are not part of the check anymore
+    def prune(self, keys: List[str]) -> None:
+        keep = set(keys)
+        stale = [key for key in self.entries if key not in keep]
+        for key in stale:
+            del self.entries[key]
+        self.dirty = self.dirty or bool(stale)
+
+# Returns the (stat, memoized hash) of a file, stat is None if the file is missing
+def stat_with_memo(memo: HashMemo, key: str, path: Path) -> Tuple[Optional[os.stat_result], Optional[str]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None, None
+    return stat, memo.get(key, stat)
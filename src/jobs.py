@@ -0,0 +1,95 @@
+import queue
+import threading
+from dataclasses import dataclass
+import time
+from typing import Any, Callable, List, Optional
+
+# Minimum time between two progress events of a job in seconds, the last event is always sent
+PROGRESS_INTERVAL = 0.1
+
+# Raised inside an operation once its job has been cancelled
+class JobCancelled(Exception):
+    pass
+
+# Data class representing a progress update from a running operation
+@dataclass
+class ProgressEvent:
+    stage: str  # e.g. "install" or "import"
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    current: str = ""  # File being processed
+
+# Progress reporting and cooperative cancellation handed to long ModLoader operations
+class JobContext:
+    def __init__(self, on_progress: Optional[Callable[[ProgressEvent], None]] = None):
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self._last_report = 0.0
+
+    # Requests the operation to stop at its next checkpoint
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    # Checks whether cancellation was requested
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    # Raises JobCancelled if cancellation was requested
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    # Sends a progress event to the listener, at most one per PROGRESS_INTERVAL so per-chunk
+    # reports do not flood it. The event completing the stage is always sent.
+    def report(self, event: ProgressEvent) -> None:
+        if not self.on_progress:
+            return
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_INTERVAL and event.files_done < event.files_total:
+            return
+        self._last_report = now
+        self.on_progress(event)
+
+# Runs an operation on a worker thread; progress is queued so the UI thread can poll it
+class BackgroundJob:
+    def __init__(self, target: Callable[[JobContext], Any]):
+        self.target = target
+        self.events: "queue.Queue[ProgressEvent]" = queue.Queue()
+        self.context = JobContext(self.events.put)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        try:
+            self.result = self.target(self.context)
+        except BaseException as e:
+            self.error = e
+
+    # Starts the worker thread
+    def start(self) -> "BackgroundJob":
+        self._thread.start()
+        return self
+
+    # Requests cooperative cancellation
+    def cancel(self) -> None:
+        self.context.cancel()
+
+    # Checks whether the operation finished, successfully or not
+    def is_done(self) -> bool:
+        return not self._thread.is_alive()
+
+    # Checks whether the operation stopped because it was cancelled
+    def was_cancelled(self) -> bool:
+        return isinstance(self.error, JobCancelled)
+
+    # Returns every progress event queued since the last poll
+    def poll(self) -> List[ProgressEvent]:
+        events: List[ProgressEvent] = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
@@ -0,0 +1,92 @@
+import logging
+import sys
+from logging.handlers import MemoryHandler, RotatingFileHandler
+from pathlib import Path
+from typing import List, Optional
+
+# Name of the logger every module logs under
+LOGGER_NAME = "ts1modloader"
+
+LOG_FILE_NAME = "modloader.log"
+LOG_FILE_MAX_BYTES = 1024 * 1024  # Rotated at 1 MB
+LOG_FILE_BACKUPS = 5  # modloader.log.1 to .5 are kept
+LOG_BUFFER_RECORDS = 500  # Records held in memory before they are written, warnings are written at once
+
+# Levels accepted in the settings, by name
+LOG_LEVELS = {
+    "debug": logging.DEBUG,  # Also logs every file copied, deleted or restored
+    "info": logging.INFO,  # Summaries of each operation
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+# Handlers installed by configure_logging, replaced when it is called again
+_handlers: List[logging.Handler] = []
+
+# Formats warnings and errors as "[WARNING] message", other records as the bare message
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        return f"[{record.levelname}] {message}" if record.levelno >= logging.WARNING else message
+
+# Writes to whatever sys.stdout is when a record is emitted, so redirections made after setup
+# are honored, and drops records when there is no console (pythonw)
+class ConsoleHandler(logging.StreamHandler):
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if sys.stdout is not None:
+            super().emit(record)
+
+# Returns the logger of a module
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+# Sends log records to the console and, when log_dir is given, to a buffered rotating file.
+# Calling it again replaces the previous handlers.
+def configure_logging(log_dir: Optional[Path] = None, level: str = "info") -> None:
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in _handlers:
+        logger.removeHandler(handler)
+        target = getattr(handler, "target", None)
+        handler.close()  # A MemoryHandler flushes, but leaves its target open
+        if target is not None:
+            target.close()
+    _handlers.clear()
+
+    logger.setLevel(LOG_LEVELS.get(level, logging.INFO))
+    logger.propagate = False
+
+    console = ConsoleHandler()
+    console.setFormatter(ConsoleFormatter())
+    _handlers.append(console)
+
+    file_error = None
+    if log_dir is not None:
+        try:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                log_dir / LOG_FILE_NAME, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS,
+                encoding="utf-8", delay=True
+            )
+        except OSError as e:
+            file_error = e
+        else:
+            file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+            _handlers.append(MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=file_handler))
+
+    for handler in _handlers:
+        logger.addHandler(handler)
+    if file_error:
+        logger.warning(f"Log file unavailable, logging to the console only: {file_error}")
+
+# Writes buffered records to the log file, called at the end of each operation
+def flush_logs() -> None:
+    for handler in _handlers:
+        handler.flush()
@@ -1,3 +1,8 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
+import functools
+import multiprocessing
 import subprocess
 import os
 import sys
@@ -8,8 +13,29 @@ from datetime import datetime
 
 from settings import Settings
 from modloader import ModLoader
+from log import flush_logs, get_logger
 from ui import UI
 
+logger = get_logger("main")
+
+# Prints how long each startup phase took, e.g. "pythonw main.pyw --timings"
+PRINT_STARTUP_TIMINGS = "--timings" in sys.argv
+startup_marks = []
+
+# Records the end of a startup phase
+def mark_startup(phase):
+    startup_marks.append((phase, time.perf_counter()))
+
+def print_startup_timings():
+    print("Startup timings:")
+    previous = STARTUP_STARTED
+    for phase, ended in startup_marks:
+        print(f"  {phase:<12} {(ended - previous) * 1000:8.1f} ms")
+        previous = ended
+    print(f"  {'total':<12} {(previous - STARTUP_STARTED) * 1000:8.1f} ms")
+
+mark_startup("imports")
+
 def display_boot_message():
     root = tk.Tk()
     root.withdraw()
@@ -29,39 +55,12 @@ def display_boot_message():
     )
     root.destroy()
 
-def main():
-    # Initialize UI
-    ui = UI(settings, play_callback=play, modloader=mod_loader)
-    ui.run()
-
-# Initialize submodules
-os.chdir(os.getcwd())  # Ensure working directory is the script's directory
-settings = Settings()
-
-# Edge case: First boot without a configured game path
-if not settings.get_game_path():
-    # Show message and prompt for game folder
-    display_boot_message()
-    print("Game path not set. Please select the game folder.")
-
-    if settings.select_game_path():
-        print(f"Game path set to: {settings.get_game_path()}")
-    else:
-        messagebox.showerror(
-            "TS1 ModLoader - Setup Failed",
-            "The Sims 1 installation folder was not selected.\n\n" \
-            "The application will now exit."
-        )
-        print("No folder selected. Exiting.")
-        sys.exit(0)
-
-mod_loader = ModLoader(settings)
-
-# Initializes The Sims 1 in the selected game path
-def play():
+# Applies mods in the background, then initializes The Sims 1 in the selected game path.
+# run_job runs an operation off the UI thread and calls back once it succeeded.
+def play(settings, mod_loader, run_job, on_started=None):
     game_path = settings.get_game_path()
     if not game_path:
-        print("Game path is not set. Please set the game path first.")
+        logger.warning("Game path is not set. Please set the game path first.")
         return
 
     # Check for new (unlocked) mods that will be locked after this session
@@ -78,30 +77,94 @@ def play():
             "Do you want to continue?"
         )
         if not result:
-            print("User cancelled mod installation.")
+            logger.info("User cancelled mod installation.")
             return
 
-    print("Verifying mod installation..")
-    if not mod_loader.validate_installation():
-        print("Mod validation failed due to conflicts.")
-        print("Please resolve the conflicts and try again.")
-        return
+    logger.info("Verifying mod installation..")
+    # Validation may rebuild the conflict and GUID indexes, so it runs in the job, before anything is applied
+    def apply_mods(job):
+        problems = mod_loader.get_validation_problems()
+        if problems:
+            return problems, None
+        logger.info("Applying mods...")
+        return [], mod_loader.install_all(job=job)
+
+    # The game only starts once every mod has been applied
+    def on_installed(result):
+        problems, report = result
+        if problems:
+            mod_loader.report_problems(problems, messagebox.showerror)
+            logger.error("Mod validation failed due to conflicts. Please resolve the conflicts and try again.")
+            return
+        logger.info(
+            f"Mods applied: {report.copied} file(s) copied, {report.skipped} file(s) already up to date, "
+            f"{report.deleted} stale file(s) removed"
+        )
+        launch(settings, mod_loader, game_path, current_mod_ids)
+        if on_started:
+            on_started()
 
-    print("Applying mods...")
-    mod_loader.install_all()
+    run_job("Applying mods", apply_mods, on_installed)
 
-    # Lock currently installed mods (prevents removal after game start)
-    current_mod_ids = list(mod_loader.mods.keys())
-    mod_loader.lock_mods(current_mod_ids)
+# Locks installed mods and starts the game
+def launch(settings, mod_loader, game_path, installed_mod_ids):
+    # Lock installed mods (prevents removal after game start)
+    mod_loader.lock_mods(installed_mod_ids)
 
     # Update last played timestamp
     timestamp = datetime.now().strftime("%B %d, %Y at %H:%M")
     settings.set_last_played(timestamp)
 
-    print(f"Launching The Sims 1 from: {game_path}")
+    logger.info(f"Launching The Sims 1 from: {game_path}")
     # Launch the game with the game directory as the working directory
     # This is necessary for The Sims 1 to find its data files
-    subprocess.Popen([os.path.join(game_path, "Sims.exe")], cwd=game_path)
+    with mod_loader.metrics.span("launch"):
+        subprocess.Popen([os.path.join(game_path, "Sims.exe")], cwd=game_path)
+    # The app may be closed while the game runs, so the launch is written to the log file right away
+    flush_logs()
+
+# Starts the app. Everything runs from here, under the __main__ guard, so that worker processes
+# of the process-based copy pool can import this module without opening dialogs or the window.
+def main():
+    # Initialize submodules
+    os.chdir(os.getcwd())  # Ensure working directory is the script's directory
+    settings = Settings()
+
+    # Edge case: First boot without a configured game path
+    if not settings.get_game_path():
+        # Show message and prompt for game folder
+        display_boot_message()
+        logger.info("Game path not set. Please select the game folder.")
+
+        if settings.select_game_path():
+            logger.info(f"Game path set to: {settings.get_game_path()}")
+        else:
+            messagebox.showerror(
+                "TS1 ModLoader - Setup Failed",
+                "The Sims 1 installation folder was not selected.\n\n" \
+                "The application will now exit."
+            )
+            logger.info("No folder selected. Exiting.")
+            sys.exit(0)
+
+    mark_startup("settings")
+    mod_loader = ModLoader(settings)
+    mark_startup("modloader")
+
+    # Initialize UI
+    ui = UI(settings, play_callback=functools.partial(play, settings, mod_loader), modloader=mod_loader)
+    mark_startup("window")
+
+    if PRINT_STARTUP_TIMINGS:
+        # Runs once the event loop is up, after the first page has been laid out
+        def on_first_paint():
+            ui.root.update_idletasks()
+            mark_startup("first paint")
+            print_startup_timings()
+        ui.root.after_idle(on_first_paint)
+    ui.run()
 
 if __name__ == "__main__":
+    # Required for the process-based copy pool in frozen builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
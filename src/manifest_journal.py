@@ -0,0 +1,52 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from log import get_logger
+
+logger = get_logger("manifest_journal")
+
+# Writes JSON to a temporary file and renames it over the target, so readers never see a partial file
+def write_json_atomic(path: Path, data: Any, indent: int = 2) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Append-only log of manifest operations, replayed on top of the last manifest snapshot
+class ManifestJournal:
+    def __init__(self, path: Path):
+        self.path = path
+        self.truncated = False  # Set by read() when the last entry was cut short
+
+    # Reads every complete operation, ignoring a line cut short by a crash
+    def read(self) -> List[Dict[str, Any]]:
+        self.truncated = False
+        if not self.path.exists():
+            return []
+
+        ops: List[Dict[str, Any]] = []
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring incomplete manifest journal entry in {self.path}")
+                    self.truncated = True
+                    break
+        return ops
+
+    # Appends a single operation
+    def append(self, op: Dict[str, Any]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(op, separators=(",", ":")) + "\n")
+
+    # Empties the journal once its operations are part of a snapshot
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
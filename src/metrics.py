@@ -0,0 +1,153 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+METRICS_FILE_NAME = "metrics.jsonl"
+MEMORY_SINK_SPANS = 500  # Spans kept by a MemorySink, oldest dropped first
+
+# Data class representing a finished operation: how long it took and what it processed
+@dataclass
+class Span:
+    name: str
+    started_at: str  # Wall clock time, ISO format
+    duration: float = 0.0  # Seconds
+    counters: Dict[str, int] = field(default_factory=dict)  # e.g. files, bytes
+    parent: Optional[str] = None  # Name of the span this one ran within, on the same thread
+    depth: int = 0
+    error: Optional[str] = None  # Exception type when the operation failed or was cancelled
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+# Keeps the latest spans in memory, e.g. for the timings panel
+class MemorySink:
+    def __init__(self, max_spans: int = MEMORY_SINK_SPANS):
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    # Returns the recorded spans in the order they finished
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+# Appends every span to a file as one JSON object per line
+class JsonLinesSink:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        line = json.dumps(span.to_dict()) + "\n"
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError:
+                pass  # Metrics never fail an operation
+
+# Span handed out while metrics are disabled, every call is a no-op
+class _NullSpan:
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+# Times one operation and sends it to the sinks when it ends
+class _ActiveSpan:
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.span = Span(name, datetime.now().isoformat(timespec="milliseconds"))
+        self._started = 0.0
+
+    def __enter__(self) -> "_ActiveSpan":
+        stack = self.metrics._stack()
+        if stack:
+            self.span.parent = stack[-1].span.name
+            self.span.depth = len(stack)
+        stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.span.duration = time.perf_counter() - self._started
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        self.metrics._stack().pop()
+        self.metrics.emit(self.span)
+
+    # Adds to a counter of the span
+    def add(self, counter: str, amount: int = 1) -> None:
+        self.span.counters[counter] = self.span.counters.get(counter, 0) + amount
+
+# Collects operation spans and forwards them to pluggable sinks. Without sinks, span()
+# returns a shared no-op object, so instrumented code costs one attribute check.
+class Metrics:
+    def __init__(self):
+        self.sinks: List = []  # Objects with an emit(span) method
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink) -> None:
+        if sink not in self.sinks:
+            self.sinks = self.sinks + [sink]  # Replaced, not mutated, so emitting threads see a stable list
+
+    def remove_sink(self, sink) -> None:
+        self.sinks = [other for other in self.sinks if other is not sink]
+
+    # Returns a context manager timing an operation, use add() on it to count files or bytes
+    def span(self, name: str):
+        if not self.sinks:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name)
+
+    def emit(self, span: Span) -> None:
+        for sink in self.sinks:
+            sink.emit(span)
+
+    # Spans open on the current thread, innermost last
+    def _stack(self) -> List[_ActiveSpan]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+# Decorator recording a ModLoader method as a span named after the operation. counters, if
+# given, turns the method's result into counters, e.g. the files and bytes of a report.
+def timed_operation(name: str, counters: Optional[Callable[[object], Dict[str, int]]] = None):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.metrics.sinks:
+                return method(self, *args, **kwargs)
+            with self.metrics.span(name) as span:
+                result = method(self, *args, **kwargs)
+                if counters:
+                    for counter, amount in counters(result).items():
+                        span.add(counter, amount)
+                return result
+        return wrapper
+    return decorator
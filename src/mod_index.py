@@ -0,0 +1,211 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mods (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    image TEXT,
+    added_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mods_added_at ON mods(added_at);
+
+CREATE TABLE IF NOT EXISTS files (
+    mod_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source_rel TEXT NOT NULL,
+    target_rel TEXT,
+    blob_hash TEXT,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_files_mod_id ON files(mod_id);
+CREATE INDEX IF NOT EXISTS idx_files_target_rel ON files(target_rel);
+CREATE INDEX IF NOT EXISTS idx_files_blob_hash ON files(blob_hash);
+
+CREATE TABLE IF NOT EXISTS locks (
+    mod_id TEXT PRIMARY KEY
+);
+"""
+
+# File kinds stored in the files table
+KIND_DOWNLOAD = "download"
+KIND_OVERRIDE = "override"
+KIND_ASSET = "asset"  # Cached files that are not deployed, e.g. preview images
+
+# Deletes a database file along with its write-ahead log files
+def remove_database(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+# SQLite-backed index of mods, files, override targets and lock state.
+# Rows are returned as plain tuples so this module does not depend on the Mod class.
+class ModIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        # Operations may run on background jobs, so access is serialized with a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Databases created before file sizes were recorded
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(files)")]
+        if "size" not in columns:
+            self._conn.execute("ALTER TABLE files ADD COLUMN size INTEGER")
+
+    # Closes the database connection
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Inserts many mods at once, used when importing an existing manifest.json
+    def import_mods(self, mods: Iterable[tuple], locked_ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            for row in mods:
+                self._insert(*row)
+            self._conn.executemany("INSERT OR IGNORE INTO locks (mod_id) VALUES (?)", ((i,) for i in locked_ids))
+
+    # Adds a mod with its files
+    def add_mod(
+        self,
+        mod_id: str,
+        name: str,
+        description: Optional[str],
+        image: Optional[str],
+        added_at: Optional[str],
+        download_files: List[str],
+        override_files: List[Tuple[str, str]],
+        blobs: Dict[str, str],
+        sizes: Dict[str, int],
+    ) -> None:
+        with self._lock, self._conn:
+            self._insert(mod_id, name, description, image, added_at, download_files, override_files, blobs, sizes)
+
+    def _insert(self, mod_id, name, description, image, added_at, download_files, override_files, blobs, sizes) -> None:
+        self._conn.execute(
+            "INSERT INTO mods (id, name, description, image, added_at) VALUES (?, ?, ?, ?, ?)",
+            (mod_id, name, description, image, added_at),
+        )
+        rows = [(mod_id, KIND_DOWNLOAD, rel, None, blobs.get(rel), sizes.get(rel)) for rel in download_files]
+        rows += [(mod_id, KIND_OVERRIDE, src, dst, blobs.get(src), sizes.get(src)) for src, dst in override_files]
+        deployed = set(download_files) | {src for src, _ in override_files}
+        rows += [(mod_id, KIND_ASSET, rel, None, h, sizes.get(rel)) for rel, h in blobs.items() if rel not in deployed]
+        self._conn.executemany(
+            "INSERT INTO files (mod_id, kind, source_rel, target_rel, blob_hash, size) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    # Removes a mod and its files
+    def remove_mod(self, mod_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE mod_id = ?", (mod_id,))
+            self._conn.execute("DELETE FROM mods WHERE id = ?", (mod_id,))
+
+    # Returns (id, name, description, image, added_at) of a mod, or None
+    def get_mod(self, mod_id: str) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, name, description, image, added_at FROM mods WHERE id = ?", (mod_id,)
+            ).fetchone()
+
+    # Returns (id, name, description, image, added_at) of every mod, in insertion order
+    def mod_rows(self) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, name, description, image, added_at FROM mods ORDER BY rowid"
+            ).fetchall()
+
+    # Returns (kind, source_rel, target_rel, blob_hash, size) rows of a mod, in insertion order
+    def get_files(self, mod_id: str) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT kind, source_rel, target_rel, blob_hash, size FROM files WHERE mod_id = ? ORDER BY rowid",
+                (mod_id,),
+            ).fetchall()
+
+    # Returns (id, name, description, files) of every mod in insertion order, files being the
+    # (source_rel, target_rel, blob_hash, size) rows of its downloads, then of its overrides.
+    # Two queries for the whole collection, used to build the search index.
+    def search_rows(self) -> List[tuple]:
+        with self._lock:
+            mods = self._conn.execute("SELECT id, name, description FROM mods ORDER BY rowid").fetchall()
+            files = self._conn.execute(
+                "SELECT mod_id, kind, source_rel, target_rel, blob_hash, size FROM files "
+                "WHERE kind IN (?, ?) ORDER BY rowid",
+                (KIND_DOWNLOAD, KIND_OVERRIDE),
+            ).fetchall()
+        downloads: Dict[str, List[tuple]] = {}
+        overrides: Dict[str, List[tuple]] = {}
+        for mod_id, kind, source_rel, target_rel, blob_hash, size in files:
+            rows = downloads if kind == KIND_DOWNLOAD else overrides
+            rows.setdefault(mod_id, []).append((source_rel, target_rel, blob_hash, size))
+        return [
+            (mod_id, name, description, downloads.get(mod_id, []) + overrides.get(mod_id, []))
+            for mod_id, name, description in mods
+        ]
+
+    # Checks whether a mod exists
+    def has_mod(self, mod_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM mods WHERE id = ?", (mod_id,)).fetchone() is not None
+
+    # Returns the number of mods
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM mods").fetchone()[0]
+
+    # Returns every mod ID, in insertion order
+    def mod_ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM mods ORDER BY rowid")]
+
+    # Returns the IDs of mods overriding the given target path
+    def target_owners(self, target_rel: str) -> List[str]:
+        with self._lock:
+            return [
+                row[0] for row in self._conn.execute(
+                    "SELECT DISTINCT mod_id FROM files WHERE target_rel = ?", (target_rel,)
+                )
+            ]
+
+    # Returns the IDs of mods added after an ISO timestamp
+    def mods_added_after(self, timestamp: str) -> List[str]:
+        with self._lock:
+            return [
+                row[0] for row in self._conn.execute(
+                    "SELECT id FROM mods WHERE added_at > ? ORDER BY added_at", (timestamp,)
+                )
+            ]
+
+    # Returns how many cached files reference each blob. A file listed as both a download and an
+    # override holds one reference, like it is released once, so rows are counted per source_rel.
+    def blob_refcounts(self) -> Iterator[Tuple[str, int]]:
+        with self._lock:
+            return iter(self._conn.execute(
+                "SELECT blob_hash, COUNT(*) FROM ("
+                "SELECT DISTINCT mod_id, source_rel, blob_hash FROM files WHERE blob_hash IS NOT NULL"
+                ") GROUP BY blob_hash"
+            ).fetchall())
+
+    # Marks mods as locked
+    def lock(self, mod_ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO locks (mod_id) VALUES (?)", ((i,) for i in mod_ids))
+
+    # Unlocks a mod
+    def unlock(self, mod_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM locks WHERE mod_id = ?", (mod_id,))
+
+    # Checks whether a mod is locked
+    def is_locked(self, mod_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM locks WHERE mod_id = ?", (mod_id,)).fetchone() is not None
+
+    # Returns every locked mod ID, in the order they were locked
+    def locked_ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT mod_id FROM locks ORDER BY rowid")]
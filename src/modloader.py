@@ -1,26 +1,232 @@
 import json
+import logging
 from operator import mod
+import os
 import shutil
-from dataclasses import dataclass
+import sys
+import threading
+import zipfile
+from collections import Counter
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, replace
+from datetime import datetime
 from pathlib import Path
-from tkinter import messagebox
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+from backup_store import BackupStore
+from blob_store import BlobStore
+from bulk_import import BulkImportReport, ImportSource, open_entries, scan_source
+from conflicts import (
+    PROBLEM_DUPLICATE_IDS, PROBLEM_GUID_CLASH, PROBLEM_OVERRIDE_CONFLICT, Conflict, ConflictError,
+    ConflictIndex, GuidClash, GuidIndex, ValidationProblem, normalize_target,
+)
+from copier import DEPLOY_HARDLINK, CopyEngine, CopyJob
+from far import FarArchive, FarEntry, FarError
+from hashing import hash_file, hash_file_mapped
+from iff import IffMetadata, IffMetadataCache
+from install_state import InstallReport, InstallState
+from integrity import HashMemo, IntegrityReport, ModIntegrity, stat_with_memo
+from jobs import JobContext, ProgressEvent
+from log import configure_logging, flush_logs, get_logger
+from manifest_journal import ManifestJournal, write_json_atomic
+from metrics import METRICS_FILE_NAME, JsonLinesSink, MemorySink, Metrics, timed_operation
+from reconcile import ReconcilePlan, prune_empty_dirs
+from mod_index import KIND_DOWNLOAD, KIND_OVERRIDE, ModIndex, remove_database
+from search_index import SORT_ADDED, SORT_LOCKED, SearchIndex
 from settings import Settings
 
-# Data class representing a mod
-@dataclass
+logger = get_logger("modloader")
+
+# Conflicts listed in the validation dialog, the rest are only printed
+MAX_CONFLICTS_SHOWN = 15
+
+# Journal operations kept before they are compacted into manifest.json
+JOURNAL_COMPACT_THRESHOLD = 200
+
+# Loader returning (download_files, override_files, blobs, sizes) for a lazily materialized mod
+FileLoader = Callable[[], Tuple[List[str], List[Tuple[str, str]], Dict[str, str], Dict[str, int]]]
+
+# Compact record representing a mod. Mods listed from the SQLite index load their file lists
+# on first access, so listing mods (id, name, lock state) never queries their files.
 class Mod:
-    id: str
-    name: str
-    description: Optional[str]
-    image: Optional[str]
-    download_files: List[str]  # Files to be placed in Downloads/{mod_id}
-    override_files: List[Tuple[str, str]]  # Override files (source_rel, target_rel)
+    __slots__ = (
+        "id", "name", "description", "image", "added_at",
+        "_download_files", "_override_files", "_blobs", "_sizes", "_loader",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        description: Optional[str],
+        image: Optional[str],
+        download_files: List[str],  # Files to be placed in Downloads/{mod_id}
+        override_files: List[Tuple[str, str]],  # Override files (source_rel, target_rel)
+        blobs: Optional[Dict[str, str]] = None,  # Content hash of each cached file, by source_rel
+        added_at: Optional[str] = None,  # ISO timestamp of when the mod was added
+        sizes: Optional[Dict[str, int]] = None,  # Size of each cached file in bytes, by source_rel
+    ):
+        self.id = sys.intern(id)
+        self.name = name
+        self.description = description
+        self.image = image
+        self.added_at = added_at
+        self._loader: Optional[FileLoader] = None
+        self._set_files(download_files, override_files, blobs if blobs is not None else {}, sizes or {})
+
+    # Creates a mod whose files are only read through loader() when first needed
+    @classmethod
+    def lazy(
+        cls,
+        id: str,
+        name: str,
+        description: Optional[str],
+        image: Optional[str],
+        added_at: Optional[str],
+        loader: FileLoader,
+    ) -> "Mod":
+        mod = cls(id, name, description, image, [], [], {}, added_at, {})
+        mod._loader = loader
+        return mod
+
+    # Checks whether the file lists have been loaded
+    @property
+    def is_loaded(self) -> bool:
+        return self._loader is None
+
+    def _materialize(self) -> None:
+        loader = self._loader
+        if loader is not None:
+            self._set_files(*loader())
+            self._loader = None
+
+    # Stores file lists. Content hashes are interned, as many files and mods share them. Paths are
+    # kept as given: interning every path slowed loading manifest.json by half and json.load
+    # already shares the keys of the blobs and sizes dicts.
+    def _set_files(self, download_files, override_files, blobs, sizes) -> None:
+        self._download_files = download_files
+        self._override_files = override_files
+        self._blobs = {rel: sys.intern(content_hash) for rel, content_hash in blobs.items()}
+        self._sizes = sizes
+
+    @property
+    def download_files(self) -> List[str]:
+        self._materialize()
+        return self._download_files
+
+    @download_files.setter
+    def download_files(self, value: List[str]) -> None:
+        self._materialize()
+        self._download_files = value
+
+    @property
+    def override_files(self) -> List[Tuple[str, str]]:
+        self._materialize()
+        return self._override_files
+
+    @override_files.setter
+    def override_files(self, value: List[Tuple[str, str]]) -> None:
+        self._materialize()
+        self._override_files = value
+
+    @property
+    def blobs(self) -> Dict[str, str]:
+        self._materialize()
+        return self._blobs
+
+    @blobs.setter
+    def blobs(self, value: Dict[str, str]) -> None:
+        self._materialize()
+        self._blobs = value
+
+    @property
+    def sizes(self) -> Dict[str, int]:
+        self._materialize()
+        return self._sizes
+
+    @sizes.setter
+    def sizes(self, value: Dict[str, int]) -> None:
+        self._materialize()
+        self._sizes = value
+
+    def _fields(self) -> tuple:
+        return (
+            self.id, self.name, self.description, self.image,
+            self.download_files, self.override_files, self.blobs, self.added_at, self.sizes,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mod):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        files = "loaded" if self.is_loaded else "not loaded"
+        return f"Mod(id={self.id!r}, name={self.name!r}, files {files})"
+
+# Dict-like view of the mods stored in a ModIndex, loading each mod on access
+class IndexedMods(MutableMapping):
+    def __init__(self, index: ModIndex):
+        self.index = index
+
+    def __getitem__(self, mod_id: str) -> Mod:
+        row = self.index.get_mod(mod_id)
+        if row is None:
+            raise KeyError(mod_id)
+        return self._mod_from_row(row)
+
+    # Builds a mod whose files are queried on first access
+    def _mod_from_row(self, row: tuple) -> Mod:
+        mod_id, name, description, image, added_at = row
+        return Mod.lazy(mod_id, name, description, image, added_at, lambda: self._load_files(mod_id))
+
+    def _load_files(self, mod_id: str) -> Tuple[List[str], List[Tuple[str, str]], Dict[str, str], Dict[str, int]]:
+        download_files: List[str] = []
+        override_files: List[Tuple[str, str]] = []
+        blobs: Dict[str, str] = {}
+        sizes: Dict[str, int] = {}
+        for kind, source_rel, target_rel, blob_hash, size in self.index.get_files(mod_id):
+            if kind == KIND_DOWNLOAD:
+                download_files.append(source_rel)
+            elif kind == KIND_OVERRIDE:
+                override_files.append((source_rel, target_rel))
+            if blob_hash:
+                blobs[source_rel] = blob_hash
+            if size is not None:
+                sizes[source_rel] = size
+        return download_files, override_files, blobs, sizes
+
+    # Lists every mod with a single query
+    def values(self) -> List[Mod]:
+        return [self._mod_from_row(row) for row in self.index.mod_rows()]
+
+    def items(self) -> List[Tuple[str, Mod]]:
+        return [(mod.id, mod) for mod in self.values()]
+
+    def __setitem__(self, mod_id: str, mod: Mod) -> None:
+        self.index.add_mod(
+            mod_id, mod.name, mod.description, mod.image, mod.added_at,
+            mod.download_files, mod.override_files, mod.blobs, mod.sizes,
+        )
+
+    def __delitem__(self, mod_id: str) -> None:
+        if not self.index.has_mod(mod_id):
+            raise KeyError(mod_id)
+        self.index.remove_mod(mod_id)
+
+    def __contains__(self, mod_id: object) -> bool:
+        return isinstance(mod_id, str) and self.index.has_mod(mod_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index.mod_ids())
+
+    def __len__(self) -> int:
+        return self.index.count()
 
 # ModLoader class to manage mods
 class ModLoader:
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(self, settings: Optional[Settings] = None, metrics: Optional[Metrics] = None):
         # Validate and set up paths
         self.settings = settings or Settings()
         game_path_str = self.settings.get_game_path()
@@ -31,122 +237,757 @@ class ModLoader:
         if not self.game_path.exists():
             raise FileNotFoundError(f"Game path does not exist: {self.game_path}")
 
+        # Operation timings, only collected while a sink is attached
+        self.metrics = metrics or Metrics()
+        self.metrics_log = MemorySink()  # Latest spans, shown in the Settings page
+        self.metrics_file = JsonLinesSink(self.game_path / "mod_cache" / "logs" / METRICS_FILE_NAME)
+        self.set_metrics_enabled(self.settings.get_record_metrics())
+
         # Load mod manifest
-        self._load_manifest()
+        with self.metrics.span("load_manifest") as span:
+            self._load_manifest()
+            if self.metrics.enabled:
+                span.add("mods", len(self.mods))
+
+    # Attaches or detaches the built-in metrics sinks: the in-memory log and metrics.jsonl
+    def set_metrics_enabled(self, enabled: bool) -> None:
+        for sink in (self.metrics_log, self.metrics_file):
+            if enabled:
+                self.metrics.add_sink(sink)
+            else:
+                self.metrics.remove_sink(sink)
 
-    # Loads mod manifest from file
+    # Loads mod manifest from file, or from the SQLite index when that backend is selected
     def _load_manifest(self) -> None:
         # Starting variables
         self.cache_dir = self.game_path / "mod_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        configure_logging(self.cache_dir / "logs", self.settings.get_log_level())
 
         self.manifest_path = self.cache_dir / "manifest.json"
+        self.index_path = self.cache_dir / "mods.db"
+        self.install_state_path = self.cache_dir / "install_state.json"
+        self.conflict_index_path = self.cache_dir / "conflict_index.json"
+        self.hash_memo_path = self.cache_dir / "hash_memo.json"
+        self.guid_index_path = self.cache_dir / "guid_index.json"
         self.duplicate_ids_found = False
         self.mods: Dict[str, Mod] = {}
         self.locked_mods: List[str] = []  # Mods that have been started with and cannot be removed
+        self.index: Optional[ModIndex] = None
+        self.blob_store = BlobStore(self.cache_dir / ".blobs")
+        self.backups = BackupStore(self.cache_dir / ".originals")
+        self._refcounts_loaded = False
+        self._conflict_index: Optional[ConflictIndex] = None
+        self._guid_index: Optional[GuidIndex] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._search_lock = threading.Lock()
+        self.iff_metadata = IffMetadataCache(self.cache_dir / "iff_metadata.json")
+
+        self.journal = ManifestJournal(self.cache_dir / "manifest.journal")
+        self.journal_seq = 0  # Sequence number of the last applied journal operation
+        self.journal_pending = 0  # Operations not yet compacted into manifest.json
+
+        if self.settings.get_manifest_backend() == "sqlite":
+            self._load_index()
+            return
+        if self.index_path.exists():
+            self._export_index()
+        self._load_json_manifest()
+        logger.info(f"Loaded {len(self.mods)} mods from manifest")
 
+    # Loads manifest.json and replays the manifest journal on top of it
+    def _load_json_manifest(self) -> None:
         # Prepare file if it doesn't exist
         if not self.manifest_path.exists():
-            self.manifest_path.write_text(json.dumps({"mods": [], "locked_mods": []}, indent=4))
-            return
+            write_json_atomic(self.manifest_path, {"mods": [], "locked_mods": [], "journal_seq": 0}, indent=4)
 
         with self.manifest_path.open("r", encoding="utf-8") as f:
             data = json.load(f)
 
         # Load locked mods from manifest
         self.locked_mods = data.get("locked_mods", [])
+        self.journal_seq = data.get("journal_seq", 0)
 
         # Parse mods from manifest
-        self.duplicate_ids_found = False
         for mod_data in data.get("mods", []):
-            overrides_raw = mod_data.get("overrides", [])
-            overrides: List[Tuple[str, str]] = []
-            for item in overrides_raw:
-                src = item.get("source")
-                dst = item.get("target")
-                if not src or not dst:
-                    continue
-                overrides.append((src, dst))
-
-            # Assign mod data to Mod instance
-            mod = Mod(
-                id=mod_data["id"],
-                name=mod_data.get("name", mod_data["id"]),
-                description=mod_data.get("description"),
-                image=mod_data.get("image"),
-                download_files=mod_data.get("downloads", []),
-                override_files=overrides,
+            self._apply_op({"op": "add", "mod": mod_data})
+
+        # Replay operations recorded after the snapshot was written
+        for op in self.journal.read():
+            if op.get("seq", 0) <= self.journal_seq:
+                continue
+            self._apply_op(op)
+            self.journal_seq = op["seq"]
+            self.journal_pending += 1
+        # A damaged tail must be compacted away before new operations are appended after it
+        if self.journal.truncated or self.journal_pending >= JOURNAL_COMPACT_THRESHOLD:
+            self._save_manifest()
+
+    # Opens the SQLite index, importing manifest.json the first time it is used
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            if self.manifest_path.exists():
+                self._load_json_manifest()
+            # Built under a temporary name, so a failed import never leaves an empty mods.db
+            # that would later be taken for a finished one
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.tmp")
+            remove_database(tmp_path)
+            index = ModIndex(tmp_path)
+            try:
+                index.import_mods(
+                    (
+                        (mod.id, mod.name, mod.description, mod.image, mod.added_at,
+                         mod.download_files, mod.override_files, mod.blobs, mod.sizes)
+                        for mod in self.mods.values()
+                    ),
+                    self.locked_mods,
+                )
+            finally:
+                index.close()
+            os.replace(tmp_path, self.index_path)
+            logger.info(f"Imported {len(self.mods)} mods from manifest into {self.index_path.name}")
+
+        # Mods are queried on demand, startup no longer reads the whole collection
+        self.index = ModIndex(self.index_path)
+        self.mods = IndexedMods(self.index)
+        self.locked_mods = []
+
+    # Writes mods.db back to manifest.json when switching back to the JSON backend, then deletes
+    # it, so switching to SQLite again imports the manifest as it is then
+    def _export_index(self) -> None:
+        index = ModIndex(self.index_path)
+        try:
+            self.mods = {mod.id: mod for mod in IndexedMods(index).values()}
+            self.locked_mods = index.locked_ids()
+            # Numbered past any journal left over from the JSON backend, so none of it is replayed
+            self.journal_seq = max([self._read_journal_seq()] + [op.get("seq", 0) for op in self.journal.read()])
+            self._save_manifest()
+        finally:
+            index.close()
+        remove_database(self.index_path)
+        logger.info(f"Exported {len(self.mods)} mods from {self.index_path.name} into {self.manifest_path.name}")
+        self.mods = {}
+        self.locked_mods = []
+        self.journal_seq = 0
+
+    # Returns the journal sequence number stored in manifest.json, 0 if it cannot be read
+    def _read_journal_seq(self) -> int:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as f:
+                return json.load(f).get("journal_seq", 0)
+        except (OSError, ValueError):
+            return 0
+
+    # Counts how many cached files point at each blob, on first use
+    def _load_refcounts(self) -> None:
+        if self._refcounts_loaded:
+            return
+        if self.index:
+            self.blob_store.refcounts = Counter(dict(self.index.blob_refcounts()))
+        else:
+            self.blob_store.rebuild_refcounts(
+                content_hash for mod in self.mods.values() for content_hash in mod.blobs.values()
             )
+        self._refcounts_loaded = True
 
+    # Applies a single manifest operation to the in-memory state
+    def _apply_op(self, op: dict) -> None:
+        kind = op.get("op")
+        if kind == "add":
+            mod = self._mod_from_entry(op["mod"])
             # Edge case: Duplicate mod IDs
             if mod.id in self.mods:
-                print(f"[WARNING] Duplicate mod ID in manifest: {mod.id}. Overwriting previous entry.")
+                logger.warning(f"Duplicate mod ID in manifest: {mod.id}. Overwriting previous entry.")
                 self.duplicate_ids_found = True
             self.mods[mod.id] = mod
-        print(f"Loaded {len(self.mods)} mods from manifest")
+        elif kind == "remove":
+            self.mods.pop(op["id"], None)
+        elif kind == "lock":
+            for mod_id in op["ids"]:
+                if mod_id not in self.locked_mods:
+                    self.locked_mods.append(mod_id)
+        elif kind == "unlock":
+            if op["id"] in self.locked_mods:
+                self.locked_mods.remove(op["id"])
+        else:
+            logger.warning(f"Unknown manifest operation: {kind}")
+
+    # Builds a Mod instance from its manifest entry. json.load has already parsed the file lists,
+    # so they are stored right away; deferring them would keep the parsed entry alive instead.
+    @staticmethod
+    def _mod_from_entry(mod_data: dict) -> Mod:
+        overrides: List[Tuple[str, str]] = []
+        for item in mod_data.get("overrides", []):
+            src = item.get("source")
+            dst = item.get("target")
+            if not src or not dst:
+                continue
+            overrides.append((src, dst))
+
+        return Mod(
+            id=mod_data["id"],
+            name=mod_data.get("name", mod_data["id"]),
+            description=mod_data.get("description"),
+            image=mod_data.get("image"),
+            download_files=mod_data.get("downloads", []),
+            override_files=overrides,
+            blobs=mod_data.get("blobs", {}),
+            added_at=mod_data.get("added_at"),
+            sizes=mod_data.get("sizes", {}),
+        )
+
+    # Builds the manifest entry of a Mod instance
+    @staticmethod
+    def _mod_to_entry(mod: Mod) -> dict:
+        return {
+            "id": mod.id,
+            "name": mod.name,
+            "description": mod.description,
+            "image": mod.image,
+            "downloads": mod.download_files,
+            "overrides": [
+                {"source": src, "target": dst}
+                for src, dst in mod.override_files
+            ],
+            "blobs": mod.blobs,
+            "sizes": mod.sizes,
+            "added_at": mod.added_at,
+        }
+
+    # Appends an operation to the manifest journal, compacting it into a snapshot when it grows.
+    # The SQLite backend commits its changes directly and keeps no journal.
+    def _record(self, op: dict) -> None:
+        if self.index:
+            return
+        self.journal_seq += 1
+        self.journal.append({"seq": self.journal_seq, **op})
+        self.journal_pending += 1
+        if self.journal_pending >= JOURNAL_COMPACT_THRESHOLD:
+            self._save_manifest()
+
+    # Resolves a cached file path (relative to mod_cache) to where its content is stored
+    def cache_path(self, mod: Mod, source_rel: str) -> Path:
+        content_hash = mod.blobs.get(source_rel)
+        if content_hash:
+            return self.blob_store.path_for(content_hash)
+        # Mods added before the blob store keep their files under mod_cache/{mod_id}
+        return self.cache_dir / source_rel
+
+    # Returns the override target index, loading it on first use and rebuilding it if stale
+    @property
+    def conflict_index(self) -> ConflictIndex:
+        if self._conflict_index is None:
+            index = ConflictIndex(self.conflict_index_path)
+            if not index.load() or index.mod_ids != set(self.mods):
+                index.rebuild(
+                    (mod.id, [target_rel for _, target_rel in mod.override_files])
+                    for mod in self.mods.values()
+                )
+                index.save()
+            self._conflict_index = index
+        return self._conflict_index
+
+    # Returns the mod search index, building it on first use
+    @property
+    def search_index(self) -> SearchIndex:
+        return self.build_search_index()
+
+    # Checks whether the search index is built, so searching will not have to build it first
+    @property
+    def search_index_ready(self) -> bool:
+        return self._search_index is not None
+
+    # Builds the mod search index in memory unless it already is. Safe to call from a background
+    # job, mods added or removed meanwhile wait for the build and are then applied to the index.
+    @timed_operation("build_search_index")
+    def build_search_index(self) -> SearchIndex:
+        with self._search_lock:
+            if self._search_index is None:
+                index = SearchIndex()
+                if self.index:
+                    # Every mod and file in two queries, instead of one query per mod
+                    index.rebuild(
+                        self._search_fields(mod_id, name, description, files)
+                        for mod_id, name, description, files in self.index.search_rows()
+                    )
+                else:
+                    index.rebuild(self._mod_search_fields(mod) for mod in list(self.mods.values()))
+                self._search_index = index
+            return self._search_index
+
+    # Returns the search index fields of a mod
+    def _mod_search_fields(self, mod: Mod) -> tuple:
+        files = [(rel, None, mod.blobs.get(rel), mod.sizes.get(rel)) for rel in mod.download_files]
+        files += [(src, dst, mod.blobs.get(src), mod.sizes.get(src)) for src, dst in mod.override_files]
+        return self._search_fields(mod.id, mod.name, mod.description, files)
+
+    # Returns the (mod_id, name, description, file names, override targets, size) tuple the search
+    # index needs, from (source_rel, target_rel, content hash, size) rows of the deployed files.
+    # Sizes are recorded at import, only files of mods added before that are stat'ed.
+    def _search_fields(self, mod_id: str, name: str, description: Optional[str], files: List[tuple]) -> tuple:
+        filenames = [source_rel.split("/", 1)[-1] for source_rel, _, _, _ in files]
+        targets = [target_rel for _, target_rel, _, _ in files if target_rel]
+        total = 0
+        for source_rel, _, content_hash, size in files:
+            if size is None:
+                path = self.blob_store.path_for(content_hash) if content_hash else self.cache_dir / source_rel
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    size = 0
+            total += size
+        return mod_id, name, description, filenames, targets, total
+
+    # Returns the IDs of the mods matching a search query (prefixes of words in the ID, name,
+    # description or file names), sorted by one of the search_index.SORT_* orders
+    @timed_operation("search_mods", lambda mod_ids: {"results": len(mod_ids)})
+    def search_mods(self, query: str = "", sort: str = SORT_ADDED) -> List[str]:
+        if not query.strip() and sort == SORT_ADDED:
+            return list(self.mods)
+        locked = set(self.get_locked_mods()) if sort == SORT_LOCKED else None
+        return self.search_index.search(query, sort, locked)
+
+    # Returns the metadata (object definitions, catalog name and description) of IFF files,
+    # merged in order. Files unchanged since they were last read, by size and mtime, are not
+    # parsed again, and files are never hashed, so this is cheap enough for the UI thread.
+    def read_iff_metadata(self, paths: List[str]) -> IffMetadata:
+        merged = IffMetadata()
+        for path in paths:
+            self._merge_metadata(merged, self.iff_metadata.scan_path(path))
+        self.iff_metadata.save()
+        return merged
+
+    # Returns the metadata of a mod's cached IFF files by source_rel. The cache file is not saved.
+    def _scan_mod(self, mod: Mod) -> Dict[str, IffMetadata]:
+        file_metadata: Dict[str, IffMetadata] = {}
+        for source_rel in mod.download_files + [src_rel for src_rel, _ in mod.override_files]:
+            if not source_rel.lower().endswith(".iff"):
+                continue
+            path = self.cache_path(mod, source_rel)
+            try:
+                content_hash = mod.blobs.get(source_rel) or hash_file(path)
+                file_metadata[source_rel] = self.iff_metadata.scan(path, content_hash)
+            except OSError:
+                continue
+        return file_metadata
+
+    @staticmethod
+    def _merge_metadata(merged: IffMetadata, metadata: IffMetadata) -> None:
+        merged.objects.extend(metadata.objects)
+        if merged.catalog_name is None and metadata.catalog_name:
+            merged.catalog_name = metadata.catalog_name
+            merged.catalog_description = metadata.catalog_description
+
+    # Verifies that every cached mod file is present and still matches the content that was
+    # imported. Files are hashed in parallel, and only if they changed since their last check.
+    @timed_operation("check_integrity", lambda report: {
+        "files": report.files_checked, "files_hashed": report.files_hashed,
+        "bytes_hashed": report.bytes_hashed, "mods_with_problems": len(report.mods),
+    })
+    def check_integrity(self, job: Optional[JobContext] = None) -> IntegrityReport:
+        report = IntegrityReport()
+        memo = HashMemo(self.hash_memo_path)
+
+        # Each cached file is checked once, however many mods share it
+        expected: Dict[Path, Optional[str]] = {}  # None for files cached before the blob store
+        owners: Dict[Path, List[Tuple[str, str]]] = {}  # (mod_id, source_rel) per file
+        for mod in self.mods.values():
+            source_rels = dict.fromkeys(mod.download_files + [src_rel for src_rel, _ in mod.override_files])
+            source_rels.update(dict.fromkeys(mod.blobs))
+            for source_rel in source_rels:
+                path = self.cache_path(mod, source_rel)
+                expected[path] = mod.blobs.get(source_rel)
+                owners.setdefault(path, []).append((mod.id, source_rel))
+        report.files_checked = len(expected)
+
+        def flag(path: Path, problem: str) -> None:
+            for mod_id, source_rel in owners[path]:
+                getattr(report.mods.setdefault(mod_id, ModIntegrity()), problem).append(source_rel)
+
+        pending: List[Tuple[Path, str, os.stat_result]] = []
+        for path, content_hash in expected.items():
+            key = path.relative_to(self.cache_dir).as_posix()
+            stat, memo_hash = stat_with_memo(memo, key, path)
+            if stat is None:
+                flag(path, "missing")
+            elif content_hash is None:
+                continue  # Nothing recorded to compare against
+            elif memo_hash is None:
+                pending.append((path, key, stat))
+            elif memo_hash != content_hash:
+                flag(path, "modified")
+
+        bytes_total = sum(stat.st_size for _, _, stat in pending)
+        workers = self.settings.get_copy_workers() or min(32, (os.cpu_count() or 1) + 4)
+        try:
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(workers, len(pending)), thread_name_prefix="verify") as pool:
+                    futures = {pool.submit(hash_file_mapped, path): (path, key, stat) for path, key, stat in pending}
+                    try:
+                        for future in as_completed(futures):
+                            path, key, stat = futures[future]
+                            try:
+                                actual = future.result()
+                            except OSError:
+                                flag(path, "missing")
+                                continue
+                            memo.put(key, stat, actual)
+                            if actual != expected[path]:
+                                flag(path, "modified")
+                            report.files_hashed += 1
+                            report.bytes_hashed += stat.st_size
+                            if job:
+                                job.report(ProgressEvent(
+                                    "verify", report.files_hashed, len(pending), report.bytes_hashed, bytes_total, key,
+                                ))
+                                job.check_cancelled()
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+            memo.prune([path.relative_to(self.cache_dir).as_posix() for path in expected])
+        finally:
+            # Hashes computed before a cancellation are kept for the next check
+            memo.save()
+
+        for mod_id, problems in report.mods.items():
+            for source_rel in problems.missing:
+                logger.error(f"{mod_id}: cached file is missing: {source_rel}")
+            for source_rel in problems.modified:
+                logger.error(f"{mod_id}: cached file was modified: {source_rel}")
+        logger.info(
+            f"Integrity check complete: {report.files_checked} file(s) checked, "
+            f"{report.files_hashed} hashed, {len(report.mods)} mod(s) with problems"
+        )
+        flush_logs()
+        return report
+
+    # Returns the entries of a cached FAR archive without extracting it
+    def get_archive_entries(self, mod: Mod, source_rel: str) -> List[FarEntry]:
+        with FarArchive(self.cache_path(mod, source_rel)) as archive:
+            return archive.entries
+
+    # Returns the object GUID index, loading it on first use and rebuilding it if stale.
+    # Rebuilding only parses IFF files missing from the metadata cache.
+    @property
+    def guid_index(self) -> GuidIndex:
+        if self._guid_index is None:
+            index = GuidIndex(self.guid_index_path)
+            if not index.load() or set(index.mod_guids) != set(self.mods):
+                index.rebuild(
+                    (mod.id, self._guid_objects(mod, self._scan_mod(mod)))
+                    for mod in self.mods.values()
+                )
+                self.iff_metadata.save()
+                index.save()
+            self._guid_index = index
+        return self._guid_index
+
+    # Returns the (guid, source_rel, content_hash) of the objects a mod places in Downloads
+    def _guid_objects(self, mod: Mod, file_metadata: Dict[str, IffMetadata]) -> List[Tuple[int, str, str]]:
+        objects: List[Tuple[int, str, str]] = []
+        for source_rel in mod.download_files:
+            if source_rel not in file_metadata or not file_metadata[source_rel].objects:
+                continue
+            content_hash = mod.blobs.get(source_rel)
+            if not content_hash:
+                # Files cached before the blob store have no recorded hash
+                try:
+                    content_hash = hash_file(self.cache_path(mod, source_rel))
+                except OSError:
+                    content_hash = source_rel
+            objects.extend((obj.guid, source_rel, content_hash) for obj in file_metadata[source_rel].objects)
+        return objects
+
+    # Returns every object GUID defined by more than one distinct IFF file in Downloads
+    def get_guid_clashes(self) -> List[GuidClash]:
+        return self.guid_index.report()
+
+    # Returns every override target claimed by more than one mod, paths compared case-insensitively
+    def get_conflicts(self) -> List[Conflict]:
+        return self.conflict_index.report()
+
+    # Returns every problem that stops the mods from being installed, empty if there are none
+    @timed_operation("get_validation_problems", lambda problems: {"problems": len(problems)})
+    def get_validation_problems(self) -> List[ValidationProblem]:
+        problems: List[ValidationProblem] = []
 
-    # Validates the mod installation for conflicts
-    def validate_installation(self) -> bool:
         # Validate: No duplicate IDs
         if self.duplicate_ids_found:
-            print("[ERROR] Duplicate mod IDs found.")
-            messagebox.showerror(
+            problems.append(ValidationProblem(
+                PROBLEM_DUPLICATE_IDS,
                 "TS1 ModLoader - Duplicate Mod IDs",
-                "Duplicate mod IDs were found in the manifest.\n"
-                "Please resolve this conflict by removing the duplicate mods."
-            )
-            return False
-        
-        # Validate: No conflicting overrides
-        overridden_files = set()
-        for mod in self.mods.values():
-            for _, target_rel in mod.override_files:
-                if target_rel in overridden_files:
-                    print(f"[ERROR] Conflict detected: {target_rel} is overridden by multiple mods.")
-                    messagebox.showerror(
-                        "TS1 ModLoader - Conflict Detected",
-                        f"The file '{target_rel}' is overridden by multiple mods.\n"
-                        "Please resolve this conflict by removing one of the conflicting mods."
-                    )
-                    return False
-                overridden_files.add(target_rel)
-        return True
+                "Duplicate mod IDs were found in the manifest.",
+                hint="Please resolve this conflict by removing the duplicate mods."
+            ))
+
+        # Validate: No conflicting overrides, all of them reported at once
+        conflicts = self.get_conflicts()
+        if conflicts:
+            problems.append(ValidationProblem(
+                PROBLEM_OVERRIDE_CONFLICT,
+                "TS1 ModLoader - Conflict Detected",
+                f"{len(conflicts)} file(s) are overridden by multiple mods",
+                [f"{next(iter(conflict.owners.values()))}: {', '.join(conflict.owners)}" for conflict in conflicts],
+                "Please resolve these conflicts by removing the conflicting mods."
+            ))
+
+        # Validate: No object GUID defined twice in Downloads, the game would only load one of them
+        clashes = self.get_guid_clashes()
+        if clashes:
+            problems.append(ValidationProblem(
+                PROBLEM_GUID_CLASH,
+                "TS1 ModLoader - Object GUID Conflict",
+                f"{len(clashes)} object GUID(s) are defined by more than one different file",
+                [
+                    f"{clash}: " + ", ".join(f"{source_rel} ({mod_id})" for mod_id, source_rel in clash.owners)
+                    for clash in clashes
+                ],
+                "Please remove one of the mods defining each object. Mods the game has been started with "
+                "are locked and cannot be removed, so remove the one added since."
+            ))
+        return problems
+
+    # Validates the mod installation for conflicts. Problems are printed and the first one is
+    # passed to report_error as (title, message) when given, e.g. messagebox.showerror in the GUI.
+    @timed_operation("validate_installation")
+    def validate_installation(self, report_error: Optional[Callable[[str, str], None]] = None) -> bool:
+        problems = self.get_validation_problems()
+        self.report_problems(problems, report_error)
+        return not problems
+
+    # Logs validation problems and passes the first one to report_error as (title, message).
+    # Lets the GUI validate on a background job and report on the Tk thread.
+    def report_problems(
+        self, problems: List[ValidationProblem], report_error: Optional[Callable[[str, str], None]] = None
+    ) -> None:
+        for problem in problems:
+            logger.error(problem.summary)
+            for line in problem.details:
+                logger.error(f"  {line}")
+        if problems and report_error:
+            report_error(problems[0].title, problems[0].message(MAX_CONFLICTS_SHOWN))
 
-    # Installs a mod by its ID
-    def install_mod(self, mod_id: str) -> None:
+    # Installs a mod by its ID, skipping files that are already up to date
+    @timed_operation("install_mod", asdict)
+    def install_mod(self, mod_id: str, job: Optional[JobContext] = None) -> InstallReport:
         # Validate mod existence
         if mod_id not in self.mods:
             raise KeyError(f"Mod not found: {mod_id}")
+        return self._install([self.mods[mod_id]], job)
 
-        # Install the mod
-        mod = self.mods[mod_id]
-        downloads_dir = self.game_path / "Downloads" / mod.id
-        downloads_dir.mkdir(parents=True, exist_ok=True)
+    # Brings the game folder to the manifest's state: copies new or changed files and deletes
+    # files of mods that were removed
+    @timed_operation("install_all", asdict)
+    def install_all(self, job: Optional[JobContext] = None) -> InstallReport:
+        report = self.reconcile(job)
+        logger.info(
+            f"Install complete: {report.copied} file(s) copied ({report.bytes_copied / 1048576:.1f} MB, "
+            f"{report.linked} linked), {report.skipped} file(s) up to date, "
+            f"{report.deleted} file(s) deleted, {report.restored} original(s) restored"
+        )
+        flush_logs()
+        return report
 
-        print("Installing mod:", mod.id,"\n")
-        # Copy files into Downloads/{mod_id}, preserving relative structure
-        for rel_path in mod.download_files:
-            src = self.cache_dir / rel_path
-            dest = downloads_dir / Path(rel_path)
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            print(f"[CC FILE] copy {src} -> {dest}\n")
-            shutil.copy2(src, dest)
+    # Copies the files of the given mods that are new or changed since the last install
+    def _install(self, mods: List[Mod], job: Optional[JobContext] = None) -> InstallReport:
+        state = InstallState(self.install_state_path)
+        report = InstallReport()
+
+        copy_jobs: List[CopyJob] = []
+        for mod in mods:
+            logger.debug("Installing mod: %s", mod.id)
+            copy_jobs.extend(self._install_jobs(mod))
+
+        # Resolve targets written more than once before comparing against the install state
+        pending: List[CopyJob] = []
+        for copy_job in CopyEngine.dedupe(copy_jobs):
+            if job:
+                job.check_cancelled()
+            if state.is_up_to_date(copy_job.target_rel, copy_job.source_rel, copy_job.src, copy_job.dest):
+                report.skipped += 1
+            else:
+                pending.append(copy_job)
+        try:
+            self._deploy(pending, state, report, job)
+        finally:
+            # Keep progress from a partial run so the next install resumes where it stopped
+            state.save()
+        return report
+
+    # Returns the changes needed to bring the game folder to the manifest's state, without
+    # touching it. Only files recorded in the install state are ever considered for deletion.
+    @timed_operation("plan_reconcile", lambda plan: {
+        "adds": len(plan.adds), "updates": len(plan.updates), "deletes": len(plan.deletes),
+        "restores": len(plan.restores), "unchanged": plan.unchanged,
+    })
+    def plan_reconcile(self, job: Optional[JobContext] = None, state: Optional[InstallState] = None) -> ReconcilePlan:
+        state = state or InstallState(self.install_state_path)
+        plan = ReconcilePlan()
+
+        desired: Dict[str, CopyJob] = {}
+        for mod in self.mods.values():
+            for copy_job in self._install_jobs(mod):
+                desired[copy_job.target_rel] = copy_job
+        desired_jobs = CopyEngine.dedupe(list(desired.values()))
+
+        for copy_job in desired_jobs:
+            if job:
+                job.check_cancelled()
+            if state.is_up_to_date(copy_job.target_rel, copy_job.source_rel, copy_job.src, copy_job.dest):
+                plan.unchanged += 1
+            elif copy_job.target_rel in state.files:
+                plan.updates.append(copy_job)
+                plan.bytes_to_update += copy_job.src.stat().st_size
+            else:
+                plan.adds.append(copy_job)
+                plan.bytes_to_add += copy_job.src.stat().st_size
+
+        for target_rel, entry in state.files.items():
+            if target_rel in desired:
+                continue
+            if entry.override and self.backups.has(target_rel):
+                plan.restores.append(target_rel)
+            elif entry.override:
+                # Deleting would leave the game without the file it originally shipped
+                plan.kept.append(target_rel)
+            else:
+                plan.deletes.append(target_rel)
+                plan.bytes_to_delete += entry.size
+        return plan
+
+    # Applies the delta between the manifest and the deployed files: adds, updates and deletes
+    @timed_operation("reconcile", asdict)
+    def reconcile(self, job: Optional[JobContext] = None) -> InstallReport:
+        state = InstallState(self.install_state_path)
+        plan = self.plan_reconcile(job, state)
+        report = InstallReport(skipped=plan.unchanged)
+        for target_rel in plan.kept:
+            logger.warning(f"Kept {target_rel}, no mod overrides it anymore but the original is not backed up")
+
+        try:
+            # Removed files first, so nothing stale is left if the copy is cancelled
+            downloads_dir = self.game_path / "Downloads"
+            for target_rel in plan.deletes:
+                if job:
+                    job.check_cancelled()
+                dest = self.game_path / target_rel
+                dest.unlink(missing_ok=True)
+                prune_empty_dirs(dest.parent, downloads_dir)
+                report.deleted += 1
+                report.bytes_deleted += state.files.pop(target_rel).size
+                logger.debug("[DELETED] %s", dest)
+
+            for target_rel in plan.restores:
+                if job:
+                    job.check_cancelled()
+                self.backups.restore(self.game_path, target_rel)
+                del state.files[target_rel]
+                report.restored += 1
+                logger.debug("[RESTORED] %s", target_rel)
+
+            self._deploy(plan.adds + plan.updates, state, report, job)
+        finally:
+            state.save()
+            self.backups.save()
+        return report
+
+    # Removes every deployed mod file from the game folder and puts back the originals of the
+    # game files mods overrode. Mods stay in the manifest and are deployed again on the next Play.
+    @timed_operation("restore_vanilla", asdict)
+    def restore_vanilla(self, job: Optional[JobContext] = None) -> InstallReport:
+        state = InstallState(self.install_state_path)
+        report = InstallReport()
+        downloads_dir = self.game_path / "Downloads"
+        try:
+            for target_rel in self.backups.targets():
+                if job:
+                    job.check_cancelled()
+                self.backups.restore(self.game_path, target_rel)
+                state.files.pop(target_rel, None)
+                report.restored += 1
+                logger.debug("[RESTORED] %s", target_rel)
+
+            for target_rel, entry in list(state.files.items()):
+                if job:
+                    job.check_cancelled()
+                if entry.override:
+                    logger.warning(f"Kept {target_rel}, it was overridden before originals were backed up")
+                    continue
+                dest = self.game_path / target_rel
+                dest.unlink(missing_ok=True)
+                prune_empty_dirs(dest.parent, downloads_dir)
+                del state.files[target_rel]
+                report.deleted += 1
+                report.bytes_deleted += entry.size
+                logger.debug("[DELETED] %s", dest)
+        finally:
+            state.save()
+            self.backups.save()
+        logger.info(f"Restore complete: {report.restored} original file(s) restored, {report.deleted} mod file(s) removed")
+        flush_logs()
+        return report
+
+    # Deploys copy jobs with the configured engine, recording each one in the install state
+    @timed_operation("deploy")
+    def _deploy(self, pending: List[CopyJob], state: InstallState, report: InstallReport, job: Optional[JobContext]) -> None:
+        bytes_total = sum(copy_job.src.stat().st_size for copy_job in pending) if job else 0
+        engine = CopyEngine(
+            self.settings.get_copy_workers(),
+            self.settings.get_copy_executor(),
+            self.settings.get_deployment_mode(),
+        )
+        # Keep the original of every game file about to be overridden for the first time.
+        # Targets deployed before backups existed hold a mod's file already and are skipped.
+        captured = False
+        for copy_job in pending:
+            if not copy_job.linkable and copy_job.target_rel not in state.files:
+                captured = self.backups.capture(self.game_path, copy_job.target_rel) or captured
+        if captured:
+            self.backups.save()
 
-        # Copy override files to their target locations relative to game root
+        bytes_done = 0
+        for copy_job in engine.run(pending):
+            # Per-file detail is formatted lazily, so it costs nothing below debug level
+            logger.debug("[%s] %s %s -> %s", copy_job.kind, copy_job.method, copy_job.src, copy_job.dest)
+            state.record(
+                copy_job.target_rel, copy_job.source_rel, copy_job.src, copy_job.content_hash,
+                override=not copy_job.linkable,
+            )
+            size = state.files[copy_job.target_rel].size
+            report.copied += 1
+            if copy_job.method == DEPLOY_HARDLINK:
+                report.linked += 1
+            else:
+                report.bytes_copied += size
+
+            if job:
+                bytes_done += size
+                job.report(ProgressEvent("install", report.copied, len(pending), bytes_done, bytes_total, copy_job.target_rel))
+                # Stopping here leaves the install state consistent with what was copied
+                job.check_cancelled()
+
+    # Lists the copy jobs of a mod, in the order they must be applied
+    def _install_jobs(self, mod: Mod) -> List[CopyJob]:
+        jobs: List[CopyJob] = []
+        # Files go into Downloads/{mod_id}, preserving relative structure
+        for rel_path in mod.download_files:
+            dest_rel = (Path("Downloads") / mod.id / rel_path).as_posix()
+            jobs.append(CopyJob(
+                rel_path, dest_rel, self.cache_path(mod, rel_path), self.game_path / dest_rel, "CC FILE",
+                content_hash=mod.blobs.get(rel_path),
+            ))
+        # Override files go to their target locations relative to game root
         for src_rel, dest_rel in mod.override_files:
-            src = self.cache_dir / src_rel
-            dest = self.game_path / dest_rel
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            print(f"[OVERRIDE FILE] copy {src} -> {dest}\n")
-            shutil.copy2(src, dest)
-        print("Mod installed:", mod.id, "\n")
-
-    # Installs all mods in the manifest
-    def install_all(self) -> None:
-        for mod_id in self.mods:
-            self.install_mod(mod_id)
+            # Overrides are never hardlinked, edits to game files must not reach the cache
+            jobs.append(CopyJob(
+                src_rel, dest_rel, self.cache_path(mod, src_rel), self.game_path / dest_rel, "OVERRIDE FILE",
+                linkable=False, content_hash=mod.blobs.get(src_rel),
+            ))
+        return jobs
 
     # Adds a new mod to the manifest and copies files to cache
+    @timed_operation("add_mod")
     def add_mod(
         self,
         mod_id: str,
@@ -155,33 +996,81 @@ class ModLoader:
         image: Optional[str],
         download_files: List[Tuple[str, str]],  # List of (source_path, filename)
         override_files: List[Tuple[str, str, str]],  # List of (source_path, filename, target_rel)
-    ) -> None:
+        job: Optional[JobContext] = None,
+        image_path: Optional[str] = None,  # Preview image to copy into the cache, sets image
+    ) -> List[GuidClash]:
         # Validate mod ID doesn't already exist
         if mod_id in self.mods:
             raise ValueError(f"Mod with ID '{mod_id}' already exists")
 
-        # Create mod directory in cache
-        mod_cache_dir = self.cache_dir / mod_id
-        mod_cache_dir.mkdir(parents=True, exist_ok=True)
-
-        # Copy download files and build relative paths
-        download_rel_paths: List[str] = []
-        for src_path, filename in download_files:
-            dest = mod_cache_dir / filename
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src_path, dest)
+        # Validate override targets against other mods before copying anything
+        targets = [target_rel for _, _, target_rel in override_files]
+        conflicts = self.conflict_index.check(mod_id, targets)
+        if conflicts:
+            raise ConflictError(mod_id, conflicts)
+
+        # Reject damaged FAR archives up front, only their directory tables are read
+        for src_path, filename, *_ in list(download_files) + list(override_files):
+            if filename.lower().endswith(".far"):
+                try:
+                    with FarArchive(src_path) as archive:
+                        archive.entries
+                except FarError as e:
+                    raise ValueError(f"'{filename}' is not a valid FAR archive: {e}") from e
+        self._load_refcounts()
+
+        # Copy files into the blob store, hashing them in the same pass
+        blobs: Dict[str, str] = {}
+        sizes: Dict[str, int] = {}
+        files_total = len(download_files) + len(override_files) + (1 if image_path else 0)
+        bytes_total = 0
+        if job:
+            sources = [item[0] for item in download_files] + [item[0] for item in override_files]
+            sources += [image_path] if image_path else []
+            bytes_total = sum(os.path.getsize(src_path) for src_path in sources)
+        progress = ProgressEvent("import", 0, files_total, 0, bytes_total)
+
+        # Streams per-chunk progress and stops mid-file when cancelled
+        def on_chunk(size: int) -> None:
+            progress.bytes_done += size
+            job.report(replace(progress))
+            job.check_cancelled()
+
+        def store(src_path: str, filename: str) -> str:
             # Store relative path from cache_dir: {mod_id}/{filename}
-            download_rel_paths.append(f"{mod_id}/{filename}")
-
-        # Copy override files and build override entries
-        override_entries: List[Tuple[str, str]] = []
-        for src_path, filename, target_rel in override_files:
-            dest = mod_cache_dir / filename
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src_path, dest)
-            # Store relative path from cache_dir and target
             source_rel = f"{mod_id}/{filename}"
-            override_entries.append((source_rel, target_rel))
+            progress.current = filename
+            content_hash, size = self.blob_store.import_file(src_path, on_chunk if job else None)
+            progress.files_done += 1
+            if job:
+                job.report(replace(progress))
+            self.blob_store.add_ref(content_hash)
+            if source_rel in blobs:
+                self.blob_store.release(blobs[source_rel])
+            blobs[source_rel] = content_hash
+            sizes[source_rel] = size
+            return source_rel
+
+        try:
+            # Copy download files and build relative paths
+            download_rel_paths: List[str] = []
+            for src_path, filename in download_files:
+                download_rel_paths.append(store(src_path, filename))
+
+            # Copy override files and build override entries
+            override_entries: List[Tuple[str, str]] = []
+            for src_path, filename, target_rel in override_files:
+                override_entries.append((store(src_path, filename), target_rel))
+
+            # Copy the preview image, it is cached but never deployed
+            if image_path:
+                image = os.path.basename(image_path)
+                store(image_path, image)
+        except BaseException:
+            # Drop the references taken so far, freeing blobs nothing else uses
+            for content_hash in blobs.values():
+                self.blob_store.release(content_hash)
+            raise
 
         # Create Mod instance
         mod = Mod(
@@ -191,19 +1080,193 @@ class ModLoader:
             image=image,
             download_files=download_rel_paths,
             override_files=override_entries,
+            blobs=blobs,
+            added_at=datetime.now().isoformat(timespec="seconds"),
+            sizes=sizes,
         )
-        self.mods[mod_id] = mod
 
-        # Update manifest.json
-        self._save_manifest()
-        print(f"Added mod: {mod_id}")
+        return self._register_mod(mod)
+
+    # Adds a mod whose files are already in the blob store to the manifest and indexes, filling
+    # a blank name or description from its IFF files. Batches pass save=False and save once.
+    # Returns the object GUID clashes the mod takes part in, which will block installing.
+    def _register_mod(self, mod: Mod, default_name: Optional[str] = None, save: bool = True) -> List[GuidClash]:
+        guid_index = self.guid_index  # Loaded while it still matches the manifest
+
+        # Index the imported IFF files by content hash
+        file_metadata = self._scan_mod(mod)
+        metadata = IffMetadata()
+        for source_rel in file_metadata:
+            self._merge_metadata(metadata, file_metadata[source_rel])
+        mod.name = mod.name or metadata.name or default_name or mod.id
+        mod.description = mod.description or metadata.catalog_description
+        self.mods[mod.id] = mod
+
+        # Update manifest journal
+        self._record({"op": "add", "mod": self._mod_to_entry(mod)})
+        self.conflict_index.add_mod(mod.id, [target_rel for _, target_rel in mod.override_files])
+        guid_index.add_mod(mod.id, self._guid_objects(mod, file_metadata))
+        if save:
+            self.iff_metadata.save()
+            self.conflict_index.save()
+            guid_index.save()
+        with self._search_lock:
+            if self._search_index is not None:
+                self._search_index.add_mod(*self._mod_search_fields(mod))
+        # Bulk imports log a single summary instead
+        logger.log(logging.INFO if save else logging.DEBUG, "Added mod: %s", mod.id)
+
+        # Warn now, while the mod can still be removed, rather than when the game is launched
+        clashes = guid_index.clashes_of(mod.id)
+        for clash in clashes:
+            logger.warning(
+                f"{mod.id} defines object {clash}, also defined by a different file: "
+                + ", ".join(f"{source_rel} ({mod_id})" for mod_id, source_rel in clash.owners if mod_id != mod.id)
+            )
+        return clashes
+
+    # Imports folders, ZIP archives or single files as one mod each, classifying files by
+    # extension. A worker pool streams the files straight into the blob store, archives are
+    # never extracted. Sources that cannot be added are reported in the result, not raised.
+    @timed_operation("import_mods", lambda report: {
+        "mods": len(report.added), "failed": len(report.failed), "files": report.files, "bytes": report.bytes,
+    })
+    def import_mods(self, paths: List[str], job: Optional[JobContext] = None) -> BulkImportReport:
+        report = BulkImportReport()
+        conflict_index = self.conflict_index
+        self._load_refcounts()
+
+        # List every source first and reject those that cannot be added, before copying anything
+        sources: List[ImportSource] = []
+        claimed: Dict[str, str] = {}  # Normalized override target -> mod ID, within this batch
+        for path in paths:
+            try:
+                source = scan_source(path)
+            except (OSError, zipfile.BadZipFile) as e:
+                report.failed[str(path)] = str(e)
+                continue
+            targets = [entry.target_rel for entry in source.entries if entry.target_rel]
+            conflicts = conflict_index.check(source.mod_id, targets)
+            taken = [
+                target_rel for target_rel in targets
+                if claimed.get(normalize_target(target_rel), source.mod_id) != source.mod_id
+            ]
+            if not source.entries:
+                report.failed[str(path)] = "No supported files found"
+            elif source.mod_id in self.mods or any(other.mod_id == source.mod_id for other in sources):
+                report.failed[str(path)] = f"Mod with ID '{source.mod_id}' already exists"
+            elif conflicts:
+                report.failed[str(path)] = str(ConflictError(source.mod_id, conflicts))
+            elif taken:
+                report.failed[str(path)] = f"'{taken[0]}' is also overridden by {claimed[normalize_target(taken[0])]}"
+            else:
+                claimed.update((normalize_target(target_rel), source.mod_id) for target_rel in targets)
+                sources.append(source)
+
+        files_total = sum(len(source.entries) for source in sources)
+        progress = ProgressEvent("import", 0, files_total, 0, sum(source.size for source in sources))
+        imported: List[str] = []  # Every blob written by the workers, list.append is thread-safe
+
+        def check_cancelled(_: int) -> None:
+            job.check_cancelled()
+
+        # Streams a source into the blob store; returns its (content hash, size) by entry name
+        def import_source(source: ImportSource) -> Dict[str, Tuple[str, int]]:
+            hashes: Dict[str, Tuple[str, int]] = {}
+            for entry, stream in open_entries(source):
+                content_hash, size = self.blob_store.import_stream(stream, check_cancelled if job else None)
+                imported.append(content_hash)
+                hashes[entry.name] = (content_hash, size)
+                if entry.name.lower().endswith(".far"):
+                    try:
+                        with FarArchive(self.blob_store.path_for(content_hash)) as archive:
+                            archive.entries
+                    except FarError as e:
+                        raise ValueError(f"'{entry.name}' is not a valid FAR archive") from e
+            return hashes
+
+        workers = self.settings.get_copy_workers() or min(32, (os.cpu_count() or 1) + 4)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources))), thread_name_prefix="import") as pool:
+                futures = {pool.submit(import_source, source): source for source in sources}
+                try:
+                    for future in as_completed(futures):
+                        source = futures[future]
+                        try:
+                            hashes = future.result()
+                        except (OSError, ValueError, zipfile.BadZipFile) as e:
+                            report.failed[str(source.path)] = str(e)
+                            continue
+
+                        # Register on this thread, one mod at a time
+                        blobs = {f"{source.mod_id}/{name}": content_hash for name, (content_hash, _) in hashes.items()}
+                        for content_hash in blobs.values():
+                            self.blob_store.add_ref(content_hash)
+                        mod = Mod(
+                            id=source.mod_id,
+                            name="",
+                            description=None,
+                            image=None,
+                            download_files=[f"{source.mod_id}/{entry.name}" for entry in source.entries if not entry.target_rel],
+                            override_files=[
+                                (f"{source.mod_id}/{entry.name}", entry.target_rel)
+                                for entry in source.entries if entry.target_rel
+                            ],
+                            blobs=blobs,
+                            added_at=datetime.now().isoformat(timespec="seconds"),
+                            sizes={f"{source.mod_id}/{name}": size for name, (_, size) in hashes.items()},
+                        )
+                        clashes = self._register_mod(mod, default_name=source.name, save=False)
+                        if clashes:
+                            report.guid_clashes[mod.id] = [str(clash) for clash in clashes]
+                        report.added.append(mod.id)
+                        report.files += len(source.entries)
+                        report.bytes += source.size
+
+                        progress.files_done += len(source.entries)
+                        progress.bytes_done += source.size
+                        progress.current = source.path.name
+                        if job:
+                            job.report(replace(progress))
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            # Keep what was registered, and drop blobs left behind by failed or cancelled sources
+            for content_hash in set(imported):
+                self.blob_store.discard(content_hash)
+            self.iff_metadata.save()
+            # Nothing to save unless a mod was registered, which also loaded the GUID index
+            if report.added:
+                conflict_index.save()
+                if self._guid_index is not None:
+                    self._guid_index.save()
+        logger.info(
+            f"Imported {len(report.added)} mod(s), {report.files} file(s) ({report.bytes / 1048576:.1f} MB), "
+            f"{len(report.failed)} failed"
+        )
+        for path, error in report.failed.items():
+            logger.warning(f"Not imported: {path}: {error}")
+        flush_logs()
+        return report
 
     # Removes a mod from the manifest and deletes its cached files
+    @timed_operation("remove_mod")
     def remove_mod(self, mod_id: str) -> None:
         if mod_id not in self.mods:
             raise KeyError(f"Mod not found: {mod_id}")
 
-        # Remove mod directory from cache
+        # Load indexes while they still match the manifest
+        conflict_index = self.conflict_index
+        guid_index = self.guid_index
+        self._load_refcounts()
+
+        # Release blobs, only freeing those no other mod shares
+        mod = self.mods[mod_id]
+        freed = sum(self.blob_store.release(content_hash) for content_hash in mod.blobs.values())
+
+        # Remove legacy mod directory from cache
         mod_cache_dir = self.cache_dir / mod_id
         if mod_cache_dir.exists():
             shutil.rmtree(mod_cache_dir)
@@ -211,47 +1274,72 @@ class ModLoader:
         # Remove from mods dict
         del self.mods[mod_id]
 
-        # Update manifest.json
-        self._save_manifest()
-        print(f"Removed mod: {mod_id}")
+        # Update manifest journal
+        self._record({"op": "remove", "id": mod_id})
+        conflict_index.remove_mod(mod_id, [target_rel for _, target_rel in mod.override_files])
+        conflict_index.save()
+        guid_index.remove_mod(mod_id)
+        guid_index.save()
+        with self._search_lock:
+            if self._search_index is not None:
+                self._search_index.remove_mod(mod_id)
+        logger.info(f"Removed mod: {mod_id} ({freed} unshared file(s) freed)")
 
-    # Saves the current mods to manifest.json
+    # Writes a full snapshot of the mods to manifest.json and empties the journal
     def _save_manifest(self) -> None:
-        mods_data = []
-        for mod in self.mods.values():
-            mod_entry = {
-                "id": mod.id,
-                "name": mod.name,
-                "description": mod.description,
-                "image": mod.image,
-                "downloads": mod.download_files,
-                "overrides": [
-                    {"source": src, "target": dst}
-                    for src, dst in mod.override_files
-                ],
-            }
-            mods_data.append(mod_entry)
-
-        with self.manifest_path.open("w", encoding="utf-8") as f:
-            json.dump({"mods": mods_data, "locked_mods": self.locked_mods}, f, indent=2)
+        mods_data = [self._mod_to_entry(mod) for mod in self.mods.values()]
+        write_json_atomic(
+            self.manifest_path,
+            {"mods": mods_data, "locked_mods": self.locked_mods, "journal_seq": self.journal_seq},
+        )
+        self.journal.clear()
+        self.journal_pending = 0
 
     # Lock mods that the game has started with (prevents removal)
+    @timed_operation("lock_mods")
     def lock_mods(self, mod_ids: List[str]) -> None:
-        for mod_id in mod_ids:
-            if mod_id not in self.locked_mods:
-                self.locked_mods.append(mod_id)
-        self._save_manifest()
+        if self.index:
+            self.index.lock(mod_ids)
+            return
+        new_ids = [mod_id for mod_id in dict.fromkeys(mod_ids) if mod_id not in self.locked_mods]
+        if not new_ids:
+            return
+        self.locked_mods.extend(new_ids)
+        self._record({"op": "lock", "ids": new_ids})
 
     # Check if a mod is locked
     def is_mod_locked(self, mod_id: str) -> bool:
+        if self.index:
+            return self.index.is_locked(mod_id)
         return mod_id in self.locked_mods
 
     # Get list of locked mods
     def get_locked_mods(self) -> List[str]:
+        if self.index:
+            return self.index.locked_ids()
         return self.locked_mods.copy()
 
     # Unlock a specific mod (for conflict resolution)
     def unlock_mod(self, mod_id: str) -> None:
-        if mod_id in self.locked_mods:
+        if self.index:
+            self.index.unlock(mod_id)
+        elif mod_id in self.locked_mods:
             self.locked_mods.remove(mod_id)
-            self._save_manifest()
+            self._record({"op": "unlock", "id": mod_id})
+
+    # Returns the IDs of the mods overriding a target path (relative to game root)
+    def get_target_owners(self, target_rel: str) -> List[str]:
+        if self.index:
+            return self.index.target_owners(target_rel)
+        return [
+            mod.id for mod in self.mods.values()
+            if any(dst == target_rel for _, dst in mod.override_files)
+        ]
+
+    # Returns the mods added after the given date, oldest first
+    def get_mods_added_after(self, when: datetime) -> List[Mod]:
+        timestamp = when.isoformat(timespec="seconds")
+        if self.index:
+            return [self.mods[mod_id] for mod_id in self.index.mods_added_after(timestamp)]
+        mods = [mod for mod in self.mods.values() if mod.added_at and mod.added_at > timestamp]
+        return sorted(mods, key=lambda mod: mod.added_at)
@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from copier import CopyJob
+
+# Data class representing the changes that bring the game folder to the manifest's state
+@dataclass
+class ReconcilePlan:
+    adds: List[CopyJob] = field(default_factory=list)  # Targets not deployed yet
+    updates: List[CopyJob] = field(default_factory=list)  # Deployed targets that are stale or modified
+    deletes: List[str] = field(default_factory=list)  # Deployed targets no mod wants anymore
+    restores: List[str] = field(default_factory=list)  # Unwanted override targets whose original is backed up
+    kept: List[str] = field(default_factory=list)  # Unwanted override targets overwritten before backups existed
+    unchanged: int = 0
+    bytes_to_add: int = 0
+    bytes_to_update: int = 0
+    bytes_to_delete: int = 0
+
+    # Checks whether applying the plan would change anything
+    @property
+    def is_empty(self) -> bool:
+        return not (self.adds or self.updates or self.deletes or self.restores)
+
+    # Returns a readable summary, one line per kind of change
+    def summary(self) -> List[str]:
+        lines = [
+            f"{len(self.adds)} file(s) to add ({self.bytes_to_add / 1048576:.1f} MB)",
+            f"{len(self.updates)} file(s) to update ({self.bytes_to_update / 1048576:.1f} MB)",
+            f"{len(self.deletes)} file(s) to delete ({self.bytes_to_delete / 1048576:.1f} MB)",
+            f"{len(self.restores)} original game file(s) to restore",
+            f"{self.unchanged} file(s) up to date",
+        ]
+        if self.kept:
+            lines.append(f"{len(self.kept)} overridden game file(s) kept, their originals are not backed up")
+        return lines
+
+# Removes empty directories from path up to, but not including, stop
+def prune_empty_dirs(path: Path, stop: Path) -> None:
+    while path != stop and stop in path.parents:
+        try:
+            path.rmdir()
+        except OSError:
+            return
+        path = path.parent
@@ -0,0 +1,123 @@
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+# Sort orders understood by SearchIndex.search
+SORT_ADDED = "added"  # Manifest order
+SORT_NAME = "name"
+SORT_SIZE = "size"  # Largest first
+SORT_FILES = "files"  # Most files first
+SORT_LOCKED = "locked"  # Locked mods first, then by name
+SORT_ORDERS = (SORT_ADDED, SORT_NAME, SORT_SIZE, SORT_FILES, SORT_LOCKED)
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Splits text into lowercase word tokens, treating punctuation, separators and underscores as breaks
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+# Data class representing what the search index knows about a mod
+@dataclass
+class SearchEntry:
+    name_key: str  # Case folded name, used for sorting
+    size: int  # Total size of the cached files in bytes
+    file_count: int
+    tokens: FrozenSet[str]
+
+# In-memory token index over mods. Every query token is matched as a prefix against a sorted
+# term list, so lookups cost a binary search plus the size of the matching postings.
+class SearchIndex:
+    def __init__(self):
+        self.entries: Dict[str, SearchEntry] = {}  # Insertion order is manifest order
+        self.postings: Dict[str, Set[str]] = {}  # Token -> IDs of the mods containing it
+        self.terms: List[str] = []  # Sorted keys of postings
+
+    # Rebuilds the index from (mod_id, name, description, file names, override targets, size) tuples
+    def rebuild(self, mods: Iterable[tuple]) -> None:
+        self.entries = {}
+        self.postings = {}
+        for mod_id, name, description, filenames, targets, size in mods:
+            self._index(mod_id, name, description, filenames, targets, size)
+        self.terms = sorted(self.postings)
+
+    # Indexes a new mod. filenames holds one name per cached file, targets the override target
+    # paths, which are only searched.
+    def add_mod(
+        self, mod_id: str, name: str, description: Optional[str], filenames: List[str], targets: List[str], size: int
+    ) -> None:
+        if mod_id in self.entries:
+            self.remove_mod(mod_id)
+        for token in self._index(mod_id, name, description, filenames, targets, size):
+            insort(self.terms, token)
+
+    # Drops a mod from the index
+    def remove_mod(self, mod_id: str) -> None:
+        entry = self.entries.pop(mod_id, None)
+        if entry is None:
+            return
+        for token in entry.tokens:
+            mod_ids = self.postings[token]
+            mod_ids.discard(mod_id)
+            if not mod_ids:
+                del self.postings[token]
+                del self.terms[bisect_left(self.terms, token)]
+
+    # Adds a mod's entry and postings, returns the tokens that were new to the index
+    def _index(
+        self, mod_id: str, name: str, description: Optional[str], filenames: List[str], targets: List[str], size: int
+    ) -> List[str]:
+        tokens = set(tokenize(mod_id)) | set(tokenize(name)) | set(tokenize(description))
+        for filename in filenames + targets:
+            tokens.update(tokenize(filename))
+        self.entries[mod_id] = SearchEntry(name.casefold(), size, len(filenames), frozenset(tokens))
+
+        new_tokens = []
+        for token in tokens:
+            mod_ids = self.postings.get(token)
+            if mod_ids is None:
+                mod_ids = self.postings[token] = set()
+                new_tokens.append(token)
+            mod_ids.add(mod_id)
+        return new_tokens
+
+    # Returns the IDs of the mods containing a token starting with prefix
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        matches: Set[str] = set()
+        index = bisect_left(self.terms, prefix)
+        while index < len(self.terms) and self.terms[index].startswith(prefix):
+            matches |= self.postings[self.terms[index]]
+            index += 1
+        return matches
+
+    # Returns the IDs of the mods matching every token of the query, in the given sort order.
+    # locked holds the locked mod IDs, only needed for SORT_LOCKED.
+    def search(self, query: str = "", sort: str = SORT_ADDED, locked: Optional[Set[str]] = None) -> List[str]:
+        matches: Optional[Set[str]] = None
+        # Narrow tokens first, so the intersection shrinks as early as possible
+        for token in sorted(set(tokenize(query)), key=len, reverse=True):
+            found = self._prefix_matches(token)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        if matches is None:
+            mod_ids = list(self.entries)
+        else:
+            mod_ids = [mod_id for mod_id in self.entries if mod_id in matches]
+
+        entries = self.entries
+        if sort == SORT_NAME:
+            mod_ids.sort(key=lambda mod_id: entries[mod_id].name_key)
+        elif sort == SORT_SIZE:
+            mod_ids.sort(key=lambda mod_id: entries[mod_id].size, reverse=True)
+        elif sort == SORT_FILES:
+            mod_ids.sort(key=lambda mod_id: entries[mod_id].file_count, reverse=True)
+        elif sort == SORT_LOCKED:
+            locked = locked or set()
+            mod_ids.sort(key=lambda mod_id: (mod_id not in locked, entries[mod_id].name_key))
+        elif sort != SORT_ADDED:
+            raise ValueError(f"Unknown sort order: {sort}")
+        return mod_ids
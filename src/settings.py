@@ -1,6 +1,5 @@
 import json
 import os
-from tkinter import Tk, filedialog
 from typing import Optional
 
 class Settings:
@@ -9,6 +8,12 @@ class Settings:
         self.settings_file = settings_file
         self.game_path: Optional[str] = None
         self.last_played: Optional[str] = None
+        self.copy_workers: Optional[int] = None  # None picks a default based on CPU count
+        self.copy_executor: str = "thread"
+        self.deployment_mode: str = "copy"  # "copy", "hardlink" or "reflink"
+        self.manifest_backend: str = "json"  # "json" or "sqlite"
+        self.log_level: str = "info"  # "debug" also logs every file copied, deleted or restored
+        self.record_metrics: bool = False  # Time each ModLoader operation
         self.load()
 
     # Load settings from file
@@ -19,6 +24,12 @@ class Settings:
                     data = json.load(f)
                     self.game_path = data.get("game_path")
                     self.last_played = data.get("last_played")
+                    self.copy_workers = data.get("copy_workers")
+                    self.copy_executor = data.get("copy_executor", "thread")
+                    self.deployment_mode = data.get("deployment_mode", "copy")
+                    self.manifest_backend = data.get("manifest_backend", "json")
+                    self.log_level = data.get("log_level", "info")
+                    self.record_metrics = data.get("record_metrics", False)
             except (json.JSONDecodeError, IOError):
                 self.game_path = None
                 self.last_played = None
@@ -30,7 +41,13 @@ class Settings:
     def save(self):
         data = {
             "game_path": self.game_path,
-            "last_played": self.last_played
+            "last_played": self.last_played,
+            "copy_workers": self.copy_workers,
+            "copy_executor": self.copy_executor,
+            "deployment_mode": self.deployment_mode,
+            "manifest_backend": self.manifest_backend,
+            "log_level": self.log_level,
+            "record_metrics": self.record_metrics
         }
         with open(self.settings_file, "w") as f:
             json.dump(data, f, indent=4)
@@ -46,6 +63,9 @@ class Settings:
 
     # Select game path using a folder dialog
     def select_game_path(self) -> bool:
+        # Tk is only imported here, so settings and the ModLoader load without it
+        from tkinter import Tk, filedialog
+
         root = Tk()
         root.withdraw()
         folder = filedialog.askdirectory(title="Select The Sims 1 Game Folder")
@@ -59,4 +79,38 @@ class Settings:
 
     # Returns the game path
     def get_game_path(self) -> Optional[str]:
-        return self.game_path
\ No newline at end of file
+        return self.game_path
+
+    # Returns the number of parallel copy workers (None for the default)
+    def get_copy_workers(self) -> Optional[int]:
+        return self.copy_workers
+
+    # Returns the worker pool type used for copying ("thread" or "process")
+    def get_copy_executor(self) -> str:
+        return self.copy_executor
+
+    # Returns how mod files are deployed to the game folder
+    def get_deployment_mode(self) -> str:
+        return self.deployment_mode
+
+    # Update the deployment mode ("copy", "hardlink" or "reflink")
+    def set_deployment_mode(self, mode: str):
+        self.deployment_mode = mode
+        self.save()
+
+    # Returns where the mod collection is stored ("json" or "sqlite")
+    def get_manifest_backend(self) -> str:
+        return self.manifest_backend
+
+    # Returns the log level name ("debug", "info", "warning" or "error")
+    def get_log_level(self) -> str:
+        return self.log_level
+
+    # Returns whether ModLoader operations are timed
+    def get_record_metrics(self) -> bool:
+        return self.record_metrics
+
+    # Update whether ModLoader operations are timed
+    def set_record_metrics(self, enabled: bool):
+        self.record_metrics = enabled
+        self.save()
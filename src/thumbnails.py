@@ -0,0 +1,194 @@
+import hashlib
+import os
+import struct
+import tkinter as tk
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Set, Tuple
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Default memory budget for decoded thumbnails
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+# Bytes read to find a PNG's color type and transparency chunk, which precede the image data
+PNG_HEADER_READ = 64 * 1024
+
+# Reads the color type of a PNG and whether it has a transparency chunk, without decoding it.
+# Returns None for files that are not PNGs.
+def png_info(data: bytes) -> Optional[Tuple[int, int, int, bool]]:
+    if not data.startswith(PNG_SIGNATURE) or len(data) < 33:
+        return None
+    width, height, _, color_type = struct.unpack(">IIBB", data[16:26])
+    transparent = False
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        if chunk_type == b"tRNS":
+            transparent = True
+        elif chunk_type in (b"IDAT", b"IEND"):
+            break
+        pos += 12 + length
+    return width, height, color_type, transparent
+
+# Checks whether an image may have transparent pixels. Anything that is not a PNG (e.g. GIF)
+# is assumed to, so it is never flattened into a PPM.
+def has_alpha(data: bytes) -> bool:
+    info = png_info(data)
+    if info is None:
+        return True
+    _, _, color_type, transparent = info
+    return color_type in (4, 6) or transparent
+
+# Returns the integer downscale factor that fits an image in the given bounds, like PhotoImage.subsample
+def scale_factor(width: int, height: int, max_width: int, max_height: int) -> int:
+    return max(
+        (width + max_width - 1) // max_width,
+        (height + max_height - 1) // max_height,
+        1,
+    )
+
+# Two-tier cache of pre-scaled images: thumbnails on disk keyed by source path, size and mtime,
+# and an LRU of PhotoImages in memory bounded by a byte budget. Opaque thumbnails are stored
+# as PPM; images with transparency are stored as PNG so their alpha channel survives.
+# Images are decoded by Tk, which is not thread-safe, so the first open of an image still decodes
+# and subsamples the full-size source on the Tk thread. request() only defers that work until the
+# window has been drawn; every later open loads the small stored thumbnail instead.
+class ThumbnailCache:
+    def __init__(
+        self,
+        root: tk.Misc,
+        thumbs_dir: Optional[Path],
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+    ):
+        self.root = root
+        self.thumbs_dir = thumbs_dir
+        self.budget_bytes = budget_bytes
+        self._images: "OrderedDict[tuple, tk.PhotoImage]" = OrderedDict()
+        self._used_bytes = 0
+        self._pending: Set[str] = set()
+        if thumbs_dir:
+            thumbs_dir.mkdir(parents=True, exist_ok=True)
+
+    # Drops pending requests
+    def close(self) -> None:
+        for after_id in list(self._pending):
+            try:
+                self.root.after_cancel(after_id)
+            except tk.TclError:
+                pass
+        self._pending.clear()
+
+    # Loads a thumbnail right away, decoding with Tk's native decoder when it is not cached yet
+    def load(self, path: str, max_width: int, max_height: int) -> Optional[tk.PhotoImage]:
+        key = self._key(path, max_width, max_height)
+        if key is None:
+            return None
+        image = self._get(key)
+        if image is None:
+            image = self._to_photo(key, path, self._cached_thumb(key))
+        return image
+
+    # Loads a thumbnail once the Tk thread is idle and hands it to callback (None on failure)
+    def request(
+        self,
+        path: str,
+        max_width: int,
+        max_height: int,
+        callback: Callable[[Optional[tk.PhotoImage]], None],
+    ) -> None:
+        key = self._key(path, max_width, max_height)
+        if key is None:
+            callback(None)
+            return
+        image = self._get(key)
+        if image is not None:
+            callback(image)
+            return
+
+        after_id = None
+
+        def deliver() -> None:
+            self._pending.discard(after_id)
+            try:
+                image = self.load(path, max_width, max_height)
+            except tk.TclError:
+                image = None
+            callback(image)
+
+        after_id = self.root.after(1, deliver)
+        self._pending.add(after_id)
+
+    # Returns the cache key of a thumbnail: the source's path, size and mtime, and the bounds.
+    # A stat is all it costs, and any change to the source gives a new key.
+    @staticmethod
+    def _key(path: str, max_width: int, max_height: int) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, max_width, max_height)
+
+    # Returns where the thumbnail of a key is stored, in the format it is stored as
+    def _thumb_path(self, key: tuple, alpha: bool) -> Optional[Path]:
+        if not self.thumbs_dir:
+            return None
+        path, size, mtime_ns, max_width, max_height = key
+        digest = hashlib.sha1(f"{path}|{size}|{mtime_ns}".encode("utf-8")).hexdigest()
+        return self.thumbs_dir / f"{digest}_{max_width}x{max_height}.{'png' if alpha else 'ppm'}"
+
+    # Returns the stored thumbnail of a key, if any
+    def _cached_thumb(self, key: tuple) -> Optional[Path]:
+        for alpha in (False, True):
+            thumb_path = self._thumb_path(key, alpha)
+            if thumb_path is not None and thumb_path.exists():
+                return thumb_path
+        return None
+
+    # Creates the PhotoImage on the Tk thread, decoding the source natively when no thumbnail exists
+    def _to_photo(self, key: tuple, path: str, thumb_path: Optional[Path]) -> Optional[tk.PhotoImage]:
+        if thumb_path is not None:
+            image = tk.PhotoImage(file=str(thumb_path))
+        else:
+            try:
+                image = tk.PhotoImage(file=path)
+            except tk.TclError:
+                return None
+            *_, max_width, max_height = key
+            scale = scale_factor(image.width(), image.height(), max_width, max_height)
+            if scale > 1:
+                image = image.subsample(scale)
+            # Store the result so the next open skips decoding entirely. PPM has no alpha
+            # channel, so transparent images are written as PNG.
+            try:
+                with open(path, "rb") as f:
+                    alpha = has_alpha(f.read(PNG_HEADER_READ))
+            except OSError:
+                alpha = True
+            fallback_path = self._thumb_path(key, alpha)
+            if fallback_path:
+                tmp_path = fallback_path.with_name(f"{fallback_path.name}.{os.getpid()}.tmp")
+                try:
+                    image.write(str(tmp_path), format="png" if alpha else "ppm")
+                    os.replace(tmp_path, fallback_path)
+                except (tk.TclError, OSError):
+                    tmp_path.unlink(missing_ok=True)
+        self._put(key, image)
+        return image
+
+    def _get(self, key: tuple) -> Optional[tk.PhotoImage]:
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    # Adds an image, evicting the least recently used ones beyond the byte budget
+    def _put(self, key: tuple, image: tk.PhotoImage) -> None:
+        if key in self._images:
+            return
+        self._images[key] = image
+        self._used_bytes += image.width() * image.height() * 4
+        while self._used_bytes > self.budget_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._used_bytes -= evicted.width() * evicted.height() * 4
@@ -1,9 +1,17 @@
 import os
+import re
 import sys
 import tkinter as tk
 from tkinter import ttk
 from tkinter import filedialog, messagebox
+from far import FarArchive, FarError
+from jobs import BackgroundJob
+from log import get_logger
+from search_index import SORT_ADDED, SORT_FILES, SORT_LOCKED, SORT_NAME, SORT_SIZE
 from settings import Settings
+from thumbnails import ThumbnailCache
+
+logger = get_logger("ui")
 
 # The Sims 1 Color Palettes
 PRIMARY_COLOR = "#395577"  # Background primary
@@ -15,6 +23,53 @@ TEXT_SECONDARY_COLOR = "#FFFFFF"  # Text secondary
 FONT_FAMILY = "Montserrat"
 FALLBACK_FONT_FAMILY = "Segoe UI"
 
+# Mod list layout, rows have a fixed height so only visible ones need widgets
+MOD_ROW_HEIGHT = 52  # Row height including spacing
+MOD_ROW_SPACING = 12  # Vertical gap between rows
+
+# Mod list sort options, by label shown in the sort menu
+MOD_SORT_OPTIONS = {
+    "Date added": SORT_ADDED,
+    "Name": SORT_NAME,
+    "Size": SORT_SIZE,
+    "File count": SORT_FILES,
+    "Locked first": SORT_LOCKED,
+}
+
+# Archive entries listed under a FAR file in the mod details popup
+MAX_ARCHIVE_ENTRIES_SHOWN = 10
+
+def format_size(num_bytes):
+    """Format a byte count for display"""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def describe_archive(path):
+    """Summarize a FAR archive from its directory table, or None if it isn't one"""
+    try:
+        with FarArchive(path) as archive:
+            return f"{len(archive)} files, {format_size(archive.total_size)}"
+    except FarError:
+        return "damaged FAR archive"
+    except OSError:
+        return None
+
+class ModListRow:
+    """Widgets of a recycled mod list row and the mod they currently show"""
+    def __init__(self):
+        self.window = None
+        self.border_frame = None
+        self.entry_frame = None
+        self.delete_btn = None
+        self.lock_label = None
+        self.name_label = None
+        self.mod = None
+        self.locked = None
+
 class UI:
     def __init__(self, settings : Settings, play_callback=None, modloader=None):
         self.settings = settings
@@ -48,6 +103,14 @@ class UI:
 
         # Assets directory for images
         self.assets_dir = os.path.join(os.path.dirname(__file__), "assets", "images")
+
+        # Pre-scaled images, kept on disk under mod_cache/.thumbs and in memory
+        thumbs_dir = self.modloader.cache_dir / ".thumbs" if self.modloader else None
+        self.thumbnails = ThumbnailCache(self.root, thumbs_dir)
+
+        # Mod search index, built on a background thread once the window is up
+        self._search_index_job = None
+        self._search_index_failed = False
         
         # Create main layout
         self.create_sidebar()
@@ -55,24 +118,15 @@ class UI:
         
         # Show initial page
         self.show_page("Play")
+        self.root.after_idle(self._build_search_index)
 
     def _load_image(self, filename, max_width, max_height):
         """Load and downscale an image to fit within max bounds."""
         path = os.path.join(self.assets_dir, filename)
         try:
-            img = tk.PhotoImage(file=path)
-        except tk.TclError:
+            return self.thumbnails.load(path, max_width, max_height)
+        except (OSError, tk.TclError):
             return None
-
-        width, height = img.width(), img.height()
-        scale = max(
-            (width + max_width - 1) // max_width,
-            (height + max_height - 1) // max_height,
-            1,
-        )
-        if scale > 1:
-            img = img.subsample(scale)
-        return img
     
     def create_sidebar(self):
         """Create the left sidebar with navigation buttons"""
@@ -106,15 +160,15 @@ class UI:
         self.content_frame = tk.Frame(self.root, bg=self.primary_color)
         self.content_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         
-        # Dictionary to store different pages
+        # Dictionary to store different pages, each one is built the first time it is shown
         self.pages = {}
-        
-        # Create all pages
-        self.create_play_page()
-        self.create_mods_page()
-        self.create_settings_page()
-        self.create_faq_page()
-        self.create_about_page()
+        self.page_builders = {
+            "Play": self.create_play_page,
+            "Mods": self.create_mods_page,
+            "Settings": self.create_settings_page,
+            "Frequent Questions": self.create_faq_page,
+            "About": self.create_about_page,
+        }
     
     def create_play_page(self):
         """Create the Play page"""
@@ -172,6 +226,20 @@ class UI:
             command=self.launch_game
         )
         play_button.pack(pady=15)
+
+        # Dry run of what Launch Game would copy and delete
+        tk.Button(
+            page,
+            text="Preview Changes",
+            font=(self.font_family, 10),
+            bg=self.primary_color,
+            fg=self.text_secondary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            cursor="hand2",
+            command=self.preview_changes
+        ).pack()
         
         # Last played label
         last_played = self.settings.get_last_played()
@@ -220,7 +288,77 @@ class UI:
             command=self.open_add_mod_popup
         )
         add_mod_button.pack(side=tk.RIGHT)
+
+        # Bulk import buttons, every ZIP archive or the folder becomes one mod
+        for text, command in (("Import Folder", self.import_mod_folder), ("Import ZIPs", self.import_mod_archives)):
+            tk.Button(
+                header_frame,
+                text=text,
+                font=(self.font_family, 11, "bold"),
+                bg=self.secondary_color,
+                fg=self.text_primary_color,
+                activebackground=self.primary_color,
+                activeforeground=self.text_primary_color,
+                bd=0,
+                padx=15,
+                pady=8,
+                cursor="hand2",
+                command=command
+            ).pack(side=tk.RIGHT, padx=(0, 10))
         
+        # Search box and sort order
+        search_frame = tk.Frame(page, bg=self.primary_color)
+        search_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+
+        tk.Label(
+            search_frame,
+            text="Search:",
+            font=(self.font_family, 11),
+            bg=self.primary_color,
+            fg=self.text_secondary_color
+        ).pack(side=tk.LEFT)
+
+        self.mod_search_var = tk.StringVar()
+        search_entry = tk.Entry(
+            search_frame,
+            textvariable=self.mod_search_var,
+            font=(self.font_family, 10),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color,
+            insertbackground=self.text_secondary_color,
+            relief=tk.FLAT,
+            width=40
+        )
+        search_entry.pack(side=tk.LEFT, ipady=5, padx=(10, 0))
+        search_entry.bind("<Escape>", lambda _: self.mod_search_var.set(""))
+
+        self.mod_sort_var = tk.StringVar(value=next(iter(MOD_SORT_OPTIONS)))
+        sort_menu = tk.OptionMenu(
+            search_frame,
+            self.mod_sort_var,
+            *MOD_SORT_OPTIONS,
+            command=lambda _: self.apply_mod_filter()
+        )
+        sort_menu.configure(
+            font=(self.font_family, 11),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            highlightthickness=0,
+            cursor="hand2"
+        )
+        sort_menu.pack(side=tk.RIGHT)
+
+        tk.Label(
+            search_frame,
+            text="Sort by:",
+            font=(self.font_family, 11),
+            bg=self.primary_color,
+            fg=self.text_secondary_color
+        ).pack(side=tk.RIGHT, padx=(0, 10))
+
         # Mod count label
         self.mod_count_label = tk.Label(
             page,
@@ -238,39 +376,45 @@ class UI:
         mod_canvas = tk.Canvas(
             list_container,
             bg=self.primary_color,
-            highlightthickness=0
+            highlightthickness=0,
+            yscrollincrement=MOD_ROW_HEIGHT // 2
         )
         mod_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         scrollbar = tk.Scrollbar(
             list_container,
             orient=tk.VERTICAL,
-            command=mod_canvas.yview
+            command=self._scroll_mod_list
         )
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         mod_canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Frame inside canvas to hold mod entries
-        self.mod_list_frame = tk.Frame(mod_canvas, bg=self.primary_color)
-        mod_window = mod_canvas.create_window((0, 0), window=self.mod_list_frame, anchor="nw")
-        
-        def _resize_mod_list(event):
-            mod_canvas.configure(scrollregion=mod_canvas.bbox("all"))
-        
-        def _match_mod_canvas_width(event):
-            mod_canvas.itemconfigure(mod_window, width=event.width)
+        # Only the rows in view get widgets, which are recycled while scrolling
+        self.mod_canvas = mod_canvas
+        self.mod_list_mods = []  # Mods matching the search, in display order
+        self.mods_by_id = {}  # Every mod, so searches only need to return IDs
+        self.mod_row_pool = []
+        self.mod_rows_by_id = {}  # Rows currently showing a mod, by mod ID
+        self._mod_list_render_pending = False
+
+        self.mod_list_empty_label = tk.Label(
+            mod_canvas,
+            text="No mods installed yet. Click '+ Add New Mod' to get started.",
+            font=(self.font_family, 11),
+            bg=self.primary_color,
+            fg=self.text_secondary_color
+        )
+        self.mod_list_empty_window = mod_canvas.create_window(
+            (0, 30), window=self.mod_list_empty_label, anchor="n", state="hidden"
+        )
         
         def _on_mod_mousewheel(event):
             # Only scroll if content is larger than visible area
-            if self.mod_list_frame.winfo_height() > mod_canvas.winfo_height():
-                mod_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        
-        self.mod_list_frame.bind("<Configure>", _resize_mod_list)
-        mod_canvas.bind("<Configure>", _match_mod_canvas_width)
+            if len(self.mod_list_mods) * MOD_ROW_HEIGHT > mod_canvas.winfo_height():
+                self._scroll_mod_list("scroll", int(-1 * (event.delta / 120)), "units")
         
-        # Store canvas reference for mousewheel binding
-        self.mod_canvas = mod_canvas
+        mod_canvas.bind("<Configure>", lambda _: self._schedule_mod_list_render())
         
         list_container.bind(
             "<Enter>",
@@ -285,124 +429,264 @@ class UI:
         
         # Initial population of mod list
         self.refresh_mod_list()
+        self.mod_search_var.trace_add("write", lambda *_: self.apply_mod_filter())
 
     def refresh_mod_list(self):
         """Refresh the mod list display"""
-        # Clear existing entries
-        for widget in self.mod_list_frame.winfo_children():
-            widget.destroy()
-        
-        # Reset scroll position to top
-        self.mod_canvas.yview_moveto(0)
-        
-        # Update count label
         if self.modloader:
-            mod_count = len(self.modloader.mods)
-            self.mod_count_label.config(text=f"{mod_count} mod(s) installed")
-            
-            if mod_count == 0:
-                # Show empty message
-                tk.Label(
-                    self.mod_list_frame,
-                    text="No mods installed yet. Click '+ Add New Mod' to get started.",
-                    font=(self.font_family, 11),
-                    bg=self.primary_color,
-                    fg=self.text_secondary_color
-                ).pack(pady=30)
-            else:
-                # Create mod entries
-                for mod in self.modloader.mods.values():
-                    self._create_mod_entry(mod)
+            self.mods_by_id = {mod.id: mod for mod in self.modloader.mods.values()}
+            self.apply_mod_filter()
         else:
+            self.mod_canvas.yview_moveto(0)
+            self.mods_by_id = {}
+            self.mod_list_mods = []
             self.mod_count_label.config(text="ModLoader not initialized")
+            self._schedule_mod_list_render()
+
+    def _mod_filter_active(self):
+        """Whether the list is searched or sorted, rather than showing every mod in added order"""
+        return bool(self.mod_search_var.get().strip()) or self.mod_sort_var.get() != next(iter(MOD_SORT_OPTIONS))
+
+    def apply_mod_filter(self, keep_scroll=False):
+        """Show the mods matching the search box, in the selected sort order"""
+        if not self.modloader:
+            return
+        if self._mod_filter_active() and not self.modloader.search_index_ready and not self._search_index_failed:
+            # Searched again once the index is built, the list stays as it is meanwhile
+            self._build_search_index()
+            self.mod_count_label.config(text="Indexing mods...")
+            return
+        if not keep_scroll:
+            self.mod_canvas.yview_moveto(0)
+        mod_ids = self.modloader.search_mods(
+            self.mod_search_var.get(),
+            MOD_SORT_OPTIONS.get(self.mod_sort_var.get(), SORT_ADDED)
+        )
+        self.mod_list_mods = [self.mods_by_id[mod_id] for mod_id in mod_ids if mod_id in self.mods_by_id]
+        self._update_mod_count()
+        self._schedule_mod_list_render()
+
+    def _build_search_index(self):
+        """Build the mod search index on a background thread, so searching never has to"""
+        if not self.modloader or self.modloader.search_index_ready or self._search_index_job:
+            return
+        self._search_index_job = BackgroundJob(lambda job: self.modloader.build_search_index()).start()
+        self._poll_search_index()
+
+    def _poll_search_index(self):
+        """Wait for the search index, then apply the search typed meanwhile"""
+        job = self._search_index_job
+        if not job.is_done():
+            self.root.after(50, self._poll_search_index)
+            return
+        self._search_index_job = None
+        # Searches build the index themselves from now on, instead of waiting for it
+        self._search_index_failed = job.error is not None
+        if "Mods" in self.pages and self._mod_filter_active():
+            self.apply_mod_filter()
+
+    def add_mod_row(self, mod_id):
+        """Append a newly added mod to the list, keeping the scroll position"""
+        self.mods_by_id[mod_id] = self.modloader.mods[mod_id]
+        if self._mod_filter_active():
+            self.apply_mod_filter(keep_scroll=True)
+            return
+        self.mod_list_mods.append(self.mods_by_id[mod_id])
+        self._update_mod_count()
+        self._schedule_mod_list_render()
+
+    def remove_mod_row(self, mod_id):
+        """Drop a removed mod from the list, keeping the scroll position"""
+        self.mods_by_id.pop(mod_id, None)
+        for index, mod in enumerate(self.mod_list_mods):
+            if mod.id == mod_id:
+                del self.mod_list_mods[index]
+                break
+        self._update_mod_count()
+        self._schedule_mod_list_render()
+
+    def update_mod_rows(self, mod_ids=None):
+        """Re-read lock state and names of the given mods, or of every mod on screen"""
+        if "Mods" not in self.pages:
+            return  # Not built yet, it reads the current state when first shown
+        if MOD_SORT_OPTIONS.get(self.mod_sort_var.get()) == SORT_LOCKED:
+            # Lock state decides the order, so the rows may move
+            self.apply_mod_filter(keep_scroll=True)
+        if mod_ids is None:
+            mod_ids = list(self.mod_rows_by_id)
+        for mod_id in mod_ids:
+            row = self.mod_rows_by_id.get(mod_id)
+            if row is not None:
+                row.locked = None  # Force the row to be bound again
+        self._schedule_mod_list_render()
+
+    def _update_mod_count(self):
+        """Update the mod count label"""
+        shown, total = len(self.mod_list_mods), len(self.mods_by_id)
+        if shown == total:
+            self.mod_count_label.config(text=f"{total} mod(s) installed")
+        else:
+            self.mod_count_label.config(text=f"{shown} of {total} mod(s) shown")
+
+    def _scroll_mod_list(self, *args):
+        """Scroll the mod list and bring the newly visible rows into view"""
+        self.mod_canvas.yview(*args)
+        self._schedule_mod_list_render()
+
+    def _schedule_mod_list_render(self):
+        """Coalesce scroll, resize and refresh events into a single render"""
+        if not self._mod_list_render_pending:
+            self._mod_list_render_pending = True
+            self.root.after_idle(self._render_mod_list)
+
+    def _render_mod_list(self):
+        """Assign pooled row widgets to the mods currently in the viewport"""
+        self._mod_list_render_pending = False
+        canvas = self.mod_canvas
+        width = max(canvas.winfo_width(), 1)
+        height = max(canvas.winfo_height(), 1)
+        total = len(self.mod_list_mods)
+
+        canvas.configure(scrollregion=(0, 0, width, max(total * MOD_ROW_HEIGHT, height)))
+
+        # Show empty message
+        show_empty = self.modloader is not None and total == 0
+        if show_empty:
+            empty_text = "No mods match your search." if self.mods_by_id else \
+                "No mods installed yet. Click '+ Add New Mod' to get started."
+            if self.mod_list_empty_label.cget("text") != empty_text:
+                self.mod_list_empty_label.config(text=empty_text)
+        canvas.coords(self.mod_list_empty_window, width // 2, 30)
+        canvas.itemconfigure(self.mod_list_empty_window, state="normal" if show_empty else "hidden")
+
+        top = int(canvas.canvasy(0))
+        first = min(total, max(0, top // MOD_ROW_HEIGHT))
+        last = min(total, (top + height) // MOD_ROW_HEIGHT + 1)
+
+        while len(self.mod_row_pool) < last - first:
+            self.mod_row_pool.append(self._create_mod_row())
+
+        for offset, row in enumerate(self.mod_row_pool):
+            index = first + offset
+            if index < last:
+                self._bind_mod_row(row, self.mod_list_mods[index])
+                canvas.coords(row.window, 15, index * MOD_ROW_HEIGHT + MOD_ROW_SPACING // 2)
+                canvas.itemconfigure(row.window, width=max(width - 30, 1), state="normal")
+            else:
+                # Park unused rows above the scroll region as well, in case hiding is not honored
+                canvas.coords(row.window, 15, -MOD_ROW_HEIGHT)
+                canvas.itemconfigure(row.window, state="hidden")
+                if row.mod is not None and self.mod_rows_by_id.get(row.mod.id) is row:
+                    del self.mod_rows_by_id[row.mod.id]
+                row.mod = None
+                row.locked = None
+
+    def _create_mod_row(self):
+        """Create a reusable mod list row"""
+        row = ModListRow()
 
-    def _create_mod_entry(self, mod):
-        """Create a single mod entry in the list"""
         # Outer frame for white border effect
-        border_frame = tk.Frame(
-            self.mod_list_frame,
+        row.border_frame = tk.Frame(
+            self.mod_canvas,
             bg=self.text_secondary_color,  # White border
             padx=1,
             pady=1
         )
-        border_frame.pack(fill=tk.X, pady=6, padx=15)
+        row.window = self.mod_canvas.create_window(
+            (0, 0),
+            window=row.border_frame,
+            anchor="nw",
+            height=MOD_ROW_HEIGHT - MOD_ROW_SPACING,
+            state="hidden"
+        )
         
         # Inner frame with actual content
-        entry_frame = tk.Frame(
-            border_frame,
+        row.entry_frame = tk.Frame(
+            row.border_frame,
             bg=self.secondary_color,
             pady=8,
             padx=10
         )
-        entry_frame.pack(fill=tk.BOTH, expand=True)
+        row.entry_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Only show delete button if mod is not locked (hasn't been started with yet)
-        is_locked = self.modloader.is_mod_locked(mod.id) if self.modloader else False
-        if not is_locked:
-            # Delete button (pack first so it doesn't shrink)
-            delete_btn = tk.Button(
-                entry_frame,
-                text="✕",
-                font=(self.font_family, 10, "bold"),
-                bg=self.primary_color,
-                fg="#FF6B6B",
-                activebackground=self.secondary_color,
-                activeforeground="#FF4444",
-                bd=0,
-                width=3,
-                pady=2,
-                cursor="hand2",
-                command=lambda m=mod: self.confirm_delete_mod(m)
-            )
-            delete_btn.pack(side=tk.RIGHT, padx=(5, 0))
-        else:
-            # Show lock indicator for mods that have been started with
-            lock_label = tk.Label(
-                entry_frame,
-                text="🔒",
-                font=(self.font_family, 10),
-                bg=self.secondary_color,
-                fg=self.text_secondary_color,
-                width=3
-            )
-            lock_label.pack(side=tk.RIGHT, padx=(5, 0))
+        # Delete button, only shown if mod is not locked (hasn't been started with yet)
+        row.delete_btn = tk.Button(
+            row.entry_frame,
+            text="✕",
+            font=(self.font_family, 10, "bold"),
+            bg=self.primary_color,
+            fg="#FF6B6B",
+            activebackground=self.secondary_color,
+            activeforeground="#FF4444",
+            bd=0,
+            width=3,
+            pady=2,
+            cursor="hand2",
+            command=lambda: self.confirm_delete_mod(row.mod)
+        )
         
-        # Truncate mod name if too long (max ~60 chars to fit 3/4 width)
-        max_chars = 60
-        display_name = mod.name if len(mod.name) <= max_chars else mod.name[:max_chars-3] + "..."
+        # Lock indicator for mods that have been started with
+        row.lock_label = tk.Label(
+            row.entry_frame,
+            text="🔒",
+            font=(self.font_family, 10),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color,
+            width=3
+        )
         
         # Mod name (clickable)
-        name_label = tk.Label(
-            entry_frame,
-            text=display_name,
+        row.name_label = tk.Label(
+            row.entry_frame,
+            text="",
             font=(self.font_family, 11),
             bg=self.secondary_color,
             fg=self.text_secondary_color,
             cursor="hand2",
             anchor=tk.W
         )
-        name_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        row.name_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        # Bind click to show details
-        name_label.bind("<Button-1>", lambda e, m=mod: self.show_mod_details(m))
-        entry_frame.bind("<Button-1>", lambda e, m=mod: self.show_mod_details(m))
-        border_frame.bind("<Button-1>", lambda e, m=mod: self.show_mod_details(m))
+        # Bind click to show details of whichever mod the row currently shows
+        for widget in (row.name_label, row.entry_frame, row.border_frame):
+            widget.bind("<Button-1>", lambda e: self.show_mod_details(row.mod))
         
         # Hover effect for the entry
         def on_enter(e):
-            entry_frame.config(bg=self.primary_color)
-            name_label.config(bg=self.primary_color)
+            row.entry_frame.config(bg=self.primary_color)
+            row.name_label.config(bg=self.primary_color)
         
         def on_leave(e):
-            entry_frame.config(bg=self.secondary_color)
-            name_label.config(bg=self.secondary_color)
+            row.entry_frame.config(bg=self.secondary_color)
+            row.name_label.config(bg=self.secondary_color)
         
-        entry_frame.bind("<Enter>", on_enter)
-        entry_frame.bind("<Leave>", on_leave)
-        name_label.bind("<Enter>", on_enter)
-        name_label.bind("<Leave>", on_leave)
-        border_frame.bind("<Enter>", on_enter)
-        border_frame.bind("<Leave>", on_leave)
+        for widget in (row.entry_frame, row.name_label, row.border_frame):
+            widget.bind("<Enter>", on_enter)
+            widget.bind("<Leave>", on_leave)
+        return row
+
+    def _bind_mod_row(self, row, mod):
+        """Show a mod in a pooled row, only touching widgets whose content changed"""
+        is_locked = self.modloader.is_mod_locked(mod.id) if self.modloader else False
+        if row.mod is mod and row.locked == is_locked:
+            return
+
+        if row.locked != is_locked or row.mod is None:
+            # Pack before the name label so the button doesn't shrink
+            shown, hidden = (row.lock_label, row.delete_btn) if is_locked else (row.delete_btn, row.lock_label)
+            hidden.pack_forget()
+            shown.pack(side=tk.RIGHT, padx=(5, 0), before=row.name_label)
+
+        # Truncate mod name if too long (max ~60 chars to fit 3/4 width)
+        max_chars = 60
+        display_name = mod.name if len(mod.name) <= max_chars else mod.name[:max_chars-3] + "..."
+        row.name_label.config(text=display_name)
+
+        if row.mod is not None and self.mod_rows_by_id.get(row.mod.id) is row:
+            del self.mod_rows_by_id[row.mod.id]
+        self.mod_rows_by_id[mod.id] = row
+        row.mod = mod
+        row.locked = is_locked
 
     def show_mod_details(self, mod):
         """Show mod details in a popup window"""
@@ -476,44 +760,48 @@ class UI:
             fg=self.text_secondary_color
         ).pack(anchor=tk.W, pady=(0, 15))
         
-        # Image section
-        image_displayed = False
+        # Image section, the placeholder is swapped for the thumbnail once it is ready
+        image_frame = tk.Frame(content_frame, bg=self.primary_color)
+        image_frame.pack(anchor=tk.W, pady=(0, 15))
+
+        placeholder_frame = tk.Frame(
+            image_frame,
+            bg=self.secondary_color,
+            width=200,
+            height=150
+        )
+        placeholder_frame.pack(anchor=tk.W)
+        placeholder_frame.pack_propagate(False)
+        
+        placeholder_label = tk.Label(
+            placeholder_frame,
+            text="Loading..." if mod.image else "No Image",
+            font=(self.font_family, 11),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color
+        )
+        placeholder_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+
+        def show_image(img):
+            # The popup may have been closed while the image was loading
+            if not image_frame.winfo_exists():
+                return
+            if img is None:
+                placeholder_label.config(text="No Image")
+                return
+            placeholder_frame.destroy()
+            img_label = tk.Label(image_frame, image=img, bg=self.primary_color)
+            img_label.image = img  # Keep reference
+            img_label.pack(anchor=tk.W)
+
         if mod.image:
-            try:
-                img_path = os.path.join(str(self.modloader.cache_dir), mod.id, mod.image)
-                if os.path.exists(img_path):
-                    img = tk.PhotoImage(file=img_path)
-                    # Scale if needed
-                    width, height = img.width(), img.height()
-                    max_size = 200
-                    scale = max((width + max_size - 1) // max_size, (height + max_size - 1) // max_size, 1)
-                    if scale > 1:
-                        img = img.subsample(scale)
-                    img_label = tk.Label(content_frame, image=img, bg=self.primary_color)
-                    img_label.image = img  # Keep reference
-                    img_label.pack(anchor=tk.W, pady=(0, 15))
-                    image_displayed = True
-            except Exception:
-                pass
-        
-        # Show placeholder if no image
-        if not image_displayed:
-            placeholder_frame = tk.Frame(
-                content_frame,
-                bg=self.secondary_color,
-                width=200,
-                height=150
+            source_rel = f"{mod.id}/{mod.image}"
+            self.thumbnails.request(
+                str(self.modloader.cache_path(mod, source_rel)),
+                200,
+                200,
+                show_image
             )
-            placeholder_frame.pack(anchor=tk.W, pady=(0, 15))
-            placeholder_frame.pack_propagate(False)
-            
-            tk.Label(
-                placeholder_frame,
-                text="No Image",
-                font=(self.font_family, 11),
-                bg=self.secondary_color,
-                fg=self.text_secondary_color
-            ).place(relx=0.5, rely=0.5, anchor=tk.CENTER)
         
         # Description
         tk.Label(
@@ -558,6 +846,8 @@ class UI:
                     bg=self.primary_color,
                     fg=self.text_secondary_color
                 ).pack(anchor=tk.W)
+                if display_name.lower().endswith(".far"):
+                    self._show_archive_entries(content_frame, mod, dl_file)
         else:
             tk.Label(
                 content_frame,
@@ -626,6 +916,30 @@ class UI:
             command=close_popup
         ).pack()
 
+    def _show_archive_entries(self, parent, mod, source_rel):
+        """List the contents of a cached FAR archive under its file name"""
+        try:
+            entries = self.modloader.get_archive_entries(mod, source_rel)
+        except (FarError, OSError):
+            lines = ["      (archive could not be read)"]
+        else:
+            total = sum(entry.size for entry in entries)
+            lines = [f"      {len(entries)} files, {format_size(total)}"]
+            lines += [
+                f"      – {entry.name} ({format_size(entry.size)})"
+                for entry in entries[:MAX_ARCHIVE_ENTRIES_SHOWN]
+            ]
+            if len(entries) > MAX_ARCHIVE_ENTRIES_SHOWN:
+                lines.append(f"      … and {len(entries) - MAX_ARCHIVE_ENTRIES_SHOWN} more")
+        tk.Label(
+            parent,
+            text="\n".join(lines),
+            font=(self.font_family, 8),
+            bg=self.primary_color,
+            fg=self.text_secondary_color,
+            justify=tk.LEFT
+        ).pack(anchor=tk.W)
+
     def confirm_delete_mod(self, mod):
         """Show confirmation dialog before deleting a mod"""
         result = messagebox.askyesno(
@@ -638,12 +952,61 @@ class UI:
         )
         
         if result:
-            try:
-                self.modloader.remove_mod(mod.id)
-                self.refresh_mod_list()
+            def on_removed(_):
+                self.remove_mod_row(mod.id)
                 messagebox.showinfo("Success", f"Mod '{mod.name}' has been deleted.", parent=self.root)
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete mod: {str(e)}", parent=self.root)
+
+            # Removing may first have to rebuild the conflict and GUID indexes, so it runs in the background
+            self.run_job("Deleting mod", lambda job: self.modloader.remove_mod(mod.id), on_removed)
+
+    def import_mod_archives(self):
+        """Import ZIP archives picked by the user, one mod each"""
+        if not self.modloader:
+            messagebox.showerror("Error", "ModLoader not initialized. Please set a valid game path first.")
+            return
+        paths = filedialog.askopenfilenames(
+            title="Select Mod Archives",
+            filetypes=[("ZIP Archives", "*.zip"), ("All Files", "*.*")]
+        )
+        if paths:
+            self._run_bulk_import(list(paths))
+
+    def import_mod_folder(self):
+        """Import a folder picked by the user as one mod"""
+        if not self.modloader:
+            messagebox.showerror("Error", "ModLoader not initialized. Please set a valid game path first.")
+            return
+        path = filedialog.askdirectory(title="Select Mod Folder")
+        if path:
+            self._run_bulk_import([path])
+
+    def _run_bulk_import(self, paths):
+        """Import sources in the background, then list what was added and what failed"""
+        def on_imported(report):
+            message = f"{len(report.added)} mod(s) added ({report.files} file(s), {format_size(report.bytes)})."
+            if report.failed:
+                failures = [f"• {os.path.basename(path)}: {error}" for path, error in report.failed.items()]
+                if len(failures) > 15:
+                    failures = failures[:15] + [f"...and {len(failures) - 15} more"]
+                message += f"\n\n{len(report.failed)} could not be imported:\n" + "\n".join(failures)
+            if report.guid_clashes:
+                clashes = [f"• {mod_id}: {', '.join(guids)}" for mod_id, guids in report.guid_clashes.items()]
+                if len(clashes) > 15:
+                    clashes = clashes[:15] + [f"...and {len(clashes) - 15} more"]
+                message += f"\n\n{len(report.guid_clashes)} mod(s) define objects that other mods define differently, " \
+                    "delete them before launching the game:\n" + "\n".join(clashes)
+            if report.failed or report.guid_clashes:
+                messagebox.showwarning("Import Finished", message)
+            else:
+                messagebox.showinfo("Import Finished", message)
+
+        # Mods registered before a cancellation stay, so the list is refreshed either way
+        self.run_job(
+            "Importing mods",
+            lambda job: self.modloader.import_mods(paths, job=job),
+            on_imported,
+            on_finish=self.refresh_mod_list
+        )
 
     def open_add_mod_popup(self):
         """Open popup window to add a new mod"""
@@ -764,6 +1127,52 @@ class UI:
             height=3
         )
         mod_desc_entry.pack(anchor=tk.W, pady=(0, 10))
+
+        # Preview image
+        tk.Label(
+            content_frame,
+            text="Preview Image:",
+            font=(self.font_family, 11, "bold"),
+            bg=self.primary_color,
+            fg=self.text_primary_color
+        ).pack(anchor=tk.W, pady=(0, 5))
+
+        image_frame = tk.Frame(content_frame, bg=self.primary_color)
+        image_frame.pack(anchor=tk.W, pady=(0, 10))
+        image_path_var = tk.StringVar(value="")
+        image_name_var = tk.StringVar(value="No image selected")
+
+        def select_image():
+            path = filedialog.askopenfilename(
+                title="Select Preview Image",
+                filetypes=[("Images", "*.png *.gif"), ("All Files", "*.*")]
+            )
+            if path:
+                image_path_var.set(path)
+                image_name_var.set(os.path.basename(path))
+
+        tk.Button(
+            image_frame,
+            text="Browse",
+            font=(self.font_family, 9),
+            bg=self.secondary_color,
+            fg=self.text_primary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            padx=10,
+            pady=5,
+            cursor="hand2",
+            command=select_image
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
+        tk.Label(
+            image_frame,
+            textvariable=image_name_var,
+            font=(self.font_family, 9),
+            bg=self.primary_color,
+            fg=self.text_secondary_color
+        ).pack(side=tk.LEFT)
         
         # --- Download Files Section ---
         tk.Label(
@@ -808,7 +1217,25 @@ class UI:
                 filename = os.path.basename(f)
                 if (f, filename) not in download_files_list:
                     download_files_list.append((f, filename))
-                    download_listbox.insert(tk.END, filename)
+                    # Archives are listed with their contents, read from the directory table only
+                    summary = describe_archive(f) if filename.lower().endswith(".far") else None
+                    download_listbox.insert(tk.END, f"{filename} ({summary})" if summary else filename)
+            prefill_metadata([f for f in files if f.lower().endswith(".iff")])
+
+        def prefill_metadata(paths):
+            """Fill the fields left blank from the catalog strings of the selected IFF files"""
+            if not paths:
+                return
+            try:
+                metadata = self.modloader.read_iff_metadata(paths)
+            except OSError:
+                return
+            if metadata.name and not mod_name_entry.get().strip():
+                mod_name_entry.insert(0, metadata.name)
+            if metadata.name and not mod_id_entry.get().strip():
+                mod_id_entry.insert(0, re.sub(r"[^a-z0-9]+", "_", metadata.name.lower()).strip("_"))
+            if metadata.catalog_description and not mod_desc_entry.get("1.0", tk.END).strip():
+                mod_desc_entry.insert("1.0", metadata.catalog_description)
         
         def remove_download_file():
             selection = download_listbox.curselection()
@@ -940,6 +1367,8 @@ class UI:
                     override_files_list.append((src_file, filename, target_rel))
                     override_listbox.insert(tk.END, f"{filename} → {target_rel}")
                     target_dialog.destroy()
+                    if filename.lower().endswith(".iff"):
+                        prefill_metadata([src_file])
             
             tk.Button(
                 target_dialog,
@@ -1019,21 +1448,43 @@ class UI:
                 messagebox.showerror("Error", f"A mod with ID '{mod_id}' already exists.", parent=popup)
                 return
             
-            try:
-                self.modloader.add_mod(
+            def on_added(clashes):
+                if clashes:
+                    # Reported now, while the new mod can still be removed, so it never blocks Launch Game
+                    lines = [
+                        f"• {clash}: " + ", ".join(owner for owner, _ in clash.owners if owner != mod_id)
+                        for clash in clashes[:15]
+                    ]
+                    messagebox.showwarning(
+                        "Object GUID Conflict",
+                        f"Mod '{mod_name}' was added, but {len(clashes)} of its object GUID(s) are also "
+                        "defined by different files of other mods:\n\n" + "\n".join(lines) + "\n\n"
+                        "The game would only load one of them, so the mods cannot be installed together. "
+                        "Delete this mod, or the other one while it is not locked, before launching the game.",
+                        parent=popup
+                    )
+                else:
+                    messagebox.showinfo("Success", f"Mod '{mod_name}' added successfully!", parent=popup)
+                canvas.unbind_all("<MouseWheel>")
+                popup.destroy()
+                self.add_mod_row(mod_id)
+
+            # Copy files in the background so the window stays responsive
+            self.run_job(
+                "Adding mod",
+                lambda job: self.modloader.add_mod(
                     mod_id=mod_id,
                     name=mod_name,
                     description=mod_desc,
                     image=None,
                     download_files=download_files_list,
-                    override_files=override_files_list
-                )
-                messagebox.showinfo("Success", f"Mod '{mod_name}' added successfully!", parent=popup)
-                canvas.unbind_all("<MouseWheel>")
-                popup.destroy()
-                self.refresh_mod_list()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to add mod: {str(e)}", parent=popup)
+                    override_files=override_files_list,
+                    job=job,
+                    image_path=image_path_var.get() or None
+                ),
+                on_added,
+                parent=popup
+            )
         
         # Add buttons to the pre-created button_frame
         tk.Button(
@@ -1124,7 +1575,106 @@ class UI:
             command=self.select_game_path
         )
         browse_button.pack(pady=(0, 20), padx=20, anchor=tk.W)
-        
+
+        # Deployment mode section
+        tk.Label(
+            page,
+            text="Deployment Mode:",
+            font=(self.font_family, 12, "bold"),
+            bg=self.primary_color,
+            fg=self.text_primary_color
+        ).pack(pady=(10, 10), padx=20, anchor=tk.W)
+
+        self.deployment_mode_var = tk.StringVar(value=self.settings.get_deployment_mode())
+        mode_menu = tk.OptionMenu(
+            page,
+            self.deployment_mode_var,
+            "copy", "hardlink", "reflink",
+            command=self.settings.set_deployment_mode
+        )
+        mode_menu.configure(
+            font=(self.font_family, 11),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            highlightthickness=0,
+            cursor="hand2"
+        )
+        mode_menu.pack(padx=20, anchor=tk.W)
+
+        tk.Label(
+            page,
+            text="Hardlink and reflink avoid duplicating files when the game and the mod cache are on the same drive. " \
+                 "Override files are never hardlinked, and unsupported drives fall back to copying.",
+            font=(self.font_family, 10),
+            bg=self.primary_color,
+            fg=self.text_secondary_color,
+            wraplength=600,
+            justify=tk.LEFT
+        ).pack(pady=(5, 20), padx=20, anchor=tk.W)
+
+        # Maintenance section
+        maintenance_frame = tk.Frame(page, bg=self.primary_color)
+        maintenance_frame.pack(pady=(0, 10), padx=20, anchor=tk.W)
+
+        tk.Button(
+            maintenance_frame,
+            text="Verify Mod Cache",
+            font=(self.font_family, 11, "bold"),
+            bg=self.secondary_color,
+            fg=self.text_primary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            command=self.verify_mod_cache
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
+        tk.Button(
+            maintenance_frame,
+            text="Operation Timings",
+            font=(self.font_family, 11, "bold"),
+            bg=self.secondary_color,
+            fg=self.text_primary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            command=self.open_timings_panel
+        ).pack(side=tk.LEFT)
+
+        tk.Button(
+            page,
+            text="Restore Vanilla Game Files",
+            font=(self.font_family, 11, "bold"),
+            bg=self.secondary_color,
+            fg=self.text_primary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color,
+            bd=0,
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            command=self.restore_vanilla
+        ).pack(pady=(0, 5), padx=20, anchor=tk.W)
+
+        tk.Label(
+            page,
+            text="Removes every mod file from the game folder and puts back the game files mods replaced. " \
+                 "Your mods stay in the list and are applied again the next time you play.",
+            font=(self.font_family, 10),
+            bg=self.primary_color,
+            fg=self.text_secondary_color,
+            wraplength=600,
+            justify=tk.LEFT
+        ).pack(pady=(0, 20), padx=20, anchor=tk.W)
+
         self.pages["Settings"] = page
     
     def create_faq_page(self):
@@ -1343,6 +1893,10 @@ class UI:
         for page in self.pages.values():
             page.pack_forget()
         
+        # Build the page on first use
+        if page_name not in self.pages and page_name in self.page_builders:
+            self.page_builders[page_name]()
+
         # Show selected page
         if page_name in self.pages:
             self.pages[page_name].pack(fill=tk.BOTH, expand=True)
@@ -1357,15 +1911,282 @@ class UI:
     def launch_game(self):
         """Launch The Sims 1 game"""
         if self.play_callback:
-            self.play_callback()
-            # Refresh mod list to show locked status
-            self.refresh_mod_list()
-            # Update last played label
-            last_played = self.settings.get_last_played()
-            if last_played:
-                self.last_played_label.config(text=f"Last played: {last_played}")
+            self.play_callback(self.run_job, self._on_game_started)
         else:
-            print("Play callback not set")
+            logger.warning("Play callback not set")
+
+    def preview_changes(self):
+        """Show what applying the mods would add, update and delete, without touching the game folder"""
+        if not self.modloader:
+            messagebox.showerror("Error", "ModLoader not initialized. Please set a valid game path first.")
+            return
+
+        def show_plan(plan):
+            if plan.is_empty and not plan.kept:
+                messagebox.showinfo("Preview Changes", "The game folder is up to date.")
+            else:
+                messagebox.showinfo("Preview Changes", "\n".join(plan.summary()))
+
+        self.run_job("Checking mods", lambda job: self.modloader.plan_reconcile(job), show_plan)
+
+    def verify_mod_cache(self):
+        """Check that every cached mod file is present and unchanged"""
+        if not self.modloader:
+            messagebox.showerror("Error", "ModLoader not initialized. Please set a valid game path first.")
+            return
+
+        def on_checked(report):
+            if report.ok:
+                messagebox.showinfo("Verify Mod Cache", f"All {report.files_checked} cached file(s) are intact.")
+                return
+            locked = set(self.modloader.get_locked_mods())
+            lines = [
+                f"• {mod_id}{' (locked)' if mod_id in locked else ''}: "
+                f"{len(problems.missing)} missing, {len(problems.modified)} modified"
+                for mod_id, problems in report.mods.items()
+            ]
+            if len(lines) > 15:
+                lines = lines[:15] + [f"...and {len(lines) - 15} more (see console)"]
+            # Locked mods cannot be removed, so removing and adding them again is not an option
+            damaged_locked = [mod_id for mod_id in report.mods if mod_id in locked]
+            locked_hint = "The game has been started with the locked mods, so they stay installed and cannot " \
+                "be removed. Their files in the game folder are not affected; to repair their cached copies, " \
+                "restore the damaged files in the mod_cache folder from a backup."
+            if not damaged_locked:
+                hint = "Remove these mods and add them again from their original files to repair them."
+            elif len(damaged_locked) == len(report.mods):
+                hint = locked_hint
+            else:
+                hint = "Remove the unlocked mods and add them again from their original files to repair them. " \
+                    + locked_hint
+            messagebox.showwarning(
+                "Verify Mod Cache",
+                f"{len(report.mods)} mod(s) have damaged cached files:\n\n" + "\n".join(lines) + "\n\n" + hint
+            )
+
+        self.run_job("Verifying mod cache", lambda job: self.modloader.check_integrity(job), on_checked)
+
+    def open_timings_panel(self):
+        """Show how long recent ModLoader operations took, and toggle recording them"""
+        if not self.modloader:
+            messagebox.showerror("Error", "ModLoader not initialized. Please set a valid game path first.")
+            return
+
+        popup = tk.Toplevel(self.root)
+        popup.title("Operation Timings")
+        popup.configure(bg=self.primary_color)
+        popup.geometry("640x420")
+        popup.transient(self.root)
+
+        record_var = tk.BooleanVar(value=self.settings.get_record_metrics())
+
+        text_frame = tk.Frame(popup, bg=self.primary_color)
+        text = tk.Text(
+            text_frame,
+            font=("Consolas", 9),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color,
+            bd=0,
+            wrap=tk.NONE
+        )
+        scrollbar = tk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+
+        def refresh():
+            spans = self.modloader.metrics_log.spans()
+            lines = []
+            # Newest first; children finish before their parent, so each group reads top-down
+            for span in reversed(spans):
+                counters = ", ".join(f"{name} {value}" for name, value in span.counters.items())
+                error = f"  [{span.error}]" if span.error else ""
+                lines.append(
+                    f"{span.started_at[11:]}  {'  ' * span.depth}{span.name:<{max(1, 28 - 2 * span.depth)}} "
+                    f"{span.duration * 1000:9.1f} ms  {counters}{error}"
+                )
+            if not lines:
+                lines = ["No operations recorded yet." if record_var.get() else "Recording is off."]
+            text.configure(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, "\n".join(lines))
+            text.configure(state=tk.DISABLED)
+
+        def toggle_recording():
+            self.settings.set_record_metrics(record_var.get())
+            self.modloader.set_metrics_enabled(record_var.get())
+            refresh()
+
+        def clear():
+            self.modloader.metrics_log.clear()
+            refresh()
+
+        controls = tk.Frame(popup, bg=self.primary_color)
+        controls.pack(fill=tk.X, padx=15, pady=(15, 5))
+        tk.Checkbutton(
+            controls,
+            text="Record operation timings",
+            variable=record_var,
+            command=toggle_recording,
+            font=(self.font_family, 10),
+            bg=self.primary_color,
+            fg=self.text_secondary_color,
+            selectcolor=self.secondary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_primary_color
+        ).pack(side=tk.LEFT)
+        for label, command in (("Clear", clear), ("Refresh", refresh)):
+            tk.Button(
+                controls,
+                text=label,
+                font=(self.font_family, 10, "bold"),
+                bg=self.secondary_color,
+                fg=self.text_primary_color,
+                activebackground=self.primary_color,
+                activeforeground=self.text_primary_color,
+                bd=0,
+                padx=15,
+                pady=3,
+                cursor="hand2",
+                command=command
+            ).pack(side=tk.RIGHT, padx=(5, 0))
+
+        tk.Label(
+            popup,
+            text=f"Timings are also appended to {self.modloader.metrics_file.path}",
+            font=(self.font_family, 9),
+            bg=self.primary_color,
+            fg=self.text_secondary_color,
+            anchor=tk.W
+        ).pack(fill=tk.X, padx=15)
+
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(5, 15))
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        refresh()
+
+    def restore_vanilla(self):
+        """Undo every deployed mod file after asking for confirmation"""
+        if not self.modloader:
+            messagebox.showerror("Error", "ModLoader not initialized. Please set a valid game path first.")
+            return
+        if not messagebox.askyesno(
+            "Restore Vanilla",
+            "Remove all mod files from the game folder and restore the original game files?"
+        ):
+            return
+
+        def on_restored(report):
+            messagebox.showinfo(
+                "Restore Vanilla",
+                f"{report.restored} original game file(s) restored, {report.deleted} mod file(s) removed."
+            )
+
+        self.run_job("Restoring game files", lambda job: self.modloader.restore_vanilla(job), on_restored)
+
+    def _on_game_started(self):
+        """Update the pages once mods are applied and the game is running"""
+        # Refresh rows on screen to show locked status
+        self.update_mod_rows()
+        # Update last played label
+        last_played = self.settings.get_last_played()
+        if last_played and "Play" in self.pages:
+            self.last_played_label.config(text=f"Last played: {last_played}")
+
+    def run_job(self, title, target, on_done=None, parent=None, on_finish=None):
+        """Run a ModLoader operation off the UI thread, showing its progress in a popup.
+        on_done receives the result on success, on_finish runs however the job ended."""
+        parent = parent or self.root
+        job = BackgroundJob(target)
+
+        popup = tk.Toplevel(parent)
+        popup.title(title)
+        popup.configure(bg=self.primary_color)
+        popup.geometry("420x170")
+        popup.resizable(False, False)
+        popup.transient(parent)
+        popup.grab_set()
+        # Closing the window asks the operation to stop instead of abandoning it
+        popup.protocol("WM_DELETE_WINDOW", job.cancel)
+
+        # Center the popup
+        popup.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - (420 // 2)
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - (170 // 2)
+        popup.geometry(f"+{x}+{y}")
+
+        tk.Label(
+            popup,
+            text=f"{title}...",
+            font=(self.font_family, 12, "bold"),
+            bg=self.primary_color,
+            fg=self.text_primary_color
+        ).pack(pady=(15, 5))
+
+        status_label = tk.Label(
+            popup,
+            text="Preparing...",
+            font=(self.font_family, 9),
+            bg=self.primary_color,
+            fg=self.text_secondary_color
+        )
+        status_label.pack(pady=(0, 5))
+
+        progress_bar = ttk.Progressbar(popup, orient=tk.HORIZONTAL, length=360, mode="determinate", maximum=1.0)
+        progress_bar.pack(pady=(0, 10))
+
+        def cancel():
+            job.cancel()
+            cancel_button.config(text="Cancelling...", state=tk.DISABLED)
+
+        cancel_button = tk.Button(
+            popup,
+            text="Cancel",
+            font=(self.font_family, 10, "bold"),
+            bg=self.secondary_color,
+            fg=self.text_secondary_color,
+            activebackground=self.primary_color,
+            activeforeground=self.text_secondary_color,
+            bd=0,
+            padx=20,
+            pady=5,
+            cursor="hand2",
+            command=cancel
+        )
+        cancel_button.pack()
+
+        def poll():
+            events = job.poll()
+            if events:
+                # Only the latest event matters for display
+                event = events[-1]
+                if event.bytes_total:
+                    progress_bar["value"] = event.bytes_done / event.bytes_total
+                elif event.files_total:
+                    progress_bar["value"] = event.files_done / event.files_total
+                status_label.config(
+                    text=f"{event.files_done}/{event.files_total} file(s), " \
+                         f"{event.bytes_done / 1048576:.1f} of {event.bytes_total / 1048576:.1f} MB"
+                )
+
+            if not job.is_done():
+                self.root.after(50, poll)
+                return
+
+            popup.grab_release()
+            popup.destroy()
+            if parent is not self.root:
+                # Hand the modal grab back to the popup that started the job
+                parent.grab_set()
+            if on_finish:
+                on_finish()
+            if job.was_cancelled():
+                messagebox.showinfo("Cancelled", f"{title} was cancelled.", parent=parent)
+            elif job.error:
+                messagebox.showerror("Error", f"{title} failed: {str(job.error)}", parent=parent)
+            elif on_done:
+                on_done(job.result)
+
+        job.start()
+        self.root.after(50, poll)
     
     def select_game_path(self):
         """Open folder dialog to select game path"""
@@ -1378,8 +2199,10 @@ class UI:
                 "The application will now restart to apply the new game path."
             )
             self.root.destroy()
+            self.thumbnails.close()
             os.execl(sys.executable, sys.executable, *sys.argv)
 
     
     def run(self):
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
+        self.thumbnails.close()
\ No newline at end of file